@@ -67,6 +67,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "inventory.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -122,6 +123,11 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            # File-backed test database so concurrent-scan tests get real
+            # SQLite locking (in-memory shared cache fails fast instead of waiting)
+            "TEST": {
+                "NAME": BASE_DIR / "test_db.sqlite3",
+            },
         }
     }
 
@@ -374,6 +380,15 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 25,
+    'DEFAULT_RENDERER_CLASSES': [
+        'inventory.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'inventory.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
@@ -389,6 +404,25 @@ REST_FRAMEWORK = {
     }
 }
 
+# JSON library behind the API renderer/parser: 'orjson' (used when installed)
+# or 'json' to force the stdlib encoder
+API_JSON_BACKEND = os.environ.get('API_JSON_BACKEND', 'orjson')
+
+
+# ==================== Response Compression ====================
+# Dynamic responses are compressed by inventory.middleware.CompressionMiddleware
+# (Brotli when installed and accepted, else gzip); static files are Whitenoise's
+
+# Smallest body worth compressing, in bytes
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 200))
+
+# Content types to compress; images such as the QR code PNGs already are
+COMPRESSION_CONTENT_TYPES = [
+    'text/html', 'text/plain', 'text/csv', 'text/css', 'text/javascript',
+    'application/javascript', 'application/json', 'application/x-ndjson',
+    'application/xml', 'text/xml', 'image/svg+xml',
+]
+
 
 # ==================== Email Configuration ====================
 # In production, configure SMTP settings via environment variables
@@ -406,6 +440,11 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@assetmanagement.local')
 
+# Bulk notification delivery: messages per SMTP connection, and an optional
+# cap on messages per second (0 = unlimited) to stay under provider limits
+EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', 100))
+EMAIL_RATE_LIMIT = float(os.environ.get('EMAIL_RATE_LIMIT', 0))
+
 # Admin email for notifications
 ADMINS = [
     ('Admin', os.environ.get('ADMIN_EMAIL', 'admin@assetmanagement.local')),
@@ -462,5 +501,21 @@ LOGGING = {
 # Warranty expiration reminder days
 WARRANTY_REMINDER_DAYS = int(os.environ.get('WARRANTY_REMINDER_DAYS', 30))
 
+# Days before expiry at which a further warranty alert is sent for an asset
+# (each asset/threshold pair is alerted once per user)
+WARRANTY_ALERT_MILESTONES = [
+    int(days) for days in os.environ.get('WARRANTY_ALERT_MILESTONES', '30,7,1').split(',')
+    if days.strip()
+]
+
 # Maximum file upload size for bulk import (in bytes)
 MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE', 10 * 1024 * 1024))  # 10MB default
+
+# Read-through cache for hot API responses (see inventory/response_cache.py):
+# lifetime in seconds (0 disables it) and route names to leave uncached,
+# e.g. API_RESPONSE_CACHE_DISABLED=dashboard-list,computer-list
+API_RESPONSE_CACHE_TIMEOUT = int(os.environ.get('API_RESPONSE_CACHE_TIMEOUT', 300))
+API_RESPONSE_CACHE_DISABLED = [
+    name.strip() for name in os.environ.get('API_RESPONSE_CACHE_DISABLED', '').split(',')
+    if name.strip()
+]
@@ -1,9 +1,39 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.template.response import TemplateResponse
+from django.utils import timezone
 from django.utils.html import format_html
 from .models import (
     Computers, printers, monitors, docking_stations,
-    AssetHistory, AssetAssignment, NotificationSetting
+    AssetHistory, AssetAssignment, AssetStatus, NotificationSetting, NotificationOutbox
 )
+from .bulk_updates import bulk_update_assets
+from .forms import BulkComputerForm, BulkDepartmentForm, BulkLocationForm
+
+
+# =============================================================================
+# Changelist Count Helpers
+# =============================================================================
+
+def related_count(model, field):
+    """
+    Number of model rows whose field points at the outer row, as a
+    correlated subquery, so several counts never multiply each other's joins.
+    """
+    counts = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by().values(field).annotate(count=Count('*')).values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def is_changelist(model_admin, request):
+    """True if the request is for the admin's changelist page"""
+    opts = model_admin.model._meta
+    match = request.resolver_match
+    return match is not None and match.url_name == f'{opts.app_label}_{opts.model_name}_changelist'
 
 
 # =============================================================================
@@ -28,12 +58,80 @@ class DockingStationsInline(admin.TabularInline):
     show_change_link = True
 
 
+# =============================================================================
+# Bulk Actions
+# =============================================================================
+
+class BulkAssetActionsMixin:
+    """
+    Set-based admin actions for asset admins: one UPDATE, one audit
+    INSERT and one asset index refresh per action, however many rows.
+    """
+    actions = ['mark_retired', 'move_to_location']
+
+    def _bulk_update(self, request, queryset, values, done):
+        updated = bulk_update_assets(queryset, values, user=request.user)
+        opts = self.model._meta
+        name = opts.verbose_name if updated == 1 else opts.verbose_name_plural
+        self.message_user(request, f'{updated} {name} {done}.', messages.SUCCESS)
+
+    def _prompt(self, request, queryset, form_class, title):
+        """
+        Collect the action's input on an intermediate page.
+        Returns (cleaned_data, None) once submitted, else (None, response).
+        """
+        if 'apply' in request.POST:
+            form = form_class(request.POST)
+            if form.is_valid():
+                return form.cleaned_data, None
+        else:
+            form = form_class()
+        return None, TemplateResponse(request, 'admin/inventory/bulk_update.html', {
+            **self.admin_site.each_context(request),
+            'title': title,
+            'form': form,
+            'opts': self.model._meta,
+            'selected': list(queryset.values_list('pk', flat=True)),
+            'action': request.POST.get('action'),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        })
+
+    @admin.action(description='Mark selected assets as retired')
+    def mark_retired(self, request, queryset):
+        self._bulk_update(request, queryset, {'status': AssetStatus.RETIRED}, 'marked as retired')
+
+    @admin.action(description='Move selected assets to a location')
+    def move_to_location(self, request, queryset):
+        data, response = self._prompt(request, queryset, BulkLocationForm, 'Move to location')
+        if response:
+            return response
+        self._bulk_update(request, queryset, data, f"moved to {data['location']}")
+
+    @admin.action(description='Set department of selected computers')
+    def set_department(self, request, queryset):
+        data, response = self._prompt(request, queryset, BulkDepartmentForm, 'Set department')
+        if response:
+            return response
+        self._bulk_update(request, queryset, data, f"moved to department {data['department']}")
+
+    @admin.action(description='Reassign selected assets to a computer')
+    def reassign_to_computer(self, request, queryset):
+        data, response = self._prompt(request, queryset, BulkComputerForm, 'Reassign to computer')
+        if response:
+            return response
+        computer = data['computer']
+        self._bulk_update(
+            request, queryset, data,
+            f'reassigned to {computer.pk}' if computer else 'unassigned'
+        )
+
+
 # =============================================================================
 # ModelAdmin Classes
 # =============================================================================
 
 @admin.register(Computers)
-class ComputersAdmin(admin.ModelAdmin):
+class ComputersAdmin(BulkAssetActionsMixin, admin.ModelAdmin):
     """Enhanced admin for Computers model with Jazzmin UI."""
 
     list_display = [
@@ -48,7 +146,8 @@ class ComputersAdmin(admin.ModelAdmin):
     ordering = ['-created_at']
     list_per_page = 25
     list_max_show_all = 100
-    filter_horizontal = ['printers']
+    autocomplete_fields = ['printers']
+    actions = BulkAssetActionsMixin.actions + ['set_department']
 
     fieldsets = (
         ('Identification', {
@@ -107,25 +206,38 @@ class ComputersAdmin(admin.ModelAdmin):
         return format_html('<span style="color: green;">{} days left</span>', days_left)
     warranty_status.short_description = 'Warranty'
 
+    def get_queryset(self, request):
+        # Counts come from the changelist query instead of two queries per row;
+        # the change, delete and autocomplete views do not show them
+        queryset = super().get_queryset(request)
+        if not is_changelist(self, request):
+            return queryset
+        return queryset.annotate(
+            monitors_count=related_count(monitors, 'computer'),
+            docking_stations_count=related_count(docking_stations, 'computer'),
+        )
+
     def get_monitors_count(self, obj):
         """Get count of monitors connected to this computer."""
-        count = obj.monitors.count()
+        count = obj.monitors_count
         if count > 0:
             return format_html('<span style="color: green; font-weight: bold;">{}</span>', count)
         return format_html('<span style="color: gray;">0</span>')
     get_monitors_count.short_description = 'Monitors'
+    get_monitors_count.admin_order_field = 'monitors_count'
 
     def get_docking_stations_count(self, obj):
         """Get count of docking stations connected to this computer."""
-        count = obj.docking_stations.count()
+        count = obj.docking_stations_count
         if count > 0:
             return format_html('<span style="color: green; font-weight: bold;">{}</span>', count)
         return format_html('<span style="color: gray;">0</span>')
     get_docking_stations_count.short_description = 'Docking'
+    get_docking_stations_count.admin_order_field = 'docking_stations_count'
 
 
 @admin.register(printers)
-class PrintersAdmin(admin.ModelAdmin):
+class PrintersAdmin(BulkAssetActionsMixin, admin.ModelAdmin):
     """Enhanced admin for Printers model."""
 
     list_display = ['id', 'service_tag', 'make', 'description', 'status', 'location', 'get_computers_count']
@@ -150,17 +262,26 @@ class PrintersAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if not is_changelist(self, request):
+            return queryset
+        return queryset.annotate(
+            computers_count=related_count(Computers.printers.through, 'printers')
+        )
+
     def get_computers_count(self, obj):
         """Get count of computers using this printer."""
-        count = obj.computers.count()
+        count = obj.computers_count
         if count > 0:
             return format_html('<span style="color: blue; font-weight: bold;">{}</span>', count)
         return format_html('<span style="color: gray;">0</span>')
     get_computers_count.short_description = 'Computers'
+    get_computers_count.admin_order_field = 'computers_count'
 
 
 @admin.register(monitors)
-class MonitorsAdmin(admin.ModelAdmin):
+class MonitorsAdmin(BulkAssetActionsMixin, admin.ModelAdmin):
     """Enhanced admin for Monitors model."""
 
     list_display = ['id', 'asset_tag', 'service_tag', 'make', 'computer_link', 'status']
@@ -169,7 +290,9 @@ class MonitorsAdmin(admin.ModelAdmin):
     readonly_fields = ['id', 'created_at', 'updated_at']
     ordering = ['-created_at']
     list_per_page = 25
+    list_select_related = ['computer']
     autocomplete_fields = ['computer']
+    actions = BulkAssetActionsMixin.actions + ['reassign_to_computer']
 
     fieldsets = (
         ('Identification', {
@@ -204,7 +327,7 @@ class MonitorsAdmin(admin.ModelAdmin):
 
 
 @admin.register(docking_stations)
-class DockingStationsAdmin(admin.ModelAdmin):
+class DockingStationsAdmin(BulkAssetActionsMixin, admin.ModelAdmin):
     """Enhanced admin for Docking Stations model."""
 
     list_display = ['id', 'asset_tag', 'service_tag', 'make', 'computer_link', 'status']
@@ -213,7 +336,9 @@ class DockingStationsAdmin(admin.ModelAdmin):
     readonly_fields = ['id', 'created_at', 'updated_at']
     ordering = ['-created_at']
     list_per_page = 25
+    list_select_related = ['computer']
     autocomplete_fields = ['computer']
+    actions = BulkAssetActionsMixin.actions + ['reassign_to_computer']
 
     fieldsets = (
         ('Identification', {
@@ -253,6 +378,7 @@ class AssetHistoryAdmin(admin.ModelAdmin):
     list_display = ['id', 'asset_type', 'asset_id', 'action', 'changed_by', 'changed_at', 'ip_address']
     list_filter = ['asset_type', 'action', 'changed_at']
     search_fields = ['asset_id', 'asset_type']
+    list_select_related = ['changed_by']
     readonly_fields = [
         'id', 'asset_type', 'asset_id', 'action', 'changed_by',
         'changed_at', 'old_values', 'new_values', 'ip_address'
@@ -278,6 +404,7 @@ class AssetAssignmentAdmin(admin.ModelAdmin):
     ]
     list_filter = ['status', 'asset_type', 'assigned_date']
     search_fields = ['asset_id', 'assigned_to']
+    list_select_related = ['assigned_by']
     readonly_fields = ['id', 'assigned_date', 'returned_date']
     ordering = ['-assigned_date']
 
@@ -307,6 +434,30 @@ class NotificationSettingAdmin(admin.ModelAdmin):
     ]
     list_filter = ['email_on_assignment', 'email_on_warranty_expiry', 'daily_summary']
     search_fields = ['user__username', 'user__email']
+    list_select_related = ['user']
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    """Admin interface for queued and dead-lettered notifications"""
+    list_display = [
+        'id', 'assignment', 'action', 'status', 'attempts',
+        'next_attempt_at', 'created_at', 'sent_at'
+    ]
+    list_filter = ['status', 'action']
+    list_select_related = ['assignment']
+    search_fields = ['assignment__asset_id', 'assignment__assigned_to']
+    readonly_fields = [
+        'assignment', 'action', 'attempts', 'last_error', 'created_at', 'sent_at'
+    ]
+    actions = ['retry_entries']
+
+    @admin.action(description='Retry selected notifications')
+    def retry_entries(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(
+            status='pending', attempts=0, next_attempt_at=timezone.now(), last_error=''
+        )
+        self.message_user(request, f'{updated} notification(s) queued for retry.')
 
 
 # =============================================================================
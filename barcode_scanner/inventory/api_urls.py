@@ -13,6 +13,7 @@ router.register(r'docking-stations', api_views.DockingStationViewSet, basename='
 router.register(r'history', api_views.AssetHistoryViewSet, basename='history')
 router.register(r'assignments', api_views.AssetAssignmentViewSet, basename='assignment')
 router.register(r'dashboard', api_views.DashboardViewSet, basename='dashboard')
+router.register(r'assets', api_views.AssetLookupViewSet, basename='asset')
 
 urlpatterns = [
     path('', include(router.urls)),
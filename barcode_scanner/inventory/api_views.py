@@ -1,26 +1,43 @@
 """
 REST API Views for the Asset Management System
 """
+from itertools import islice
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ParseError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import transaction
 from django.db.models import Count
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.http import http_date
 
 from .models import (
     Computers, printers, docking_stations, monitors,
-    AssetHistory, AssetAssignment
+    AssetHistory, AssetAssignment, ConcurrentUpdateError
 )
+from .asset_lookup import lookup_assets
+from .fast_lists import row_plan
+from .renderers import NDJSONRenderer
+from .topology import TOPOLOGY_MODELS, with_peripherals
+from .concurrency import etag_for, list_etag, not_modified, precondition_failed
+from .overdue import overdue_assignments, overdue_count, overdue_page
+from .assignments import TRANSITIONS, bulk_transition, save_transition
+from . import outbox, response_cache
 from .serializers import (
     ComputerSerializer, ComputerListSerializer,
     PrinterSerializer, PrinterListSerializer,
     MonitorSerializer, MonitorListSerializer,
     DockingStationSerializer, DockingStationListSerializer,
     AssetHistorySerializer, AssetAssignmentSerializer,
-    AssetAssignmentCreateSerializer, DashboardStatsSerializer
+    AssetAssignmentCreateSerializer, ComputerTopologySerializer, DashboardStatsSerializer
 )
 
 
@@ -31,7 +48,272 @@ class StandardResultsPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class ComputerViewSet(viewsets.ModelViewSet):
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource has changed since it was fetched (If-Match mismatch).'
+    default_code = 'precondition_failed'
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The resource was changed by someone else; fetch it again and retry.'
+    default_code = 'conflict'
+
+
+class OptimisticConcurrencyMixin:
+    """
+    Optimistic concurrency for versioned models.
+
+    Detail responses carry the row version as an ETag. Writes to a single
+    object honour If-Match (412 on mismatch), and a save that loses a race
+    after the check fails the version compare-and-swap (409).
+    """
+    etag_actions = ('retrieve', 'update', 'partial_update')
+    # Foreign keys whose rows are embedded in detail responses
+    etag_related = ()
+
+    def embedded_rows(self, obj):
+        """Related rows embedded in obj's representation"""
+        return [getattr(obj, name) for name in self.etag_related]
+
+    def object_etag(self, obj):
+        return etag_for(obj, *self.embedded_rows(obj))
+
+    def get_object(self):
+        obj = super().get_object()
+        if self.request.method not in ('GET', 'HEAD', 'OPTIONS') and precondition_failed(self.request, obj):
+            raise PreconditionFailed()
+        self.versioned_object = obj
+        return obj
+
+    def perform_update(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except ConcurrentUpdateError:
+            raise Conflict()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        obj = getattr(self, 'versioned_object', None)
+        if obj is not None and self.action in self.etag_actions and response.status_code < 300:
+            response['ETag'] = self.object_etag(obj)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for list and retrieve.
+
+    Lists are validated by the generations of generation_models plus the
+    query parameters; details by the object's ETag and the newest
+    last_modified_field of it and its embedded rows. Matching requests get
+    304 Not Modified before anything is serialized. The first page of a
+    list is also served through the response cache.
+    """
+    generation_models = ()
+    last_modified_field = 'updated_at'
+
+    def get_generation_models(self):
+        return self.generation_models
+
+    def list(self, request, *args, **kwargs):
+        etag = list_etag(self.get_generation_models(), request)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        if request.query_params.get('page', '1') == '1':
+            response = response_cache.read_through(
+                response_cache.endpoint_name(self), request, etag,
+                lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+            )
+        else:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+    def last_modified(self, obj):
+        if not self.last_modified_field:
+            return None
+        related = self.embedded_rows(obj) if hasattr(self, 'embedded_rows') else []
+        stamps = [
+            getattr(row, self.last_modified_field, None)
+            for row in [obj, *related] if row is not None
+        ]
+        stamps = [stamp for stamp in stamps if stamp]
+        return max(stamps) if stamps else None
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self.object_etag(instance)
+        last_modified = self.last_modified(instance)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+
+class FastListMixin:
+    """
+    Serve list pages from values_list() rows through a precompiled RowPlan
+    (see fast_lists.py) instead of instantiating the list serializer per row.
+
+    Only used for the plain list representation; sparse or expanded lists
+    go through the serializer.
+    """
+
+    def use_fast_list(self):
+        return getattr(self, 'sparse_fields', None) is None and not getattr(self, 'expansions', None)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list():
+            return super().list(request, *args, **kwargs)
+        plan = row_plan(self.get_serializer_class())
+        rows = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.to_representation(page))
+        return Response(plan.to_representation(rows))
+
+
+class StreamMixin:
+    """
+    GET <list>/stream/: every row matching the list's filters, search and
+    ordering as newline-delimited JSON in the list representation.
+
+    Rows are read through a server-side cursor and encoded stream_chunk_size
+    at a time, so memory per request stays constant and there is no COUNT
+    or page-by-page round trip.
+    """
+    stream_chunk_size = 2000
+
+    def _stream_chunks(self, plan, rows):
+        renderer = NDJSONRenderer()
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                return
+            yield renderer.render(plan.to_representation(chunk))
+
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer])
+    def stream(self, request):
+        """Stream all matching rows as NDJSON"""
+        etag = list_etag(self.get_generation_models(), request)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        plan = row_plan(self.get_serializer_class())
+        rows = plan.values(self.filter_queryset(self.get_queryset())).iterator(
+            chunk_size=self.stream_chunk_size
+        )
+        response = StreamingHttpResponse(
+            self._stream_chunks(plan, rows), content_type=NDJSONRenderer.media_type
+        )
+        response['ETag'] = etag
+        return response
+
+
+class SparseFieldsMixin:
+    """
+    ?fields= and ?expand= for list and retrieve.
+
+    ?fields=a,b returns only those fields (lists then use the full
+    serializer, so any field can be picked) and narrows the queryset with
+    only() so other columns are never read. ?expand=relation adds a nested
+    '<relation>_detail' representation whose rows are joined or prefetched
+    only when asked for.
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def _param_list(self, name):
+        value = self.request.query_params.get(name, '')
+        return list(dict.fromkeys(part.strip() for part in value.split(',') if part.strip()))
+
+    @cached_property
+    def sparse_fields(self):
+        if self.action not in self.sparse_actions or 'fields' not in self.request.query_params:
+            return None
+        return self._param_list('fields')
+
+    @cached_property
+    def expansions(self):
+        if self.action not in self.sparse_actions:
+            return []
+        expand = self._param_list('expand')
+        unknown = set(expand) - set(self.get_serializer_class().expandable_fields)
+        if unknown:
+            raise ParseError(f"Cannot expand: {', '.join(sorted(unknown))}")
+        return expand
+
+    def _relation(self, name):
+        return self.queryset.model._meta.get_field(name)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in self.sparse_actions:
+            kwargs.setdefault('fields', self.sparse_fields)
+            kwargs.setdefault('expand', self.expansions)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_generation_models(self):
+        expanded = [self._relation(name).related_model for name in self.expansions]
+        return (*super().get_generation_models(), *expanded)
+
+    def embedded_rows(self, obj):
+        rows = []
+        for name in self.expansions:
+            if self._relation(name).many_to_one:
+                rows.append(getattr(obj, name))
+            else:
+                rows.extend(getattr(obj, name).all())
+        return rows
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in self.sparse_actions:
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        if self.sparse_fields is not None:
+            unknown = set(self.sparse_fields) - set(serializer_class().fields)
+            if unknown:
+                raise ParseError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        serializer = serializer_class(fields=self.sparse_fields, expand=self.expansions)
+
+        opts = queryset.model._meta
+        columns = {opts.pk.name}
+        prefetch = set()
+        narrow = self.sparse_fields is not None
+        for field in serializer.fields.values():
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                # Computed or dotted source: cannot tell which columns it reads
+                narrow = False
+                continue
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch.add(field.source)
+            else:
+                columns.add(model_field.name)
+
+        for name in self.expansions:
+            if self._relation(name).many_to_one:
+                queryset = queryset.select_related(name)
+        if prefetch:
+            queryset = queryset.prefetch_related(*sorted(prefetch))
+        if narrow:
+            # Validators read by conditional GET and optimistic concurrency
+            for name in ('version', getattr(self, 'last_modified_field', None)):
+                if name and any(f.name == name for f in opts.concrete_fields):
+                    columns.add(name)
+            queryset = queryset.only(*columns)
+        return queryset
+
+
+class ComputerViewSet(SparseFieldsMixin, ConditionalGetMixin, FastListMixin, StreamMixin, OptimisticConcurrencyMixin, viewsets.ModelViewSet):
     """
     API endpoint for computers.
 
@@ -42,9 +324,7 @@ class ComputerViewSet(viewsets.ModelViewSet):
     partial_update: Partially update a computer
     destroy: Delete a computer
     """
-    queryset = Computers.objects.select_related().prefetch_related(
-        'printers', 'monitors', 'docking_stations'
-    ).all()
+    queryset = Computers.objects.all()
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -52,9 +332,10 @@ class ComputerViewSet(viewsets.ModelViewSet):
     search_fields = ['asset_tag', 'service_tag', 'computer_name', 'user', 'make', 'model']
     ordering_fields = ['created_at', 'asset_tag', 'department', 'user']
     ordering = ['-created_at']
+    generation_models = (Computers,)
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'stream') and self.sparse_fields is None:
             return ComputerListSerializer
         return ComputerSerializer
 
@@ -68,20 +349,48 @@ class ComputerViewSet(viewsets.ModelViewSet):
         serializer = AssetHistorySerializer(history, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def topology(self, request):
+        """Computers with the tags and status of their peripherals"""
+        etag = list_etag(TOPOLOGY_MODELS, request)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        queryset = with_peripherals(
+            self.filter_queryset(self.get_queryset()).only(*ComputerTopologySerializer.Meta.columns)
+        )
+        page = self.paginate_queryset(queryset)
+        response = self.get_paginated_response(ComputerTopologySerializer(page, many=True).data)
+        response['ETag'] = etag
+        return response
+
     @action(detail=False, methods=['get'])
     def by_department(self, request):
         """Get computers grouped by department"""
-        departments = Computers.objects.exclude(
-            department__isnull=True
-        ).exclude(
-            department=''
-        ).values('department').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        return Response(list(departments))
-
-
-class PrinterViewSet(viewsets.ModelViewSet):
+        etag = list_etag(self.generation_models, request)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        def build():
+            departments = Computers.objects.exclude(
+                department__isnull=True
+            ).exclude(
+                department=''
+            ).values('department').annotate(
+                count=Count('id')
+            ).order_by('-count')
+            return Response(list(departments))
+
+        response = response_cache.read_through(
+            response_cache.endpoint_name(self), request, etag, build
+        )
+        response['ETag'] = etag
+        return response
+
+
+class PrinterViewSet(SparseFieldsMixin, ConditionalGetMixin, FastListMixin, StreamMixin, OptimisticConcurrencyMixin, viewsets.ModelViewSet):
     """API endpoint for printers"""
     queryset = printers.objects.all()
     permission_classes = [IsAuthenticated]
@@ -91,9 +400,10 @@ class PrinterViewSet(viewsets.ModelViewSet):
     search_fields = ['service_tag', 'make', 'description']
     ordering_fields = ['created_at', 'service_tag', 'make']
     ordering = ['-created_at']
+    generation_models = (printers,)
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'stream') and self.sparse_fields is None:
             return PrinterListSerializer
         return PrinterSerializer
 
@@ -108,9 +418,9 @@ class PrinterViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class MonitorViewSet(viewsets.ModelViewSet):
+class MonitorViewSet(SparseFieldsMixin, ConditionalGetMixin, FastListMixin, StreamMixin, OptimisticConcurrencyMixin, viewsets.ModelViewSet):
     """API endpoint for monitors"""
-    queryset = monitors.objects.select_related('computer').all()
+    queryset = monitors.objects.all()
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -118,9 +428,10 @@ class MonitorViewSet(viewsets.ModelViewSet):
     search_fields = ['asset_tag', 'service_tag', 'make']
     ordering_fields = ['created_at', 'asset_tag', 'make']
     ordering = ['-created_at']
+    generation_models = (monitors,)
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'stream') and self.sparse_fields is None:
             return MonitorListSerializer
         return MonitorSerializer
 
@@ -135,9 +446,9 @@ class MonitorViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class DockingStationViewSet(viewsets.ModelViewSet):
+class DockingStationViewSet(SparseFieldsMixin, ConditionalGetMixin, FastListMixin, StreamMixin, OptimisticConcurrencyMixin, viewsets.ModelViewSet):
     """API endpoint for docking stations"""
-    queryset = docking_stations.objects.select_related('computer').all()
+    queryset = docking_stations.objects.all()
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -145,9 +456,10 @@ class DockingStationViewSet(viewsets.ModelViewSet):
     search_fields = ['asset_tag', 'service_tag', 'make']
     ordering_fields = ['created_at', 'asset_tag', 'make']
     ordering = ['-created_at']
+    generation_models = (docking_stations,)
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'stream') and self.sparse_fields is None:
             return DockingStationListSerializer
         return DockingStationSerializer
 
@@ -162,7 +474,7 @@ class DockingStationViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class AssetHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class AssetHistoryViewSet(ConditionalGetMixin, FastListMixin, StreamMixin, viewsets.ReadOnlyModelViewSet):
     """API endpoint for asset history (read-only)"""
     queryset = AssetHistory.objects.select_related('changed_by').order_by('-changed_at')
     serializer_class = AssetHistorySerializer
@@ -173,9 +485,15 @@ class AssetHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['asset_id', 'asset_type']
     ordering_fields = ['changed_at', 'asset_type', 'action']
     ordering = ['-changed_at']
+    generation_models = (AssetHistory,)
+    last_modified_field = 'changed_at'
+
+    def object_etag(self, obj):
+        # History rows are never modified
+        return f'"assethistory-{obj.pk}"'
 
 
-class AssetAssignmentViewSet(viewsets.ModelViewSet):
+class AssetAssignmentViewSet(ConditionalGetMixin, OptimisticConcurrencyMixin, viewsets.ModelViewSet):
     """API endpoint for asset assignments"""
     queryset = AssetAssignment.objects.select_related(
         'assigned_by', 'approved_by'
@@ -187,6 +505,8 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
     search_fields = ['asset_id', 'assigned_to', 'notes']
     ordering_fields = ['assigned_date', 'status', 'due_date']
     ordering = ['-assigned_date']
+    generation_models = (AssetAssignment,)
+    last_modified_field = None
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -194,7 +514,9 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
         return AssetAssignmentSerializer
 
     def perform_create(self, serializer):
-        serializer.save(assigned_by=self.request.user, status='pending')
+        with transaction.atomic():
+            assignment = serializer.save(assigned_by=self.request.user, status='pending')
+            outbox.enqueue(assignment, 'created')
 
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -207,7 +529,10 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
             )
         assignment.status = 'approved'
         assignment.approved_by = request.user
-        assignment.save()
+        try:
+            save_transition(assignment)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
         return Response({'status': 'Assignment approved'})
 
     @action(detail=True, methods=['post'])
@@ -221,7 +546,10 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
             )
         assignment.status = 'rejected'
         assignment.approved_by = request.user
-        assignment.save()
+        try:
+            save_transition(assignment)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
         return Response({'status': 'Assignment rejected'})
 
     @action(detail=True, methods=['post'])
@@ -234,7 +562,10 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         assignment.status = 'checked_out'
-        assignment.save()
+        try:
+            save_transition(assignment)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
         return Response({'status': 'Asset checked out'})
 
     @action(detail=True, methods=['post'])
@@ -248,16 +579,126 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
             )
         assignment.status = 'returned'
         assignment.returned_date = timezone.now()
-        assignment.save()
+        try:
+            save_transition(assignment)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
         return Response({'status': 'Asset returned'})
 
+    @action(detail=False, methods=['get'])
+    def overdue(self, request):
+        """
+        Checked-out assignments past their due date, oldest due first.
+        Keyset paged: follow ``next`` (a ``cursor`` parameter) for more.
+        """
+        try:
+            limit = int(request.query_params.get('limit', StandardResultsPagination.page_size))
+        except ValueError:
+            limit = StandardResultsPagination.page_size
+        limit = min(max(limit, 1), StandardResultsPagination.max_page_size)
+
+        try:
+            rows, next_cursor = overdue_page(
+                request.query_params.get('cursor'), limit,
+                queryset=overdue_assignments().select_related('assigned_by', 'approved_by')
+            )
+        except ValueError:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+        return Response({
+            'count': overdue_count(),
+            'next': next_url,
+            'results': AssetAssignmentSerializer(rows, many=True).data,
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Apply a workflow action to many assignments.
+        Body: {"action": "approve|reject|checkout|return", "ids": [...]}
+        """
+        workflow_action = request.data.get('action')
+        ids = request.data.get('ids')
+        if workflow_action not in TRANSITIONS or not isinstance(ids, list) or not ids:
+            return Response(
+                {'error': f'Provide an action ({", ".join(TRANSITIONS)}) and a list of ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response({'error': 'ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            transitioned, skipped = bulk_transition(workflow_action, ids, user=request.user)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
+        return Response({
+            'action': workflow_action,
+            'transitioned': transitioned,
+            'skipped': skipped,
+        })
+
+
+class AssetLookupViewSet(viewsets.ViewSet):
+    """API endpoint for fetching many assets of any type in one request"""
+    permission_classes = [IsAuthenticated]
+    # Keeps the three IN lists of one query under SQLite's parameter limit
+    max_identifiers = 300
+
+    @action(detail=False, methods=['get', 'post'])
+    def lookup(self, request):
+        """
+        Resolve ids, asset tags or service tags across all asset types.
+        GET ?ids=a,b,c or POST {"ids": [...]}
+        """
+        if request.method == 'POST':
+            ids = request.data.get('ids')
+            if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+                return Response({'error': 'ids must be a list of strings'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            ids = [part for value in request.query_params.getlist('ids') for part in value.split(',')]
+
+        ids = list(dict.fromkeys(i.strip() for i in ids if i.strip()))
+        if not ids:
+            return Response({'error': 'Provide at least one id or tag'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.max_identifiers:
+            return Response(
+                {'error': f'At most {self.max_identifiers} ids per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = lookup_assets(ids)
+        return Response({
+            'results': results,
+            'missing': [identifier for identifier, matches in results.items() if not matches],
+        })
+
 
 class DashboardViewSet(viewsets.ViewSet):
     """API endpoint for dashboard statistics"""
     permission_classes = [IsAuthenticated]
+    generation_models = (
+        Computers, printers, monitors, docking_stations, AssetAssignment, AssetHistory
+    )
 
     def list(self, request):
         """Get dashboard statistics"""
+        etag = list_etag(self.generation_models, request)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        response = response_cache.read_through(
+            response_cache.endpoint_name(self), request, etag, self._build_stats
+        )
+        response['ETag'] = etag
+        return response
+
+    def _build_stats(self):
+        """Dashboard statistics response, built from the database"""
         stats = {
             'computer_count': Computers.objects.count(),
             'printer_count': printers.objects.count(),
@@ -287,5 +728,5 @@ class DashboardViewSet(viewsets.ViewSet):
             'changed_by'
         ).order_by('-changed_at')[:10]
         stats['recent_activity'] = AssetHistorySerializer(recent_history, many=True).data
-
         return Response(stats)
+
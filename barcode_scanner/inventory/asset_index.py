@@ -0,0 +1,142 @@
+"""
+Cross-type asset index helpers.
+
+AssetIndex mirrors the identifying columns of all four asset tables so that
+"any tag" scans, polymorphic (asset_type, asset_id) references from
+AssetHistory/AssetAssignment, and assignment validation each take a single
+indexed query instead of one query per asset type.
+"""
+from django.db.models import Q
+
+from .models import (
+    Computers, printers, monitors, docking_stations,
+    AssetIndex, AssetType
+)
+
+ASSET_TYPE_MODELS = {
+    AssetType.COMPUTER: Computers,
+    AssetType.PRINTER: printers,
+    AssetType.MONITOR: monitors,
+    AssetType.DOCKING_STATION: docking_stations,
+}
+
+INDEXED_FIELDS = ['asset_tag', 'service_tag', 'status', 'location']
+
+# Accept codes ('docking_station') as well as the labels stored in history
+# and assignment rows ('Docking Station')
+_CODES_BY_NAME = {
+    **{code: code for code, _ in AssetType.choices},
+    **{label.lower(): code for code, label in AssetType.choices},
+}
+
+
+def asset_type_code(asset_type):
+    """Normalize an asset type label or code to its AssetType code, or None"""
+    if not asset_type:
+        return None
+    return _CODES_BY_NAME.get(asset_type.strip().lower())
+
+
+def asset_type_for_model(model):
+    for code, candidate in ASSET_TYPE_MODELS.items():
+        if candidate is model:
+            return code
+    raise KeyError(model)
+
+
+def index_entry(instance):
+    """Build an unsaved AssetIndex row for an asset instance"""
+    return AssetIndex(
+        asset_type=asset_type_for_model(type(instance)),
+        asset_id=instance.pk,
+        asset_tag=getattr(instance, 'asset_tag', None),
+        service_tag=getattr(instance, 'service_tag', None),
+        status=instance.status,
+        location=instance.location,
+    )
+
+
+def sync_assets(instances):
+    """Insert or refresh index rows for saved assets in a single statement"""
+    entries = [index_entry(instance) for instance in instances]
+    if entries:
+        AssetIndex.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['asset_type', 'asset_id'],
+            update_fields=INDEXED_FIELDS,
+        )
+
+
+def remove_asset(model, asset_id):
+    AssetIndex.objects.filter(
+        asset_type=asset_type_for_model(model), asset_id=asset_id
+    ).delete()
+
+
+def rebuild_index():
+    """Repopulate the whole index from the asset tables"""
+    AssetIndex.objects.all().delete()
+    for model in ASSET_TYPE_MODELS.values():
+        fields = ['id'] + [f for f in INDEXED_FIELDS if hasattr(model, f)]
+        sync_assets(model.objects.only(*fields).iterator(chunk_size=2000))
+
+
+def lookup_tag(tag):
+    """All assets of any type whose asset tag or service tag matches"""
+    return AssetIndex.objects.filter(Q(asset_tag=tag) | Q(service_tag=tag))
+
+
+def search(asset_type, prefix='', status=None, limit=20):
+    """Entries of one asset type whose ID, asset tag or service tag starts with prefix"""
+    entries = AssetIndex.objects.filter(asset_type=asset_type)
+    if prefix:
+        entries = entries.filter(
+            Q(asset_id__startswith=prefix)
+            | Q(asset_tag__startswith=prefix)
+            | Q(service_tag__startswith=prefix)
+        )
+    if status:
+        entries = entries.filter(status=status)
+    return entries.order_by('asset_tag', 'asset_id')[:limit]
+
+
+def entry_label(entry):
+    """Display text for an index entry in choice widgets"""
+    return ' - '.join(filter(None, [entry.asset_tag or entry.service_tag, entry.asset_id]))
+
+
+def get_entry(asset_type, asset_id):
+    """Index row for an (asset_type, asset_id) reference, or None"""
+    code = asset_type_code(asset_type)
+    if code is None or not asset_id:
+        return None
+    return AssetIndex.objects.filter(asset_type=code, asset_id=asset_id).first()
+
+
+def attach_targets(rows):
+    """
+    Resolve the (asset_type, asset_id) references of a page of history or
+    assignment rows with one query, setting ``row.target`` to the matching
+    AssetIndex entry (None when the asset no longer exists).
+    """
+    rows = list(rows)
+    ids_by_type = {}
+    for row in rows:
+        code = asset_type_code(row.asset_type)
+        if code:
+            ids_by_type.setdefault(code, set()).add(row.asset_id)
+
+    entries = {}
+    if ids_by_type:
+        condition = Q()
+        for code, ids in ids_by_type.items():
+            condition |= Q(asset_type=code, asset_id__in=ids)
+        entries = {
+            (entry.asset_type, entry.asset_id): entry
+            for entry in AssetIndex.objects.filter(condition)
+        }
+
+    for row in rows:
+        row.target = entries.get((asset_type_code(row.asset_type), row.asset_id))
+    return rows
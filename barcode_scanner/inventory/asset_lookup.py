@@ -0,0 +1,57 @@
+"""
+Multi-get of assets by id, asset tag or service tag.
+
+An identifier may be any of the three and may match assets of several
+types, so each asset table is queried once with
+``id IN (...) OR asset_tag IN (...) OR service_tag IN (...)`` over the
+columns it has. Matches are emitted in the list representation through the
+fast-path row plans (see fast_lists.py).
+"""
+from django.db.models import Q
+
+from .fast_lists import row_plan
+from .models import AssetType
+from .serializers import (
+    ComputerListSerializer, DockingStationListSerializer,
+    MonitorListSerializer, PrinterListSerializer
+)
+
+# Asset type -> list serializer; each includes the columns it is matched on
+LOOKUP_SOURCES = (
+    (AssetType.COMPUTER, ComputerListSerializer),
+    (AssetType.PRINTER, PrinterListSerializer),
+    (AssetType.MONITOR, MonitorListSerializer),
+    (AssetType.DOCKING_STATION, DockingStationListSerializer),
+)
+
+MATCH_FIELDS = ('id', 'asset_tag', 'service_tag')
+
+
+def lookup_assets(identifiers):
+    """
+    Map each identifier to the assets it names, in one query per table.
+
+    Each match is {'asset_type', 'matched_on', 'asset'}; identifiers
+    without matches map to an empty list.
+    """
+    results = {identifier: [] for identifier in identifiers}
+    wanted = list(results)
+    for asset_type, serializer_class in LOOKUP_SOURCES:
+        plan = row_plan(serializer_class)
+        fields = [name for name in MATCH_FIELDS if name in plan.names]
+        query = Q()
+        for name in fields:
+            query |= Q(**{f'{name}__in': wanted})
+
+        model = serializer_class.Meta.model
+        rows = plan.values(model.objects.filter(query).order_by('pk'))
+        for asset in plan.to_representation(rows):
+            matched = set()
+            for name in fields:
+                identifier = asset[name]
+                if identifier in results and identifier not in matched:
+                    matched.add(identifier)
+                    results[identifier].append(
+                        {'asset_type': asset_type.value, 'matched_on': name, 'asset': asset}
+                    )
+    return results
@@ -0,0 +1,233 @@
+"""
+Assignment validation against live asset state.
+
+New assignments are checked with a single query against AssetIndex that
+also tests for an approved or checked-out assignment of the same asset.
+The partial unique constraint on AssetAssignment (one holding assignment
+per asset) makes approval race-free: a concurrent second approval fails
+with IntegrityError, which save_transition reports as a ValidationError.
+
+Bulk workflow actions move many assignments with one conditional
+``UPDATE ... WHERE status = <from> AND id IN (...) RETURNING id`` per batch
+of ids, then write audit entries and queue notifications in bulk.
+
+Notifications are queued in the notification outbox (see outbox.py) in the
+same transaction as the status change and sent later by a worker.
+"""
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Exists
+from django.utils import timezone
+
+from . import asset_index, generations, outbox
+from .models import (
+    AssetAssignment, AssetHistory, AssetIndex, AssetStatus, AssetType,
+    ConcurrentUpdateError
+)
+from .overdue import invalidate_overdue_count
+from .signals import get_current_ip
+
+# Assignment statuses that hold the asset; at most one per asset
+HOLDING_STATUSES = ('approved', 'checked_out')
+
+# Asset statuses that cannot be assigned
+UNASSIGNABLE_ASSET_STATUSES = (AssetStatus.RETIRED, AssetStatus.DISPOSED)
+
+
+def check_assignable(asset_type, asset_id):
+    """
+    Validate that an asset can be assigned, in one indexed query.
+
+    The asset type may be a code or label in any case ('computer',
+    ' Docking Station'); it is normalized to the canonical label before the
+    held check, and that label is returned to store on the assignment, so
+    the unique_holding_assignment constraint compares like with like.
+    Raises ValidationError when the asset is missing, retired or disposed,
+    or already approved or checked out to someone.
+    """
+    code = asset_index.asset_type_code(asset_type)
+    if code is None:
+        raise ValidationError('Unknown asset type.', code='invalid_asset_type')
+    label = AssetType(code).label
+
+    row = AssetIndex.objects.filter(asset_type=code, asset_id=asset_id).annotate(
+        held=Exists(AssetAssignment.objects.filter(
+            asset_type=label, asset_id=asset_id, status__in=HOLDING_STATUSES
+        ))
+    ).values('status', 'held').first()
+
+    if row is None:
+        raise ValidationError(f'No {label} with ID {asset_id} exists.', code='missing')
+    if row['status'] in UNASSIGNABLE_ASSET_STATUSES:
+        raise ValidationError(
+            f'{label} {asset_id} is {AssetStatus(row["status"]).label.lower()} '
+            f'and cannot be assigned.',
+            code='unavailable'
+        )
+    if row['held']:
+        raise ValidationError(
+            f'{label} {asset_id} is already assigned.', code='conflict'
+        )
+    return label
+
+
+def save_transition(assignment, update_fields=None):
+    """
+    Save a status change and queue its notification, reporting a
+    holding-assignment conflict (another approved/checked-out assignment of
+    the asset) or a concurrent change to the assignment itself (version
+    mismatch) as ValidationError.
+    """
+    try:
+        with transaction.atomic():
+            assignment.save(update_fields=update_fields)
+            outbox.enqueue(assignment, assignment.status)
+    except IntegrityError:
+        raise ValidationError(
+            f'{assignment.asset_type} {assignment.asset_id} is already assigned.',
+            code='conflict'
+        )
+    except ConcurrentUpdateError:
+        raise ValidationError(
+            'This assignment was changed by someone else; reload and try again.',
+            code='stale'
+        )
+
+
+# ==================== Bulk Workflow Actions ====================
+
+# Workflow action -> (required current status, new status)
+TRANSITIONS = {
+    'approve': ('pending', 'approved'),
+    'reject': ('pending', 'rejected'),
+    'checkout': ('approved', 'checked_out'),
+    'return': ('checked_out', 'returned'),
+}
+
+# AssetHistory action recorded for each new assignment status
+AUDIT_ACTIONS = {
+    'approved': 'updated',
+    'rejected': 'updated',
+    'checked_out': 'assigned',
+    'returned': 'unassigned',
+}
+
+# Keep each statement well under database parameter limits
+BULK_BATCH_SIZE = 500
+
+
+def _build_transition_sql(connection, values, from_status, to_status, ids):
+    """
+    Build the conditional UPDATE and its parameters for one batch of ids.
+
+    Approvals also skip assets that already have a holding assignment, and
+    approve at most one of several pending requests for the same asset, so
+    the statement never trips the unique_holding_assignment constraint.
+    """
+    opts = AssetAssignment._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+
+    def col(name):
+        return qn(opts.get_field(name).column)
+
+    id_list = ', '.join(['%s'] * len(ids))
+    set_clause = ', '.join(f"{col(name)} = %s" for name in values)
+    set_clause += f", {col('version')} = {col('version')} + 1"
+    sql = f"UPDATE {table} SET {set_clause} WHERE {col('status')} = %s AND {col('id')} IN ({id_list})"
+    params = [
+        *(opts.get_field(name).get_db_prep_save(value, connection) for name, value in values.items()),
+        from_status, *ids,
+    ]
+
+    if to_status in HOLDING_STATUSES and from_status not in HOLDING_STATUSES:
+        holding = ', '.join(['%s'] * len(HOLDING_STATUSES))
+        sql += (
+            f" AND {col('id')} IN ("
+            f"SELECT MIN({col('id')}) FROM {table} "
+            f"WHERE {col('status')} = %s AND {col('id')} IN ({id_list}) "
+            f"GROUP BY {col('asset_type')}, {col('asset_id')})"
+            f" AND NOT EXISTS ("
+            f"SELECT 1 FROM {table} holder "
+            f"WHERE holder.{col('asset_type')} = {table}.{col('asset_type')} "
+            f"AND holder.{col('asset_id')} = {table}.{col('asset_id')} "
+            f"AND holder.{col('status')} IN ({holding}))"
+        )
+        params += [from_status, *ids, *HOLDING_STATUSES]
+
+    return f"{sql} RETURNING {col('id')}", params
+
+
+def bulk_transition(action, ids, user=None):
+    """
+    Apply a workflow action to many assignments at once.
+
+    Returns (transitioned_ids, skipped_ids); ids are skipped when they do
+    not exist, are not in the action's required status, or (for approvals)
+    the asset is already held. Raises ValidationError if a concurrent
+    approval claims one of the assets first.
+    """
+    from_status, to_status = TRANSITIONS[action]
+    ids = sorted(set(ids))
+    if not ids:
+        return [], []
+
+    values = {'status': to_status}
+    if action in ('approve', 'reject'):
+        values['approved_by'] = user.pk if user else None
+    if action == 'return':
+        values['returned_date'] = timezone.now()
+
+    using = router.db_for_write(AssetAssignment)
+    connection = connections[using]
+    transitioned = []
+    try:
+        with transaction.atomic(using=using):
+            with connection.cursor() as cursor:
+                for start in range(0, len(ids), BULK_BATCH_SIZE):
+                    sql, params = _build_transition_sql(
+                        connection, values, from_status, to_status,
+                        ids[start:start + BULK_BATCH_SIZE]
+                    )
+                    cursor.execute(sql, params)
+                    transitioned.extend(row[0] for row in cursor.fetchall())
+
+            if transitioned:
+                _record_transitions(transitioned, from_status, to_status, user, using)
+                generations.bump(AssetAssignment, AssetHistory)
+                if 'checked_out' in (from_status, to_status):
+                    invalidate_overdue_count()
+    except IntegrityError:
+        raise ValidationError(
+            'Another approval claimed one of these assets; no assignments were changed.',
+            code='conflict'
+        )
+
+    transitioned.sort()
+    done = set(transitioned)
+    return transitioned, [pk for pk in ids if pk not in done]
+
+
+def _record_transitions(ids, from_status, to_status, user, using):
+    """Write audit entries and queue notifications, one INSERT each"""
+    assignments = list(
+        AssetAssignment.objects.using(using).filter(id__in=ids).select_related('assigned_by')
+    )
+    ip_address = get_current_ip()
+    AssetHistory.objects.using(using).bulk_create([
+        AssetHistory(
+            asset_type=assignment.asset_type,
+            asset_id=assignment.asset_id,
+            action=AUDIT_ACTIONS[to_status],
+            changed_by=user,
+            old_values={'assignment_id': assignment.id, 'status': from_status},
+            new_values={
+                'assignment_id': assignment.id,
+                'status': to_status,
+                'assigned_to': assignment.assigned_to,
+            },
+            ip_address=ip_address,
+        )
+        for assignment in assignments
+    ])
+    outbox.enqueue_many(assignments, to_status, using=using)
@@ -0,0 +1,85 @@
+"""
+Optimistic concurrency and conditional GET helpers.
+
+Versioned rows (see models.VersionedModel) expose their version as a strong
+ETag. Clients echo it back in If-Match; a mismatch is answered with 412
+before anything is written, and a write that loses a race after the check
+fails the version compare-and-swap and is answered with 409.
+
+Reads send the same validators back in If-None-Match / If-Modified-Since
+and get 304 Not Modified while the resource is unchanged. Detail ETags
+extend the row version with the versions of any related rows embedded in
+the response; list ETags hash the table generations (see generations.py)
+with the normalized query parameters.
+"""
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .generations import get_generations
+
+
+def make_etag(model, pk, version):
+    """Strong ETag for a version of a versioned row"""
+    return f'"{model._meta.model_name}-{pk}-v{version}"'
+
+
+def etag_for(instance, *related):
+    """
+    Strong ETag for the current version of a versioned row. Versions of
+    related rows embedded in a representation are appended after '+'.
+    """
+    etag = make_etag(type(instance), instance.pk, instance.version)
+    for obj in related:
+        if obj is not None:
+            etag = f'{etag[:-1]}+{make_etag(type(obj), obj.pk, obj.version)[1:]}'
+    return etag
+
+
+def _row_etag(etag):
+    """The part of an ETag that identifies the row version itself"""
+    # CompressionMiddleware weakens the ETags of compressed responses
+    if etag.startswith('W/'):
+        etag = etag[2:]
+    return etag.split('+', 1)[0] + '"' if '+' in etag else etag
+
+
+def precondition_failed(request, instance):
+    """True when the request carries an If-Match that the row no longer matches"""
+    header = request.headers.get('If-Match')
+    if not header:
+        return False
+    tags = [_row_etag(tag.strip()) for tag in header.split(',')]
+    return '*' not in tags and etag_for(instance) not in tags
+
+
+def list_etag(models, request):
+    """
+    Weak ETag for a list built from the given tables: changes whenever one
+    of them changes, or the query parameters or negotiated format differ.
+    """
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+    raw = json.dumps([
+        get_generations(models), params, getattr(request, 'accepted_media_type', None)
+    ])
+    return f'W/"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    304 response when the request's validators still match, else None.
+    last_modified is a datetime (or None).
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+    return response
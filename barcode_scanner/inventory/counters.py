@@ -0,0 +1,14 @@
+"""
+Counters in the shared cache, such as hit/miss and prediction metrics.
+"""
+from django.core.cache import cache
+
+
+def incr(key, delta=1):
+    """Add delta to a counter that never expires, starting it if missing"""
+    if not cache.add(key, delta, None):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, delta, None)
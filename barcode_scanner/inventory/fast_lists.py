@@ -0,0 +1,72 @@
+"""
+Read-only fast path for list serialization.
+
+A ModelSerializer list builds a model instance per row and then walks every
+field's get_attribute/to_representation. For the flat list serializers the
+output is fully determined by a handful of columns, so a RowPlan compiles
+the serializer once into values_list() lookups plus a converter per field,
+and list pages are emitted straight from the row tuples. Converters are the
+serializer fields' own to_representation (skipped for fields that return
+database values unchanged), so the JSON is identical to the serializer's.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+# Fields whose to_representation returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.JSONField, serializers.PrimaryKeyRelatedField,
+)
+
+# Fields whose representation is computed from a single column value
+COLUMN_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.FloatField, serializers.DecimalField, serializers.JSONField,
+    serializers.ChoiceField, serializers.DateField, serializers.DateTimeField,
+    serializers.TimeField, serializers.UUIDField, serializers.PrimaryKeyRelatedField,
+)
+
+
+class RowPlan:
+    """values_list() lookups and per-field converters for a serializer"""
+
+    def __init__(self, serializer_class):
+        self.names = []
+        self.lookups = []
+        self.converters = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if not isinstance(field, COLUMN_FIELDS) or field.source == '*':
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name} ({type(field).__name__}) '
+                    f'cannot be serialized from a column value'
+                )
+            self.names.append(name)
+            self.lookups.append('__'.join(field.source_attrs))
+            # Unchanged values need no call; the serializer maps None to None
+            self.converters.append(
+                None if isinstance(field, PASSTHROUGH_FIELDS) else field.to_representation
+            )
+
+    def values(self, queryset):
+        """Row tuples for the plan's columns, in serializer field order"""
+        return queryset.prefetch_related(None).values_list(*self.lookups)
+
+    def to_representation(self, rows):
+        fields = list(zip(self.names, self.converters))
+        return [
+            {
+                name: value if convert is None or value is None else convert(value)
+                for (name, convert), value in zip(fields, row)
+            }
+            for row in rows
+        ]
+
+
+@lru_cache(maxsize=None)
+def row_plan(serializer_class):
+    """Compiled RowPlan for a serializer class"""
+    return RowPlan(serializer_class)
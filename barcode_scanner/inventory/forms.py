@@ -3,9 +3,18 @@ from .models import (
     Computers, docking_stations, printers, monitors,
     AssetStatus, AssetAssignment, NotificationSetting
 )
+from .widgets import AssetAutocompleteSelect, AssetAutocompleteSelectMultiple
 
 
-class computersForm(forms.ModelForm):
+class VersionedModelForm(forms.ModelForm):
+    """
+    ModelForm that round-trips the row version in a hidden field, so saving
+    a form rendered from stale data raises ConcurrentUpdateError.
+    """
+    version = forms.IntegerField(required=False, widget=forms.HiddenInput)
+
+
+class computersForm(VersionedModelForm):
     """Form for creating/editing computers"""
     class Meta:
         model = Computers
@@ -13,24 +22,25 @@ class computersForm(forms.ModelForm):
             "asset_tag", "service_tag", "computer_name", 'department',
             'user', 'make', 'model', 'storage', 'cpu', 'ram', 'printers',
             'status', 'location', 'purchase_date', 'warranty_expiry',
-            'purchase_cost', 'notes'
+            'purchase_cost', 'notes', 'version'
         ]
         widgets = {
             'purchase_date': forms.DateInput(attrs={'type': 'date'}),
             'warranty_expiry': forms.DateInput(attrs={'type': 'date'}),
             'notes': forms.Textarea(attrs={'rows': 3}),
             'purchase_cost': forms.NumberInput(attrs={'step': '0.01'}),
+            'printers': AssetAutocompleteSelectMultiple('printer'),
         }
 
 
-class printersForm(forms.ModelForm):
+class printersForm(VersionedModelForm):
     """Form for creating/editing printers"""
     class Meta:
         model = printers
         fields = [
             'service_tag', 'make', 'description',
             'status', 'location', 'purchase_date', 'warranty_expiry',
-            'purchase_cost', 'notes'
+            'purchase_cost', 'notes', 'version'
         ]
         widgets = {
             'purchase_date': forms.DateInput(attrs={'type': 'date'}),
@@ -40,37 +50,39 @@ class printersForm(forms.ModelForm):
         }
 
 
-class monitorsForm(forms.ModelForm):
+class monitorsForm(VersionedModelForm):
     """Form for creating/editing monitors"""
     class Meta:
         model = monitors
         fields = [
             'asset_tag', 'service_tag', 'make', 'computer',
             'status', 'location', 'purchase_date', 'warranty_expiry',
-            'purchase_cost', 'notes'
+            'purchase_cost', 'notes', 'version'
         ]
         widgets = {
             'purchase_date': forms.DateInput(attrs={'type': 'date'}),
             'warranty_expiry': forms.DateInput(attrs={'type': 'date'}),
             'notes': forms.Textarea(attrs={'rows': 3}),
             'purchase_cost': forms.NumberInput(attrs={'step': '0.01'}),
+            'computer': AssetAutocompleteSelect('computer'),
         }
 
 
-class docking_stationsForm(forms.ModelForm):
+class docking_stationsForm(VersionedModelForm):
     """Form for creating/editing docking stations"""
     class Meta:
         model = docking_stations
         fields = [
             'asset_tag', 'service_tag', 'make', 'computer',
             'status', 'location', 'purchase_date', 'warranty_expiry',
-            'purchase_cost', 'notes'
+            'purchase_cost', 'notes', 'version'
         ]
         widgets = {
             'purchase_date': forms.DateInput(attrs={'type': 'date'}),
             'warranty_expiry': forms.DateInput(attrs={'type': 'date'}),
             'notes': forms.Textarea(attrs={'rows': 3}),
             'purchase_cost': forms.NumberInput(attrs={'step': '0.01'}),
+            'computer': AssetAutocompleteSelect('computer'),
         }
 
 
@@ -126,3 +138,24 @@ class SearchForm(forms.Form):
         required=False,
         widget=forms.DateInput(attrs={'type': 'date'})
     )
+
+
+# ==================== Admin Bulk Action Forms ====================
+
+class BulkLocationForm(forms.Form):
+    """Intermediate form for the 'move to location' admin action"""
+    location = forms.CharField(max_length=100)
+
+
+class BulkDepartmentForm(forms.Form):
+    """Intermediate form for the 'set department' admin action"""
+    department = forms.CharField(max_length=255)
+
+
+class BulkComputerForm(forms.Form):
+    """Intermediate form for the 'reassign to computer' admin action"""
+    computer = forms.ModelChoiceField(
+        queryset=Computers.objects.all(), required=False,
+        widget=AssetAutocompleteSelect('computer'),
+        help_text='Leave empty to unassign.'
+    )
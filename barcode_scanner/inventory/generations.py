@@ -0,0 +1,55 @@
+"""
+Per-table change generations.
+
+Each table that API responses are built from has a counter in the shared
+cache that is bumped whenever any of its rows change (signals, plus the
+set-based bulk paths that bypass them). A response derived from a set of
+tables is unchanged for as long as their generations are, which makes the
+generations usable as validators for conditional GET.
+
+A counter that is missing (never set, or evicted) starts again from the
+current time in nanoseconds rather than from 1, so it cannot repeat a
+value a client may still hold.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+KEY_PREFIX = 'inventory:generation'
+
+
+def _key(model):
+    return f'{KEY_PREFIX}:{model._meta.label_lower}'
+
+
+def get_generations(models):
+    """Current generation of each model, in order"""
+    keys = [_key(model) for model in models]
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, time.time_ns(), None)
+            values[key] = cache.get(key)
+    return [values[key] for key in keys]
+
+
+def _bump(models):
+    for model in models:
+        key = _key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def bump(*models):
+    """
+    Record a change to the given tables.
+
+    Bumped immediately and again once the transaction commits, so a reader
+    that saw the new generation before the commit was visible does not keep
+    the old data under it.
+    """
+    _bump(models)
+    transaction.on_commit(lambda: _bump(models))
@@ -0,0 +1,51 @@
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from inventory import api_views
+from inventory.management.commands.benchmark_list_serialization import _best_of
+from inventory.renderers import FastJSONParser, FastJSONRenderer, use_orjson
+
+
+class Command(BaseCommand):
+    help = 'Compare the stdlib and orjson API renderer/parser on a /api/history/ page'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=100,
+            help='History rows in the page (as with ?page_size=100)'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Timed runs per path; the best run is reported'
+        )
+
+    def handle(self, *args, **options):
+        if not use_orjson():
+            self.stdout.write('orjson is not installed or API_JSON_BACKEND is not orjson')
+            return
+
+        rows, repeat = options['rows'], options['repeat']
+        results = api_views.AssetHistorySerializer(
+            api_views.AssetHistoryViewSet.queryset[:rows], many=True
+        ).data
+        if not results:
+            self.stdout.write('history: no rows, skipped')
+            return
+        # Shaped like a paginated /api/history/?page_size=<rows> response
+        data = {'count': len(results), 'next': None, 'previous': None, 'results': results}
+
+        body = JSONRenderer().render(data)
+        timings = [
+            ('render', _best_of(repeat, lambda: JSONRenderer().render(data)),
+             _best_of(repeat, lambda: FastJSONRenderer().render(data))),
+            ('parse', _best_of(repeat, lambda: JSONParser().parse(BytesIO(body))),
+             _best_of(repeat, lambda: FastJSONParser().parse(BytesIO(body)))),
+        ]
+        for name, stdlib, fast in timings:
+            self.stdout.write(
+                f'history {name}: {len(results)} rows, {len(body)} bytes, '
+                f'json {stdlib * 1000:.2f} ms, orjson {fast * 1000:.2f} ms ({stdlib / fast:.1f}x)'
+            )
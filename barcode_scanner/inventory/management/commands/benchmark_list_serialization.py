@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory import api_views
+from inventory.fast_lists import row_plan
+
+# Endpoint name -> (base queryset, list serializer)
+LISTS = {
+    'computers': (api_views.ComputerViewSet.queryset, api_views.ComputerListSerializer),
+    'printers': (api_views.PrinterViewSet.queryset, api_views.PrinterListSerializer),
+    'monitors': (api_views.MonitorViewSet.queryset, api_views.MonitorListSerializer),
+    'docking-stations': (api_views.DockingStationViewSet.queryset, api_views.DockingStationListSerializer),
+    'history': (api_views.AssetHistoryViewSet.queryset, api_views.AssetHistorySerializer),
+}
+
+
+def _best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = 'Compare list serializers with the values_list() fast path on the current data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=100,
+            help='Rows per list page (the API maximum is 100)'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Timed runs per path; the best run is reported'
+        )
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        for name, (queryset, serializer_class) in LISTS.items():
+            page = queryset.all()[:rows]
+            plan = row_plan(serializer_class)
+            count = page.count()
+            if not count:
+                self.stdout.write(f'{name}: no rows, skipped')
+                continue
+
+            serializer = _best_of(repeat, lambda: serializer_class(page.all(), many=True).data)
+            fast = _best_of(repeat, lambda: plan.to_representation(plan.values(page.all())))
+            self.stdout.write(
+                f'{name}: {count} rows, serializer {serializer * 1000:.2f} ms, '
+                f'fast path {fast * 1000:.2f} ms ({serializer / fast:.1f}x)'
+            )
@@ -0,0 +1,49 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from inventory import api_views
+
+# URL name -> viewset with a stream action
+STREAMS = {
+    'computers': api_views.ComputerViewSet,
+    'printers': api_views.PrinterViewSet,
+    'monitors': api_views.MonitorViewSet,
+    'docking-stations': api_views.DockingStationViewSet,
+    'history': api_views.AssetHistoryViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure /api/<type>/stream/ throughput in rows per second on the current data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--endpoint', action='append', choices=list(STREAMS),
+            help='Endpoint to stream; repeat for several (default: all)'
+        )
+
+    def handle(self, *args, **options):
+        # An unsaved staff user is enough for IsAuthenticated
+        user = User(username='benchmark', is_staff=True)
+        for name in options['endpoint'] or STREAMS:
+            request = APIRequestFactory().get(f'/api/{name}/stream/')
+            force_authenticate(request, user=user)
+
+            start = time.perf_counter()
+            response = STREAMS[name].as_view({'get': 'stream'})(request)
+            rows = size = 0
+            for chunk in response.streaming_content:
+                rows += chunk.count(b'\n')
+                size += len(chunk)
+            elapsed = time.perf_counter() - start
+
+            if not rows:
+                self.stdout.write(f'{name}: no rows, skipped')
+                continue
+            self.stdout.write(
+                f'{name}: {rows} rows, {size / 1024:.1f} KiB in {elapsed * 1000:.1f} ms '
+                f'({rows / elapsed:,.0f} rows/s)'
+            )
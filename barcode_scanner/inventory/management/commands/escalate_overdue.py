@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from inventory.overdue import ESCALATION_BATCH_SIZE, ESCALATION_INTERVAL, escalate_overdue
+
+
+class Command(BaseCommand):
+    help = 'Queue escalation notices for overdue checked-out assignments (sent by process_outbox)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=ESCALATION_BATCH_SIZE,
+            help='Assignments to update and queue notices for per batch'
+        )
+        parser.add_argument(
+            '--interval-days', type=int, default=ESCALATION_INTERVAL.days,
+            help='Days before a still-overdue assignment is escalated again'
+        )
+
+    def handle(self, *args, **options):
+        escalated = escalate_overdue(
+            batch_size=options['batch_size'],
+            interval=timedelta(days=options['interval_days']),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Escalated {escalated} overdue assignment(s)'))
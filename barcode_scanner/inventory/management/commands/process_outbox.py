@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory.outbox import OUTBOX_BATCH_SIZE, process_outbox
+
+
+class Command(BaseCommand):
+    help = 'Send queued assignment notifications from the notification outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=OUTBOX_BATCH_SIZE,
+            help='Entries to claim and send per batch'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new entries instead of exiting when drained'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Seconds to wait between polls when the outbox is empty (with --loop)'
+        )
+
+    def handle(self, *args, **options):
+        totals = {'sent': 0, 'skipped': 0, 'retried': 0, 'dead': 0}
+        while True:
+            counts = process_outbox(batch_size=options['batch_size'])
+            for key, value in counts.items():
+                totals[key] += value
+            if not any(counts.values()):
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            'Outbox: {sent} sent, {skipped} skipped, {retried} retrying, {dead} dead-lettered'.format(**totals)
+        ))
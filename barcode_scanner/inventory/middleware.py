@@ -1,8 +1,20 @@
 """
 Custom middleware for the inventory application.
 """
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
 from .signals import set_current_user, set_current_ip
 
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
 
 def get_client_ip(request):
     """Extract client IP from request"""
@@ -76,3 +88,118 @@ class RateLimitMiddleware:
                 self.cache[ip] = (1, current_time)
 
         return self.get_response(request)
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q > 0)"""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        try:
+            q = float(params.strip()[2:]) if params.strip().startswith('q=') else 1.0
+        except ValueError:
+            q = 1.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=CompressionMiddleware.brotli_quality)
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _abrotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=CompressionMiddleware.brotli_quality)
+    async for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress dynamic responses with Brotli (when installed) or gzip.
+
+    Whitenoise only serves static files, so this covers HTML pages, CSV
+    exports and API JSON, including streaming responses. Responses smaller
+    than COMPRESSION_MIN_SIZE, with a content type outside
+    COMPRESSION_CONTENT_TYPES (such as QR code PNGs) or already encoded are
+    passed through. Like Django's GZipMiddleware, gzip output carries random
+    header bytes against BREACH and strong ETags are made weak.
+    """
+    max_random_bytes = 100
+    # Brotli levels above ~5 cost more CPU than dynamic responses justify
+    brotli_quality = 5
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.compress(request, response)
+
+    def should_compress(self, response):
+        if response.has_header('Content-Encoding'):
+            return False
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type in settings.COMPRESSION_CONTENT_TYPES
+
+    def choose_encoding(self, request):
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    def compress(self, request, response):
+        if not self.should_compress(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self._compress_stream(
+                response.streaming_content, encoding, response.is_async
+            )
+            # The compressed size is not known until the stream ends
+            del response.headers['Content-Length']
+        else:
+            if encoding == 'br':
+                compressed = brotli.compress(response.content, quality=self.brotli_quality)
+            else:
+                compressed = compress_string(
+                    response.content, max_random_bytes=self.max_random_bytes
+                )
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compress_stream(self, content, encoding, is_async):
+        if encoding == 'br':
+            return _abrotli_sequence(content) if is_async else _brotli_sequence(content)
+        if not is_async:
+            return compress_sequence(content, max_random_bytes=self.max_random_bytes)
+
+        async def gzip_chunks():
+            # One gzip member per chunk, as GZipMiddleware does for async streams
+            async for chunk in content:
+                yield compress_string(chunk, max_random_bytes=self.max_random_bytes)
+        return gzip_chunks()
@@ -0,0 +1,347 @@
+# Generated by Django 4.2 on 2026-10-19 16:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('inventory', '0020_alter_docking_stations_computer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(max_length=50)),
+                ('asset_id', models.CharField(max_length=255)),
+                ('assigned_to', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending Approval'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('checked_out', 'Checked Out'), ('returned', 'Returned')], default='pending', max_length=20)),
+                ('assigned_date', models.DateTimeField(auto_now_add=True)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('returned_date', models.DateTimeField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('digital_signature', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Asset Assignment',
+                'verbose_name_plural': 'Asset Assignments',
+                'ordering': ['-assigned_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssetHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(max_length=50)),
+                ('asset_id', models.CharField(max_length=255)),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted'), ('assigned', 'Assigned'), ('unassigned', 'Unassigned')], max_length=20)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('old_values', models.JSONField(blank=True, null=True)),
+                ('new_values', models.JSONField(blank=True, null=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Asset History',
+                'verbose_name_plural': 'Asset Histories',
+                'ordering': ['-changed_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationSetting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('warranty_reminder_days', models.IntegerField(default=30)),
+                ('email_on_assignment', models.BooleanField(default=True)),
+                ('email_on_warranty_expiry', models.BooleanField(default=True)),
+                ('daily_summary', models.BooleanField(default=False)),
+                ('weekly_summary', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AlterModelOptions(
+            name='computers',
+            options={'permissions': [('can_view_computers', 'Can view computers'), ('can_edit_computers', 'Can edit computers'), ('can_delete_computers', 'Can delete computers'), ('can_export_computers', 'Can export computers')], 'verbose_name': 'Computer', 'verbose_name_plural': 'Computers'},
+        ),
+        migrations.AlterModelOptions(
+            name='docking_stations',
+            options={'permissions': [('can_view_docking_stations', 'Can view docking stations'), ('can_edit_docking_stations', 'Can edit docking stations'), ('can_delete_docking_stations', 'Can delete docking stations'), ('can_export_docking_stations', 'Can export docking stations')], 'verbose_name': 'Docking Station', 'verbose_name_plural': 'Docking Stations'},
+        ),
+        migrations.AlterModelOptions(
+            name='monitors',
+            options={'permissions': [('can_view_monitors', 'Can view monitors'), ('can_edit_monitors', 'Can edit monitors'), ('can_delete_monitors', 'Can delete monitors'), ('can_export_monitors', 'Can export monitors')], 'verbose_name': 'Monitor', 'verbose_name_plural': 'Monitors'},
+        ),
+        migrations.AlterModelOptions(
+            name='printers',
+            options={'permissions': [('can_view_printers', 'Can view printers'), ('can_edit_printers', 'Can edit printers'), ('can_delete_printers', 'Can delete printers'), ('can_export_printers', 'Can export printers')], 'verbose_name': 'Printer', 'verbose_name_plural': 'Printers'},
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='location',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='notes',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='purchase_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='purchase_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('retired', 'Retired'), ('repair', 'In Repair'), ('disposed', 'Disposed'), ('available', 'Available')], default='active', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='warranty_expiry',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='location',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='notes',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='purchase_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='purchase_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('retired', 'Retired'), ('repair', 'In Repair'), ('disposed', 'Disposed'), ('available', 'Available')], default='active', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='warranty_expiry',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='location',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='notes',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='purchase_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='purchase_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('retired', 'Retired'), ('repair', 'In Repair'), ('disposed', 'Disposed'), ('available', 'Available')], default='active', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='warranty_expiry',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='location',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='notes',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='purchase_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='purchase_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('retired', 'Retired'), ('repair', 'In Repair'), ('disposed', 'Disposed'), ('available', 'Available')], default='active', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='warranty_expiry',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='computers',
+            name='printers',
+            field=models.ManyToManyField(blank=True, related_name='Computers', to='inventory.printers'),
+        ),
+        migrations.AddIndex(
+            model_name='computers',
+            index=models.Index(fields=['department'], name='inventory_c_departm_c170a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='computers',
+            index=models.Index(fields=['user'], name='inventory_c_user_a58918_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='computers',
+            index=models.Index(fields=['make', 'model'], name='inventory_c_make_9e9454_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='computers',
+            index=models.Index(fields=['status'], name='inventory_c_status_0c01bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='computers',
+            index=models.Index(fields=['asset_tag'], name='inventory_c_asset_t_9cbba7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='computers',
+            index=models.Index(fields=['service_tag'], name='inventory_c_service_523237_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='docking_stations',
+            index=models.Index(fields=['asset_tag'], name='inventory_d_asset_t_5414b3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='docking_stations',
+            index=models.Index(fields=['status'], name='inventory_d_status_9a7805_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monitors',
+            index=models.Index(fields=['asset_tag'], name='inventory_m_asset_t_ebb3c7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monitors',
+            index=models.Index(fields=['service_tag'], name='inventory_m_service_3589d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monitors',
+            index=models.Index(fields=['status'], name='inventory_m_status_2be9bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='printers',
+            index=models.Index(fields=['service_tag'], name='inventory_p_service_ddc225_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='printers',
+            index=models.Index(fields=['status'], name='inventory_p_status_9fdd8b_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationsetting',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='assethistory',
+            name='changed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='assetassignment',
+            name='approved_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assignments_approved', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='assetassignment',
+            name='assigned_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assignments_made', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='assethistory',
+            index=models.Index(fields=['asset_type', 'asset_id'], name='inventory_a_asset_t_08306d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assethistory',
+            index=models.Index(fields=['changed_at'], name='inventory_a_changed_f7e9ab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assethistory',
+            index=models.Index(fields=['action'], name='inventory_a_action_eef49c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(fields=['asset_type', 'asset_id'], name='inventory_a_asset_t_444106_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(fields=['status'], name='inventory_a_status_4ccbbf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(fields=['assigned_to'], name='inventory_a_assigne_be1984_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+ASSET_MODELS = {
+    'computer': 'Computers',
+    'printer': 'printers',
+    'monitor': 'monitors',
+    'docking_station': 'docking_stations',
+}
+
+
+def populate_asset_index(apps, schema_editor):
+    """Index the assets that existed before the signals maintained the table"""
+    AssetIndex = apps.get_model('inventory', 'AssetIndex')
+    for asset_type, model_name in ASSET_MODELS.items():
+        model = apps.get_model('inventory', model_name)
+        has_asset_tag = any(f.name == 'asset_tag' for f in model._meta.fields)
+        entries = [
+            AssetIndex(
+                asset_type=asset_type,
+                asset_id=asset.pk,
+                asset_tag=asset.asset_tag if has_asset_tag else None,
+                service_tag=asset.service_tag,
+                status=asset.status,
+                location=asset.location,
+            )
+            for asset in model.objects.iterator(chunk_size=2000)
+        ]
+        AssetIndex.objects.bulk_create(entries, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0021_assetassignment_assethistory_notificationsetting_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(choices=[('computer', 'Computer'), ('printer', 'Printer'), ('monitor', 'Monitor'), ('docking_station', 'Docking Station')], max_length=20)),
+                ('asset_id', models.CharField(max_length=255)),
+                ('asset_tag', models.CharField(blank=True, max_length=255, null=True)),
+                ('service_tag', models.CharField(blank=True, max_length=255, null=True)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('retired', 'Retired'), ('repair', 'In Repair'), ('disposed', 'Disposed'), ('available', 'Available')], default='active', max_length=20)),
+                ('location', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'verbose_name': 'Asset Index Entry',
+                'verbose_name_plural': 'Asset Index',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='assetindex',
+            index=models.Index(fields=['asset_tag'], name='inventory_a_asset_t_75a709_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetindex',
+            index=models.Index(fields=['service_tag'], name='inventory_a_service_e1894e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetindex',
+            index=models.Index(fields=['status'], name='inventory_a_status_bb41cd_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='assetindex',
+            constraint=models.UniqueConstraint(fields=('asset_type', 'asset_id'), name='unique_asset_index_entry'),
+        ),
+        migrations.RunPython(populate_asset_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-19 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0022_assetindex'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='assetindex',
+            name='inventory_a_asset_t_75a709_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='assetindex',
+            name='inventory_a_service_e1894e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='assetindex',
+            index=models.Index(fields=['asset_tag'], name='asset_index_asset_tag', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='assetindex',
+            index=models.Index(fields=['service_tag'], name='asset_index_service_tag', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='assetindex',
+            index=models.Index(fields=['asset_id'], name='asset_index_asset_id', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
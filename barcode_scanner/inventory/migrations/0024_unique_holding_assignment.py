@@ -0,0 +1,75 @@
+# Generated by Django 4.2 on 2026-10-19 16:25
+
+from django.db import migrations, models
+
+
+HOLDING_STATUSES = ('approved', 'checked_out')
+
+# Canonical AssetType labels by lowercased label or code, as accepted by
+# asset_index.asset_type_code (frozen here so the migration does not change)
+CANONICAL_ASSET_TYPES = {
+    'computer': 'Computer',
+    'printer': 'Printer',
+    'monitor': 'Monitor',
+    'docking_station': 'Docking Station',
+    'docking station': 'Docking Station',
+}
+
+
+def normalize_asset_types(apps, schema_editor):
+    """
+    Rewrite case and code variants of asset_type ('computer', 'PRINTER ')
+    to the canonical labels check_assignable stores, so the duplicate
+    check and the constraint below see them as the same asset.
+    """
+    AssetAssignment = apps.get_model('inventory', 'AssetAssignment')
+    variants = (
+        AssetAssignment.objects.exclude(asset_type__in=CANONICAL_ASSET_TYPES.values())
+        .values_list('asset_type', flat=True).distinct()
+    )
+    for asset_type in list(variants):
+        canonical = CANONICAL_ASSET_TYPES.get(asset_type.strip().lower())
+        if canonical:
+            AssetAssignment.objects.filter(asset_type=asset_type).update(asset_type=canonical)
+
+
+def release_duplicate_holders(apps, schema_editor):
+    """
+    Keep the earliest holding assignment of each asset and send the others
+    back to pending with a note, so the constraint below can be added.
+    """
+    AssetAssignment = apps.get_model('inventory', 'AssetAssignment')
+    holding = AssetAssignment.objects.filter(status__in=HOLDING_STATUSES)
+    duplicated = (
+        holding.values('asset_type', 'asset_id')
+        .annotate(holders=models.Count('id'))
+        .filter(holders__gt=1)
+    )
+    for asset in duplicated.iterator():
+        keeper, *others = holding.filter(
+            asset_type=asset['asset_type'], asset_id=asset['asset_id']
+        ).order_by('assigned_date', 'id')
+        for assignment in others:
+            note = (
+                f"Returned to pending by migration 0024: the asset is already "
+                f"{keeper.status.replace('_', ' ')} under assignment {keeper.id}."
+            )
+            assignment.notes = f"{assignment.notes}\n{note}" if assignment.notes else note
+            assignment.status = 'pending'
+            assignment.save(update_fields=['status', 'notes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0023_asset_index_prefix_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_asset_types, migrations.RunPython.noop),
+        migrations.RunPython(release_duplicate_holders, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='assetassignment',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['approved', 'checked_out'])), fields=('asset_type', 'asset_id'), name='unique_holding_assignment'),
+        ),
+    ]
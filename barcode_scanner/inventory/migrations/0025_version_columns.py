@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-19 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0024_unique_holding_assignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetassignment',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='computers',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='docking_stations',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='monitors',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='printers',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-19 16:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0025_version_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetassignment',
+            name='escalated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(condition=models.Q(('status', 'checked_out')), fields=['due_date', 'id'], name='assignment_overdue_idx'),
+        ),
+    ]
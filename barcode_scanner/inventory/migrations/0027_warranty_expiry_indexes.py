@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-19 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0026_overdue_assignments'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='computers',
+            index=models.Index(condition=models.Q(('warranty_expiry__isnull', False)), fields=['warranty_expiry'], name='computers_warranty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='docking_stations',
+            index=models.Index(condition=models.Q(('warranty_expiry__isnull', False)), fields=['warranty_expiry'], name='docking_warranty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monitors',
+            index=models.Index(condition=models.Q(('warranty_expiry__isnull', False)), fields=['warranty_expiry'], name='monitors_warranty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='printers',
+            index=models.Index(condition=models.Q(('warranty_expiry__isnull', False)), fields=['warranty_expiry'], name='printers_warranty_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-19 16:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('inventory', '0028_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WarrantyAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(choices=[('computer', 'Computer'), ('printer', 'Printer'), ('monitor', 'Monitor'), ('docking_station', 'Docking Station')], max_length=20)),
+                ('asset_id', models.CharField(max_length=255)),
+                ('threshold', models.PositiveIntegerField()),
+                ('warranty_expiry', models.DateField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='warranty_alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Warranty Alert',
+                'verbose_name_plural': 'Warranty Alerts',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='warrantyalert',
+            index=models.Index(fields=['asset_id'], name='inventory_w_asset_i_d3976c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warrantyalert',
+            index=models.Index(fields=['warranty_expiry'], name='inventory_w_warrant_2a7932_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='warrantyalert',
+            constraint=models.UniqueConstraint(fields=('user', 'asset_type', 'asset_id', 'threshold'), name='unique_warranty_alert'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-19 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0029_warranty_alerts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='docking_stations',
+            index=models.Index(fields=['service_tag'], name='inventory_d_service_e4ffe4_idx'),
+        ),
+    ]
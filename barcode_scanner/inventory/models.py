@@ -11,7 +11,55 @@ class AssetStatus(models.TextChoices):
     AVAILABLE = 'available', 'Available'
 
 
-class BaseAsset(models.Model):
+class AssetType(models.TextChoices):
+    """Asset type codes; labels match the asset_type strings in history and assignments"""
+    COMPUTER = 'computer', 'Computer'
+    PRINTER = 'printer', 'Printer'
+    MONITOR = 'monitor', 'Monitor'
+    DOCKING_STATION = 'docking_station', 'Docking Station'
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a versioned row was changed by someone else since it was read"""
+
+
+class VersionedModel(models.Model):
+    """
+    Abstract base adding optimistic concurrency control.
+
+    Every UPDATE compares the version the instance was read (or submitted)
+    with in its WHERE clause and increments it, so a save based on stale
+    data raises ConcurrentUpdateError instead of silently overwriting.
+    """
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        abstract = True
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        version_field = self._meta.get_field('version')
+        values = [
+            (field, model, value) for field, model, value in values
+            if field is not version_field
+        ]
+        values.append((version_field, None, models.F('version') + 1))
+
+        updated = super()._do_update(
+            base_qs.filter(version=self.version), using, pk_val,
+            values, update_fields, forced_update
+        )
+        if updated:
+            self.version += 1
+            return True
+        # A new instance with a preset pk falls through to INSERT as usual
+        if not self._state.adding and base_qs.filter(pk=pk_val).exists():
+            raise ConcurrentUpdateError(
+                f'{self._meta.verbose_name} {pk_val} was changed by someone else.'
+            )
+        return False
+
+
+class BaseAsset(VersionedModel):
     """Abstract base model for common asset fields"""
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -55,6 +103,11 @@ class Computers(BaseAsset):
             models.Index(fields=['user']),
             models.Index(fields=['make', 'model']),
             models.Index(fields=['status']),
+            # Warranty expiry range scans skip assets without a warranty date
+            models.Index(
+                fields=['warranty_expiry'], name='computers_warranty_idx',
+                condition=models.Q(warranty_expiry__isnull=False)
+            ),
             models.Index(fields=['asset_tag']),
             models.Index(fields=['service_tag']),
         ]
@@ -81,6 +134,11 @@ class printers(BaseAsset):
         indexes = [
             models.Index(fields=['service_tag']),
             models.Index(fields=['status']),
+            # Warranty expiry range scans skip assets without a warranty date
+            models.Index(
+                fields=['warranty_expiry'], name='printers_warranty_idx',
+                condition=models.Q(warranty_expiry__isnull=False)
+            ),
         ]
         permissions = [
             ("can_view_printers", "Can view printers"),
@@ -108,7 +166,14 @@ class docking_stations(BaseAsset):
         verbose_name_plural = "Docking Stations"
         indexes = [
             models.Index(fields=['asset_tag']),
+            # Multi-get lookups match service tags with IN
+            models.Index(fields=['service_tag']),
             models.Index(fields=['status']),
+            # Warranty expiry range scans skip assets without a warranty date
+            models.Index(
+                fields=['warranty_expiry'], name='docking_warranty_idx',
+                condition=models.Q(warranty_expiry__isnull=False)
+            ),
         ]
         permissions = [
             ("can_view_docking_stations", "Can view docking stations"),
@@ -138,6 +203,11 @@ class monitors(BaseAsset):
             models.Index(fields=['asset_tag']),
             models.Index(fields=['service_tag']),
             models.Index(fields=['status']),
+            # Warranty expiry range scans skip assets without a warranty date
+            models.Index(
+                fields=['warranty_expiry'], name='monitors_warranty_idx',
+                condition=models.Q(warranty_expiry__isnull=False)
+            ),
         ]
         permissions = [
             ("can_view_monitors", "Can view monitors"),
@@ -147,6 +217,52 @@ class monitors(BaseAsset):
         ]
 
 
+class AssetIndex(models.Model):
+    """
+    Cross-type index of every asset, maintained by signals.
+    Resolves tags and polymorphic (asset_type, asset_id) references in one query.
+    """
+    asset_type = models.CharField(max_length=20, choices=AssetType.choices)
+    asset_id = models.CharField(max_length=255)
+    asset_tag = models.CharField(max_length=255, blank=True, null=True)
+    service_tag = models.CharField(max_length=255, blank=True, null=True)
+    status = models.CharField(
+        max_length=20,
+        choices=AssetStatus.choices,
+        default=AssetStatus.ACTIVE
+    )
+    location = models.CharField(max_length=100, blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Asset Index Entry"
+        verbose_name_plural = "Asset Index"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['asset_type', 'asset_id'], name='unique_asset_index_entry'
+            ),
+        ]
+        # Pattern ops let PostgreSQL serve prefix (LIKE 'x%') searches from
+        # the index; other backends ignore opclasses
+        indexes = [
+            models.Index(
+                fields=['asset_tag'], name='asset_index_asset_tag',
+                opclasses=['varchar_pattern_ops']
+            ),
+            models.Index(
+                fields=['service_tag'], name='asset_index_service_tag',
+                opclasses=['varchar_pattern_ops']
+            ),
+            models.Index(
+                fields=['asset_id'], name='asset_index_asset_id',
+                opclasses=['varchar_pattern_ops']
+            ),
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_asset_type_display()} {self.asset_id}"
+
+
 class AssetHistory(models.Model):
     """Audit trail model to track all asset changes"""
     ACTION_CHOICES = [
@@ -182,7 +298,7 @@ class AssetHistory(models.Model):
         return f"{self.asset_type} {self.asset_id} - {self.action} at {self.changed_at}"
 
 
-class AssetAssignment(models.Model):
+class AssetAssignment(VersionedModel):
     """Track asset assignments to users with workflow"""
     STATUS_CHOICES = [
         ('pending', 'Pending Approval'),
@@ -207,6 +323,7 @@ class AssetAssignment(models.Model):
     assigned_date = models.DateTimeField(auto_now_add=True)
     due_date = models.DateField(null=True, blank=True)
     returned_date = models.DateTimeField(null=True, blank=True)
+    escalated_at = models.DateTimeField(null=True, blank=True)  # Last overdue escalation
     notes = models.TextField(blank=True, null=True)
     digital_signature = models.TextField(blank=True, null=True)  # Base64 encoded signature
 
@@ -218,6 +335,20 @@ class AssetAssignment(models.Model):
             models.Index(fields=['asset_type', 'asset_id']),
             models.Index(fields=['status']),
             models.Index(fields=['assigned_to']),
+            # Overdue lookups only ever read checked-out rows, ordered by due date
+            models.Index(
+                fields=['due_date', 'id'], name='assignment_overdue_idx',
+                condition=models.Q(status='checked_out')
+            ),
+        ]
+        constraints = [
+            # At most one approved or checked-out assignment per asset
+            # (partial unique index; skipped on backends without support)
+            models.UniqueConstraint(
+                fields=['asset_type', 'asset_id'],
+                condition=models.Q(status__in=['approved', 'checked_out']),
+                name='unique_holding_assignment'
+            ),
         ]
 
     def __str__(self):
@@ -235,3 +366,67 @@ class NotificationSetting(models.Model):
 
     def __str__(self):
         return f"Notification settings for {self.user.username}"
+
+
+class WarrantyAlert(models.Model):
+    """A warranty expiry alert already sent to a user, one per reminder threshold"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='warranty_alerts')
+    asset_type = models.CharField(max_length=20, choices=AssetType.choices)
+    asset_id = models.CharField(max_length=255)
+    threshold = models.PositiveIntegerField()  # Days before expiry
+    warranty_expiry = models.DateField()  # Expiry date the alert was sent for
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Warranty Alert"
+        verbose_name_plural = "Warranty Alerts"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'asset_type', 'asset_id', 'threshold'],
+                name='unique_warranty_alert'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['asset_id']),
+            models.Index(fields=['warranty_expiry']),
+        ]
+
+    def __str__(self):
+        return f"{self.asset_type} {self.asset_id} alert at {self.threshold} days for {self.user}"
+
+
+class NotificationOutbox(models.Model):
+    """Assignment notification queued in the same transaction as the change"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('skipped', 'Skipped'),
+        ('dead', 'Dead Letter'),
+    ]
+
+    assignment = models.ForeignKey(
+        AssetAssignment, on_delete=models.CASCADE, related_name='outbox_entries'
+    )
+    action = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Notification Outbox Entry"
+        verbose_name_plural = "Notification Outbox"
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            # The worker only ever polls pending entries that are due
+            models.Index(
+                fields=['next_attempt_at', 'id'], name='outbox_pending_idx',
+                condition=models.Q(status='pending')
+            ),
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"{self.action} notification for assignment {self.assignment_id} ({self.status})"
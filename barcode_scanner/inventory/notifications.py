@@ -1,168 +1,290 @@
 """
 Email notification utilities for the Asset Management System
+
+Bulk notifications are built as EmailMultiAlternatives messages and handed
+to deliver(), which sends them in batches over one mail connection per
+batch instead of one SMTP connection and TLS handshake per message.
 """
 import logging
+import time
+from bisect import bisect_left, bisect_right
 from datetime import timedelta
 from django.conf import settings
-from django.core.mail import send_mail, send_mass_mail
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import CharField, F, Value
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.contrib.auth.models import User
 
 from .models import (
     Computers, printers, monitors, docking_stations,
-    AssetAssignment, NotificationSetting
+    AssetAssignment, AssetType, WarrantyAlert
 )
 
 logger = logging.getLogger(__name__)
 
 
+# Expiring-warranty kinds, in email order:
+# (context key, asset type, model, tag field, model field)
+WARRANTY_SOURCES = (
+    ('computers', AssetType.COMPUTER, Computers, 'asset_tag', 'model'),
+    ('printers', AssetType.PRINTER, printers, 'service_tag', None),
+    ('monitors', AssetType.MONITOR, monitors, 'asset_tag', None),
+    ('docking_stations', AssetType.DOCKING_STATION, docking_stations, 'asset_tag', None),
+)
+
+
+WARRANTY_FIELDS = ('id', 'make', 'warranty_expiry', 'kind', 'asset_type', 'tag', 'asset_model')
+
+
+def _expiring_branch(source, start, end):
+    """One asset type's warranties expiring between start and end"""
+    kind, asset_type, model, tag_field, model_field = source
+    return model.objects.filter(
+        warranty_expiry__gte=start, warranty_expiry__lte=end
+    ).annotate(
+        kind=Value(kind, output_field=CharField()),
+        asset_type=Value(asset_type.value, output_field=CharField()),
+        tag=F(tag_field),
+        asset_model=F(model_field) if model_field else Value(None, output_field=CharField()),
+    )
+
+
+def expiring_warranties(start, end):
+    """
+    Assets of every type with a warranty expiring between start and end,
+    fetched with one UNION ALL query and sorted by expiry date. Each branch
+    is a range scan on that model's partial warranty_expiry index.
+    """
+    branches = [
+        _expiring_branch(source, start, end).values(*WARRANTY_FIELDS)
+        for source in WARRANTY_SOURCES
+    ]
+    return list(branches[0].union(*branches[1:], all=True).order_by('warranty_expiry', 'id'))
+
+
+def sent_warranty_alerts(users, start, end):
+    """
+    Alerts already sent to the given users (a queryset or ids) for
+    warranties expiring between start and end, as a set of
+    (user_id, asset_type, asset_id, threshold, warranty_expiry) keys,
+    fetched with one query.
+    """
+    return set(WarrantyAlert.objects.filter(
+        user__in=users, warranty_expiry__gte=start, warranty_expiry__lte=end
+    ).values_list('user_id', 'asset_type', 'asset_id', 'threshold', 'warranty_expiry'))
+
+
+def unsent_warranty_alerts(user, today, thresholds, expiring, expiry_dates, sent):
+    """
+    The expiring assets a user has not yet been alerted about at the
+    threshold they are now within, with that threshold.
+
+    expiring is the expiring_warranties() list for the widest window,
+    expiry_dates its warranty_expiry values and sent the
+    sent_warranty_alerts() keys, so no queries are made: the user's window
+    is a prefix of the list, found by bisection. An alert for a different
+    expiry date does not count, so a renewed warranty starts over.
+    """
+    end = bisect_right(expiry_dates, today + timedelta(days=thresholds[-1]))
+    alerts = []
+    for asset in expiring[:end]:
+        threshold = thresholds[bisect_left(thresholds, (asset['warranty_expiry'] - today).days)]
+        key = (user.pk, asset['asset_type'], asset['id'], threshold, asset['warranty_expiry'])
+        if key not in sent:
+            alerts.append({**asset, 'threshold': threshold})
+    return alerts
+
+
+def alert_thresholds(reminder_days):
+    """
+    Days-before-expiry thresholds at which a user is alerted: their own
+    reminder window plus each configured milestone inside it, ascending.
+    """
+    milestones = getattr(settings, 'WARRANTY_ALERT_MILESTONES', [30, 7, 1])
+    return sorted({reminder_days, *(m for m in milestones if 0 <= m < reminder_days)})
+
+
 def send_warranty_expiry_notifications():
     """
     Send email notifications for assets with warranties expiring soon.
     Should be run daily via a cron job or Celery task.
+
+    Each asset is reported to a user once per alert threshold. The
+    expiring assets for the widest window and the alerts already recorded
+    in WarrantyAlert are each fetched once for all users and matched per
+    user in memory, so the query count does not grow with users, and mail,
+    rendering and state writes scale with new alerts only. Alerts are
+    recorded as each mail batch is delivered; those in a batch that failed
+    are picked up again by the next run.
     """
     today = timezone.now().date()
-    reminder_days = getattr(settings, 'WARRANTY_REMINDER_DAYS', 30)
-    expiry_date = today + timedelta(days=reminder_days)
 
     # Get users who want warranty notifications
-    users_with_notifications = User.objects.filter(
-        notificationsetting__email_on_warranty_expiry=True
-    ).select_related('notificationsetting')
+    subscribed = User.objects.filter(notificationsetting__email_on_warranty_expiry=True)
+    users_with_notifications = [
+        user for user in subscribed.select_related('notificationsetting')
+        if user.email
+    ]
 
-    if not users_with_notifications.exists():
+    if not users_with_notifications:
         logger.info("No users configured for warranty notifications")
-        return
-
-    # Collect expiring assets
-    expiring_assets = {
-        'computers': list(Computers.objects.filter(
-            warranty_expiry__lte=expiry_date,
-            warranty_expiry__gte=today
-        ).values('id', 'asset_tag', 'make', 'model', 'warranty_expiry')),
-        'printers': list(printers.objects.filter(
-            warranty_expiry__lte=expiry_date,
-            warranty_expiry__gte=today
-        ).values('id', 'service_tag', 'make', 'warranty_expiry')),
-        'monitors': list(monitors.objects.filter(
-            warranty_expiry__lte=expiry_date,
-            warranty_expiry__gte=today
-        ).values('id', 'asset_tag', 'make', 'warranty_expiry')),
-        'docking_stations': list(docking_stations.objects.filter(
-            warranty_expiry__lte=expiry_date,
-            warranty_expiry__gte=today
-        ).values('id', 'asset_tag', 'make', 'warranty_expiry')),
-    }
-
-    total_expiring = sum(len(assets) for assets in expiring_assets.values())
-
-    if total_expiring == 0:
-        logger.info("No assets with expiring warranties")
-        return
-
-    # Send notifications to each user
+        return 0
+
+    # Alert state for warranties that have passed is no longer needed
+    WarrantyAlert.objects.filter(warranty_expiry__lt=today).delete()
+
+    # Every user's window is a prefix of the widest one
+    widest_end = today + timedelta(days=max(
+        user.notificationsetting.warranty_reminder_days for user in users_with_notifications
+    ))
+    expiring = expiring_warranties(today, widest_end)
+    expiry_dates = [asset['warranty_expiry'] for asset in expiring]
+    sent = sent_warranty_alerts(subscribed.values('pk'), today, widest_end)
+
+    # Users with the same window and the same new alerts get the same
+    # email; render it once
+    rendered = {}
+    alerts = {}  # message -> alerts it reports
     for user in users_with_notifications:
-        try:
-            user_reminder_days = user.notificationsetting.warranty_reminder_days
-            user_expiry_date = today + timedelta(days=user_reminder_days)
-
-            # Filter assets based on user's preference
-            user_expiring = {
-                'computers': [a for a in expiring_assets['computers']
-                             if a['warranty_expiry'] <= user_expiry_date],
-                'printers': [a for a in expiring_assets['printers']
-                            if a['warranty_expiry'] <= user_expiry_date],
-                'monitors': [a for a in expiring_assets['monitors']
-                            if a['warranty_expiry'] <= user_expiry_date],
-                'docking_stations': [a for a in expiring_assets['docking_stations']
-                                    if a['warranty_expiry'] <= user_expiry_date],
-            }
-
-            user_total = sum(len(assets) for assets in user_expiring.values())
-            if user_total == 0:
-                continue
-
+        user_reminder_days = user.notificationsetting.warranty_reminder_days
+        new_alerts = unsent_warranty_alerts(
+            user, today, alert_thresholds(user_reminder_days), expiring, expiry_dates, sent
+        )
+        if not new_alerts:
+            continue
+
+        keys = [
+            (asset['asset_type'], asset['id'], asset['threshold'], asset['warranty_expiry'])
+            for asset in new_alerts
+        ]
+        cache_key = (user_reminder_days, tuple(keys))
+        if cache_key not in rendered:
             context = {
-                'user': user,
-                'expiring_assets': user_expiring,
-                'total_expiring': user_total,
+                'expiring_assets': {
+                    kind: [a for a in new_alerts if a['kind'] == kind]
+                    for kind, *_ in WARRANTY_SOURCES
+                },
+                'total_expiring': len(new_alerts),
                 'reminder_days': user_reminder_days,
             }
+            rendered[cache_key] = (
+                f'Asset Warranty Expiry Alert: {len(new_alerts)} assets expiring soon',
+                *render_email('warranty_expiry', context)
+            )
 
-            subject = f'Asset Warranty Expiry Alert: {user_total} assets expiring soon'
-            message = render_to_string('emails/warranty_expiry.txt', context)
-            html_message = render_to_string('emails/warranty_expiry.html', context)
-
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False
+        alerts[build_email(user.email, *rendered[cache_key])] = [
+            WarrantyAlert(
+                user=user, asset_type=asset_type, asset_id=asset_id,
+                threshold=threshold, warranty_expiry=warranty_expiry
             )
+            for asset_type, asset_id, threshold, warranty_expiry in keys
+        ]
+
+    if not alerts:
+        logger.info("No new warranty alerts")
+        return 0
+
+    def record(batch):
+        WarrantyAlert.objects.bulk_create(
+            [alert for message in batch for alert in alerts[message]],
+            update_conflicts=True,
+            unique_fields=['user', 'asset_type', 'asset_id', 'threshold'],
+            update_fields=['warranty_expiry', 'sent_at'],
+        )
 
-            logger.info(f"Sent warranty notification to {user.email}")
+    sent = deliver(alerts, on_sent=record)
+    logger.info(f"Sent {sent} of {len(alerts)} warranty notifications")
+    return sent
 
-        except Exception as e:
-            logger.error(f"Failed to send warranty notification to {user.email}: {e}")
 
+# ==================== Batched Delivery ====================
 
-def send_assignment_notification(assignment, action='created'):
-    """
-    Send email notification for asset assignment actions.
+def render_email(template, context):
+    """Render the plain-text and HTML bodies of emails/<template>"""
+    return (
+        render_to_string(f'emails/{template}.txt', context),
+        render_to_string(f'emails/{template}.html', context),
+    )
+
+
+def build_email(recipient, subject, body, html_body):
+    """Build a multipart message from already rendered bodies"""
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient],
+    )
+    message.attach_alternative(html_body, 'text/html')
+    return message
 
-    Args:
-        assignment: AssetAssignment instance
-        action: 'created', 'approved', 'rejected', 'checked_out', 'returned'
+
+def deliver(messages, batch_size=None, rate=None, on_sent=None):
     """
-    if not assignment.assigned_by or not assignment.assigned_by.email:
-        logger.warning(f"No email for assignment {assignment.id}")
-        return
-
-    # Check user notification preferences
-    try:
-        notification_setting = NotificationSetting.objects.get(
-            user=assignment.assigned_by
-        )
-        if not notification_setting.email_on_assignment:
-            return
-    except NotificationSetting.DoesNotExist:
-        pass  # Default to sending notification
-
-    subject_templates = {
-        'created': f'Asset Assignment Created: {assignment.asset_type} {assignment.asset_id}',
-        'approved': f'Asset Assignment Approved: {assignment.asset_type} {assignment.asset_id}',
-        'rejected': f'Asset Assignment Rejected: {assignment.asset_type} {assignment.asset_id}',
-        'checked_out': f'Asset Checked Out: {assignment.asset_type} {assignment.asset_id}',
-        'returned': f'Asset Returned: {assignment.asset_type} {assignment.asset_id}',
-    }
+    Send messages in batches, reusing one mail connection per batch.
 
-    subject = subject_templates.get(action, f'Asset Assignment Update: {assignment.asset_id}')
+    batch_size and rate (messages per second, 0 for unlimited) default to
+    the EMAIL_BATCH_SIZE and EMAIL_RATE_LIMIT settings. A failed batch is
+    logged and the rest are still sent; on_sent, if given, is called with
+    each batch that was sent. Returns the number of messages sent.
+    """
+    messages = list(messages)
+    batch_size = batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', 100)
+    rate = getattr(settings, 'EMAIL_RATE_LIMIT', 0) if rate is None else rate
+
+    sent = 0
+    for start in range(0, len(messages), batch_size):
+        batch = messages[start:start + batch_size]
+        started = time.monotonic()
+        try:
+            with get_connection() as connection:
+                sent += connection.send_messages(batch) or 0
+        except Exception as e:
+            logger.error(f"Failed to send batch of {len(batch)} emails: {e}")
+        else:
+            if on_sent:
+                on_sent(batch)
+
+        if rate and start + batch_size < len(messages):
+            wait = len(batch) / rate - (time.monotonic() - started)
+            if wait > 0:
+                time.sleep(wait)
+    return sent
+
+
+ASSIGNMENT_SUBJECTS = {
+    'created': 'Asset Assignment Created',
+    'approved': 'Asset Assignment Approved',
+    'rejected': 'Asset Assignment Rejected',
+    'checked_out': 'Asset Checked Out',
+    'returned': 'Asset Returned',
+    'overdue': 'Asset Overdue',
+}
+
+
+def build_assignment_email(assignment, action, connection=None):
+    """Build the notification email for an assignment action; sent by process_outbox"""
+    if action in ASSIGNMENT_SUBJECTS:
+        subject = f'{ASSIGNMENT_SUBJECTS[action]}: {assignment.asset_type} {assignment.asset_id}'
+    else:
+        subject = f'Asset Assignment Update: {assignment.asset_id}'
 
     context = {
         'assignment': assignment,
         'action': action,
     }
-
-    try:
-        message = render_to_string('emails/assignment_notification.txt', context)
-        html_message = render_to_string('emails/assignment_notification.html', context)
-
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[assignment.assigned_by.email],
-            html_message=html_message,
-            fail_silently=False
-        )
-
-        logger.info(f"Sent assignment notification to {assignment.assigned_by.email}")
-
-    except Exception as e:
-        logger.error(f"Failed to send assignment notification: {e}")
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=render_to_string('emails/assignment_notification.txt', context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[assignment.assigned_by.email],
+        connection=connection,
+    )
+    message.attach_alternative(
+        render_to_string('emails/assignment_notification.html', context), 'text/html'
+    )
+    return message
 
 
 def send_daily_summary():
@@ -175,7 +297,7 @@ def send_daily_summary():
     )
 
     if not users_with_daily_summary.exists():
-        return
+        return 0
 
     today = timezone.now().date()
     yesterday = today - timedelta(days=1)
@@ -199,27 +321,15 @@ def send_daily_summary():
         'date': yesterday,
     }
 
-    for user in users_with_daily_summary:
-        try:
-            context['user'] = user
-
-            subject = f'Asset Management Daily Summary - {yesterday}'
-            message = render_to_string('emails/daily_summary.txt', context)
-            html_message = render_to_string('emails/daily_summary.html', context)
-
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False
-            )
-
-            logger.info(f"Sent daily summary to {user.email}")
-
-        except Exception as e:
-            logger.error(f"Failed to send daily summary to {user.email}: {e}")
+    # Every recipient gets the same summary: render it once
+    rendered = render_email('daily_summary', context)
+    subject = f'Asset Management Daily Summary - {yesterday}'
+    sent = deliver(
+        build_email(email, subject, *rendered)
+        for email in users_with_daily_summary.exclude(email='').values_list('email', flat=True)
+    )
+    logger.info(f"Sent {sent} daily summaries")
+    return sent
 
 
 def send_weekly_summary():
@@ -232,7 +342,7 @@ def send_weekly_summary():
     )
 
     if not users_with_weekly_summary.exists():
-        return
+        return 0
 
     today = timezone.now().date()
     week_ago = today - timedelta(days=7)
@@ -258,24 +368,12 @@ def send_weekly_summary():
         'end_date': today,
     }
 
-    for user in users_with_weekly_summary:
-        try:
-            context['user'] = user
-
-            subject = f'Asset Management Weekly Summary - Week of {week_ago}'
-            message = render_to_string('emails/weekly_summary.txt', context)
-            html_message = render_to_string('emails/weekly_summary.html', context)
-
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False
-            )
-
-            logger.info(f"Sent weekly summary to {user.email}")
-
-        except Exception as e:
-            logger.error(f"Failed to send weekly summary to {user.email}: {e}")
+    # Every recipient gets the same summary: render it once
+    rendered = render_email('weekly_summary', context)
+    subject = f'Asset Management Weekly Summary - Week of {week_ago}'
+    sent = deliver(
+        build_email(email, subject, *rendered)
+        for email in users_with_weekly_summary.exclude(email='').values_list('email', flat=True)
+    )
+    logger.info(f"Sent {sent} weekly summaries")
+    return sent
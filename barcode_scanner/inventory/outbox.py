@@ -0,0 +1,121 @@
+"""
+Transactional notification outbox.
+
+Assignment changes queue their notification as a NotificationOutbox row in
+the same transaction, so a request pays for one INSERT instead of an SMTP
+round trip, and a notification exists exactly when its change committed.
+The process_outbox management command drains the queue in batches over
+one mail connection, retrying failures with exponential backoff and
+dead-lettering entries that keep failing.
+"""
+import logging
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import NotificationOutbox, NotificationSetting
+from .notifications import build_assignment_email
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+# Retry delay doubles per failed attempt, up to RETRY_MAX_DELAY
+RETRY_BASE_DELAY = timedelta(minutes=1)
+RETRY_MAX_DELAY = timedelta(hours=1)
+
+
+def enqueue(assignment, action):
+    """Queue a notification for an assignment action"""
+    return NotificationOutbox.objects.create(assignment=assignment, action=action)
+
+
+def enqueue_many(assignments, action, using=None):
+    """Queue notifications for many assignments with one INSERT"""
+    return NotificationOutbox.objects.using(using).bulk_create([
+        NotificationOutbox(assignment=assignment, action=action)
+        for assignment in assignments
+    ])
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt after the given number of failures"""
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def _record_failure(entry, error, now):
+    entry.attempts += 1
+    entry.last_error = str(error)
+    if entry.attempts >= MAX_ATTEMPTS:
+        entry.status = 'dead'
+        logger.error(
+            f"Dead-lettered {entry.action} notification for assignment "
+            f"{entry.assignment_id} after {entry.attempts} attempts: {error}"
+        )
+    else:
+        entry.next_attempt_at = now + retry_delay(entry.attempts)
+
+
+def process_outbox(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Send one batch of due notifications.
+
+    Entries are claimed with SELECT ... FOR UPDATE SKIP LOCKED where the
+    database supports it, so several workers can run side by side.
+    Returns a dict counting entries sent, skipped, retried and dead-lettered.
+    """
+    now = timezone.now()
+    counts = {'sent': 0, 'skipped': 0, 'retried': 0, 'dead': 0}
+
+    with transaction.atomic():
+        entries = list(
+            NotificationOutbox.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(status='pending', next_attempt_at__lte=now)
+            .select_related('assignment__assigned_by')
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if not entries:
+            return counts
+
+        opted_out = set(NotificationSetting.objects.filter(
+            user_id__in={e.assignment.assigned_by_id for e in entries},
+            email_on_assignment=False
+        ).values_list('user_id', flat=True))
+
+        pending = list(entries)
+        try:
+            with get_connection() as connection:
+                while pending:
+                    entry = pending.pop(0)
+                    user = entry.assignment.assigned_by
+                    if not user or not user.email or user.pk in opted_out:
+                        entry.status = 'skipped'
+                        continue
+                    try:
+                        build_assignment_email(
+                            entry.assignment, entry.action, connection=connection
+                        ).send(fail_silently=False)
+                    except Exception as e:
+                        _record_failure(entry, e, now)
+                    else:
+                        entry.status = 'sent'
+                        entry.sent_at = timezone.now()
+        except Exception as e:
+            # Could not open (or lost) the connection: every unsent entry failed
+            logger.error(f"Outbox mail connection failed: {e}")
+            for entry in pending:
+                _record_failure(entry, e, now)
+
+        NotificationOutbox.objects.bulk_update(
+            entries, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+        )
+
+    for entry in entries:
+        if entry.status == 'pending':
+            counts['retried'] += 1
+        else:
+            counts[entry.status] += 1
+    return counts
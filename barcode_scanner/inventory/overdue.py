@@ -0,0 +1,133 @@
+"""
+Overdue assignment queries and escalation.
+
+An assignment is overdue when it is checked out past its due date. Every
+query here filters on status='checked_out' and orders by (due_date, id),
+so it is served by the partial assignment_overdue_idx index no matter how
+many returned or rejected assignments have piled up. Listings use keyset
+paging on (due_date, id) rather than OFFSET. Escalation notices go through
+the notification outbox, queued in the same transaction that stamps
+escalated_at, so a notice that fails to send is retried rather than lost.
+"""
+import base64
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import generations, outbox
+from .models import AssetAssignment
+
+OVERDUE_COUNT_TIMEOUT = 60 * 5  # seconds
+ESCALATION_BATCH_SIZE = 500
+# Re-escalate items that are still overdue after this long
+ESCALATION_INTERVAL = timedelta(days=7)
+
+
+def overdue_assignments(today=None):
+    """Checked-out assignments whose due date has passed"""
+    today = today or timezone.localdate()
+    return AssetAssignment.objects.filter(status='checked_out', due_date__lt=today)
+
+
+# ==================== Cached Count ====================
+
+def _count_key(today):
+    return f'inventory:overdue_count:{today.isoformat()}'
+
+
+def overdue_count():
+    """Number of overdue assignments, cached for the dashboard"""
+    today = timezone.localdate()
+    key = _count_key(today)
+    count = cache.get(key)
+    if count is None:
+        count = overdue_assignments(today).count()
+        cache.set(key, count, OVERDUE_COUNT_TIMEOUT)
+    return count
+
+
+def _delete_count():
+    cache.delete(_count_key(timezone.localdate()))
+
+
+def invalidate_overdue_count():
+    """
+    Drop the cached count now and again once the transaction commits, so a
+    reader that counted before the commit was visible does not keep the old
+    count for the whole timeout.
+    """
+    _delete_count()
+    transaction.on_commit(_delete_count)
+
+
+# ==================== Keyset Paging ====================
+
+def encode_cursor(assignment):
+    """Opaque cursor pointing just past an assignment in (due_date, id) order"""
+    raw = f'{assignment.due_date.isoformat()}|{assignment.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor to (due_date, id); raises ValueError if malformed"""
+    try:
+        due, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return date.fromisoformat(due), int(pk)
+    except (TypeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def _after(position):
+    due_date, pk = position
+    return Q(due_date__gt=due_date) | Q(due_date=due_date, id__gt=pk)
+
+
+def overdue_page(cursor=None, limit=50, queryset=None):
+    """
+    One page of overdue assignments in (due_date, id) order.
+    Returns (assignments, next_cursor); next_cursor is None on the last page.
+    """
+    assignments = queryset if queryset is not None else overdue_assignments()
+    if cursor:
+        assignments = assignments.filter(_after(decode_cursor(cursor)))
+    rows = list(assignments.order_by('due_date', 'id')[:limit + 1])
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1])
+    return rows, None
+
+
+# ==================== Escalation ====================
+
+def escalate_overdue(batch_size=ESCALATION_BATCH_SIZE, interval=ESCALATION_INTERVAL, today=None):
+    """
+    Queue notices for overdue assignments not escalated within the interval,
+    walking them in keyset batches. Returns the number escalated; the
+    process_outbox command sends the notices.
+    """
+    now = timezone.now()
+    due = overdue_assignments(today).filter(
+        Q(escalated_at__isnull=True) | Q(escalated_at__lt=now - interval)
+    ).select_related('assigned_by').order_by('due_date', 'id')
+
+    escalated = 0
+    position = None
+    while True:
+        batch = list((due.filter(_after(position)) if position else due)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            # Skip assignments returned since the batch was read
+            still_out = set(AssetAssignment.objects.select_for_update().filter(
+                id__in=[a.id for a in batch], status='checked_out'
+            ).values_list('id', flat=True))
+            AssetAssignment.objects.filter(id__in=still_out).update(
+                escalated_at=now, version=F('version') + 1
+            )
+            outbox.enqueue_many([a for a in batch if a.id in still_out], 'overdue')
+            generations.bump(AssetAssignment)
+        escalated += len(still_out)
+        position = (batch[-1].due_date, batch[-1].id)
+    return escalated
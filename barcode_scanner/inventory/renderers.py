@@ -0,0 +1,85 @@
+"""
+JSON renderer and parser for the REST API backed by orjson, and the
+newline-delimited JSON renderer used by the stream endpoints.
+
+orjson encodes dates, datetimes and UUIDs natively and is several times
+faster than the stdlib encoder on large payloads such as history pages with
+their old_values/new_values blobs. Types it does not know (Decimal, lazy
+strings, querysets) go through DRF's own JSONEncoder.default, and the output
+matches DRF's compact JSONRenderer. When orjson is not installed, or the
+API_JSON_BACKEND setting is 'json', both classes behave exactly like DRF's.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def use_orjson():
+    return orjson is not None and settings.API_JSON_BACKEND == 'orjson'
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer using orjson for compact output"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # orjson only writes compact, unescaped UTF-8
+        if (
+            data is None or not use_orjson() or not self.compact or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=encoders.JSONEncoder().default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same strict-javascript-subset escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser using orjson"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not use_orjson():
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON: one compact JSON document per line. A list is
+    rendered as one line per item, anything else (such as an error) as a
+    single line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def __init__(self):
+        self.json_renderer = FastJSONRenderer()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return b''.join(self.json_renderer.render(item) + b'\n' for item in items)
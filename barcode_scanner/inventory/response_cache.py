@@ -0,0 +1,93 @@
+"""
+Read-through cache for hot API responses.
+
+The dashboard, the by-department breakdown and the first page of each list
+endpoint are read far more often than the data behind them changes. Their
+serialized data is kept in the shared cache under a key built from the
+endpoint, the list ETag (table generations, normalized query parameters and
+negotiated format, see concurrency.list_etag), the host used in pagination
+links and the caller's permission scope.
+
+Nothing is ever deleted explicitly: the signals bump the table generations
+(see generations.py) on every change, so later requests compute a new key
+and stale entries simply expire.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from . import counters
+
+KEY_PREFIX = 'inventory:response'
+
+# Endpoints (route names) served through the cache
+CACHED_ENDPOINTS = (
+    'computer-list', 'computer-by-department', 'printer-list', 'monitor-list',
+    'docking-station-list', 'history-list', 'assignment-list', 'dashboard-list',
+)
+
+METRIC_NAMES = ('hits', 'misses')
+
+
+def endpoint_name(view):
+    """Route name of a viewset action, e.g. 'computer-by-department'"""
+    handler = getattr(view, view.action, None)
+    return f'{view.basename}-{getattr(handler, "url_name", view.action)}'
+
+
+def is_enabled(endpoint):
+    return (
+        settings.API_RESPONSE_CACHE_TIMEOUT > 0
+        and endpoint not in settings.API_RESPONSE_CACHE_DISABLED
+    )
+
+
+def permission_scope(user):
+    """Coarsest user grouping that can see different data"""
+    if user.is_superuser:
+        return 'superuser'
+    return 'staff' if user.is_staff else 'user'
+
+
+def response_key(endpoint, request, etag):
+    raw = '\n'.join([etag, request.get_host(), permission_scope(request.user)])
+    return f'{KEY_PREFIX}:{endpoint}:{hashlib.sha256(raw.encode()).hexdigest()[:32]}'
+
+
+def _metric_key(endpoint, metric):
+    return f'{KEY_PREFIX}:metrics:{endpoint}:{metric}'
+
+
+def read_through(endpoint, request, etag, build):
+    """
+    Response for a request from the cache, or from build() on a miss.
+
+    Only successful responses are stored. Disabled endpoints always build.
+    """
+    if not is_enabled(endpoint):
+        return build()
+
+    key = response_key(endpoint, request, etag)
+    data = cache.get(key)
+    if data is not None:
+        counters.incr(_metric_key(endpoint, 'hits'))
+        return Response(data)
+
+    counters.incr(_metric_key(endpoint, 'misses'))
+    response = build()
+    if response.status_code == 200:
+        cache.set(key, response.data, settings.API_RESPONSE_CACHE_TIMEOUT)
+    return response
+
+
+def cache_metrics(endpoint):
+    """Hit and miss counts and hit rate for an endpoint"""
+    keys = {metric: _metric_key(endpoint, metric) for metric in METRIC_NAMES}
+    values = cache.get_many(keys.values())
+    metrics = {metric: values.get(key, 0) for metric, key in keys.items()}
+    lookups = metrics['hits'] + metrics['misses']
+    metrics['hit_rate'] = metrics['hits'] / lookups if lookups else None
+    metrics['enabled'] = is_enabled(endpoint)
+    return metrics
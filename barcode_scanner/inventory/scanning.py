@@ -0,0 +1,245 @@
+"""
+Scan save path for the barcode scanner views.
+
+A scan saves the asset tag with a native upsert
+(``INSERT ... ON CONFLICT (asset_tag) DO UPDATE ... RETURNING``) whose
+update is a no-op, so saving a scan is a single statement whether or not
+the tag already exists, and concurrent scans of the same tag never raise
+``IntegrityError``. A primary key taken by a concurrent scan of another new
+tag does raise it, and the statement is retried.
+
+The scan response can also carry the asset's current form values and a
+signed form token, so the scanner page edits the asset inline and saves
+only the changed fields instead of redirecting to the full form page.
+"""
+from django.core import signing
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models.signals import post_save
+from django.forms import modelform_factory
+
+from . import tag_filter
+from .concurrency import make_etag
+from .forms import computersForm, docking_stationsForm, monitorsForm
+from .models import Computers, docking_stations, monitors
+
+# Scannable models and the prefix used by the ID generation signals
+SCAN_ID_PREFIXES = {
+    Computers: 'computer',
+    monitors: 'monitor',
+    docking_stations: 'docking_station',
+}
+
+# Full edit forms the inline scan editor is derived from
+SCAN_FORMS = {
+    Computers: computersForm,
+    monitors: monitorsForm,
+    docking_stations: docking_stationsForm,
+}
+
+# Inserts tried before giving up on primary keys taken by concurrent scans
+MAX_UPSERT_ATTEMPTS = 5
+
+FORM_TOKEN_SALT = 'inventory.scan-edit'
+FORM_TOKEN_MAX_AGE = 60 * 60  # seconds
+
+
+def _numeric_suffix_filter(vendor, suffix):
+    """SQL condition (and its parameter count) matching numeric ID suffixes"""
+    if vendor == 'postgresql':
+        return f"{suffix} ~ '^[0-9]+$'", 1
+    return f"{suffix} <> '' AND {suffix} NOT GLOB '*[^0-9]*'", 2
+
+
+def build_upsert_sql(model, connection, prefix, values):
+    """
+    Build the upsert statement and its parameters for a scannable model.
+
+    The primary key is computed inside the statement with the same
+    'prefix-N' scheme as ``signals.get_max_id_number``, so no Python-side
+    read of existing IDs is needed before the insert. An existing tag is
+    "updated" to itself so the statement still returns its row, along with
+    whether the row's created_at is the one just inserted.
+    """
+    opts = model._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    pk_column = qn(opts.pk.column)
+    tag_column = qn(opts.get_field('asset_tag').column)
+    fields = [f for f in opts.concrete_fields if not f.primary_key]
+    columns = ', '.join(qn(f.column) for f in fields)
+    created_at = values[fields.index(opts.get_field('created_at'))]
+    placeholders = ', '.join(['%s'] * len(values))
+    suffix = f"SUBSTR({pk_column}, %s)"
+    numeric_filter, filter_uses = _numeric_suffix_filter(connection.vendor, suffix)
+    start = len(prefix) + 1
+
+    sql = (
+        f"INSERT INTO {table} ({pk_column}, {columns}) "
+        f"SELECT %s || (COALESCE(MAX(CAST({suffix} AS INTEGER)), 0) + 1), {placeholders} "
+        f"FROM {table} "
+        f"WHERE SUBSTR({pk_column}, 1, %s) = %s AND {numeric_filter} "
+        f"ON CONFLICT ({tag_column}) DO UPDATE SET {tag_column} = EXCLUDED.{tag_column} "
+        f"RETURNING {pk_column}, {qn(opts.get_field('created_at').column)} = %s"
+    )
+    params = [prefix, start, *values, len(prefix), prefix, *([start] * filter_uses), created_at]
+    return sql, params
+
+
+def upsert_scanned_asset(model, asset_tag):
+    """
+    Save a scanned asset tag, creating the asset if the tag is new.
+
+    Returns a tuple of (instance, created). The instance is None when the
+    tag already existed, since the scan response does not need the row.
+
+    The row is written with raw SQL, so pre_save is not sent: the ID
+    receivers in signals.py are replaced by the key computed in the statement
+    and the others only act on updates. post_save is sent as for create(),
+    so the audit trail, asset index and tag filter receivers still run.
+
+    When a concurrent scan of another new tag took the computed key, the
+    statement is retried, up to MAX_UPSERT_ATTEMPTS times. That needs a
+    fresh transaction, so inside a caller's transaction the IntegrityError
+    is raised for the caller to retry.
+    """
+    prefix = f"{SCAN_ID_PREFIXES[model]}-"
+    using = router.db_for_write(model)
+    connection = connections[using]
+
+    instance = model(asset_tag=asset_tag)
+    values = [
+        f.get_db_prep_save(f.pre_save(instance, add=True), connection)
+        for f in model._meta.concrete_fields if not f.primary_key
+    ]
+
+    for attempt in range(1, MAX_UPSERT_ATTEMPTS + 1):
+        # Rebuilt per attempt: a retry must compute the key afresh
+        sql, params = build_upsert_sql(model, connection, prefix, values)
+        upserted = False
+        try:
+            with transaction.atomic(using=using, savepoint=False):
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    pk, inserted = cursor.fetchone()
+                upserted = True
+                if not inserted:
+                    return None, False
+
+                instance.pk = pk
+                instance._state.adding = False
+                instance._state.db = using
+                post_save.send(
+                    sender=model, instance=instance, created=True,
+                    update_fields=None, raw=False, using=using
+                )
+            return instance, True
+        except IntegrityError:
+            # Only the upsert's own failure means the computed key was taken
+            if upserted or connection.in_atomic_block or attempt == MAX_UPSERT_ATTEMPTS:
+                raise
+
+
+def save_scan(model, asset_tag):
+    """
+    Upsert a scanned tag and score the known-tag filter's prediction for it.
+    Returns (instance, created) like upsert_scanned_asset.
+
+    For scans the filter is metrics-only: the upsert is one statement
+    whether or not the tag exists, so a "definitely new" answer has no
+    query to skip, and this worker's copy may lag tags other workers saved.
+    The prediction is only scored when the worker has a copy, so scans add
+    no cache round trips.
+    """
+    probably_existing = tag_filter.peek(model, asset_tag)
+    instance, created = upsert_scanned_asset(model, asset_tag)
+    if probably_existing is not None:
+        tag_filter.record_prediction(model, probably_existing, created)
+    return instance, created
+
+
+# ==================== Inline Scan Editor ====================
+
+def scan_edit_fields(model):
+    """
+    Form fields editable inline; many-to-many fields stay on the full form
+    and the row version travels in the If-Match header instead.
+    """
+    excluded = {f.name for f in model._meta.many_to_many} | {'version'}
+    return [name for name in SCAN_FORMS[model]._meta.fields if name not in excluded]
+
+
+def scan_edit_form(model, fields=None):
+    """Form class for the inline editor, optionally limited to some fields"""
+    return modelform_factory(
+        model, form=SCAN_FORMS[model], fields=fields or scan_edit_fields(model)
+    )
+
+
+def make_form_token(model, pk):
+    """Sign the asset identity so the follow-up save needs no barcode lookup"""
+    return signing.dumps(
+        {'model': model._meta.model_name, 'pk': pk}, salt=FORM_TOKEN_SALT
+    )
+
+
+def load_form_token(token):
+    """
+    Resolve a form token back to (model, pk).
+    Raises signing.BadSignature (or SignatureExpired) for invalid tokens.
+    """
+    data = signing.loads(token, salt=FORM_TOKEN_SALT, max_age=FORM_TOKEN_MAX_AGE)
+    models_by_name = {model._meta.model_name: model for model in SCAN_FORMS}
+    try:
+        return models_by_name[data['model']], data['pk']
+    except (KeyError, TypeError):
+        raise signing.BadSignature('Unknown asset type in form token')
+
+
+def scan_form_payload(model, asset_tag, instance=None):
+    """
+    Current inline-editable values of a scanned asset plus its form token.
+
+    A freshly created instance is used as-is; otherwise the values are read
+    with a single narrow query instead of loading the full row.
+    """
+    fields = scan_edit_fields(model)
+    attnames = [model._meta.get_field(name).attname for name in fields]
+
+    if instance is None:
+        row = model.objects.filter(asset_tag=asset_tag).values('pk', 'version', *attnames).first()
+        if row is None:
+            return None
+        pk = row.pop('pk')
+        version = row.pop('version')
+    else:
+        pk = instance.pk
+        version = instance.version
+        row = {attname: getattr(instance, attname) for attname in attnames}
+
+    return {
+        'id': pk,
+        'etag': make_etag(model, pk, version),
+        'fields': {name: row[attname] for name, attname in zip(fields, attnames)},
+        'form_token': make_form_token(model, pk),
+    }
+
+
+def apply_scan_edit(instance, changes):
+    """
+    Validate and save only the changed fields of a scanned asset.
+
+    Returns (updated_fields, errors); errors is None when the save succeeded.
+    Raises ConcurrentUpdateError if the asset changed since it was loaded.
+    """
+    model = type(instance)
+    fields = [name for name in scan_edit_fields(model) if name in changes]
+    if not fields:
+        return [], None
+
+    form = scan_edit_form(model, fields)(changes, instance=instance)
+    if not form.is_valid():
+        return fields, form.errors
+
+    form.save(commit=False)
+    instance.save(update_fields=[*fields, 'updated_at'])
+    return fields, None
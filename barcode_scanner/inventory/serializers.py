@@ -1,14 +1,41 @@
 """
 REST API Serializers for the Asset Management System
 """
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from .assignments import check_assignable
 from .models import (
     Computers, printers, docking_stations, monitors,
     AssetHistory, AssetAssignment, AssetStatus
 )
 
 
-class ComputerSerializer(serializers.ModelSerializer):
+class DynamicFieldsMixin:
+    """
+    Model serializer that can be narrowed to a subset of its fields and
+    extended with nested representations of related rows.
+
+    expandable_fields maps a relation to the serializer used for its
+    '<relation>_detail' representation; expansion is opt-in so the related
+    rows are only fetched when a client asks for them.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        opts = self.Meta.model._meta
+        for name in expand:
+            relation = opts.get_field(name)
+            self.fields[f'{name}_detail'] = self.expandable_fields[name](
+                source=name, many=relation.many_to_many or relation.one_to_many,
+                read_only=True
+            )
+
+
+class ComputerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Computer model"""
     printers = serializers.PrimaryKeyRelatedField(
         many=True,
@@ -19,10 +46,10 @@ class ComputerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Computers
         fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'version']
 
 
-class ComputerListSerializer(serializers.ModelSerializer):
+class ComputerListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing computers"""
     class Meta:
         model = Computers
@@ -32,55 +59,92 @@ class ComputerListSerializer(serializers.ModelSerializer):
         ]
 
 
-class PrinterSerializer(serializers.ModelSerializer):
+class PrinterSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Printer model"""
     class Meta:
         model = printers
         fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'version']
 
 
-class PrinterListSerializer(serializers.ModelSerializer):
+class PrinterListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing printers"""
     class Meta:
         model = printers
         fields = ['id', 'service_tag', 'make', 'description', 'status']
 
 
-class MonitorSerializer(serializers.ModelSerializer):
+class MonitorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Monitor model"""
-    computer_detail = ComputerListSerializer(source='computer', read_only=True)
+    expandable_fields = {'computer': ComputerListSerializer}
 
     class Meta:
         model = monitors
         fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'version']
 
 
-class MonitorListSerializer(serializers.ModelSerializer):
+class MonitorListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing monitors"""
+    expandable_fields = {'computer': ComputerListSerializer}
+
     class Meta:
         model = monitors
         fields = ['id', 'asset_tag', 'service_tag', 'make', 'status', 'computer']
 
 
-class DockingStationSerializer(serializers.ModelSerializer):
+class DockingStationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Docking Station model"""
-    computer_detail = ComputerListSerializer(source='computer', read_only=True)
+    expandable_fields = {'computer': ComputerListSerializer}
 
     class Meta:
         model = docking_stations
         fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'version']
 
 
-class DockingStationListSerializer(serializers.ModelSerializer):
+class DockingStationListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing docking stations"""
+    expandable_fields = {'computer': ComputerListSerializer}
+
     class Meta:
         model = docking_stations
         fields = ['id', 'asset_tag', 'service_tag', 'make', 'status', 'computer']
 
 
+# Set after the class definitions: the nested serializers follow the computer ones
+ComputerSerializer.expandable_fields = ComputerListSerializer.expandable_fields = {
+    'printers': PrinterListSerializer,
+    'monitors': MonitorListSerializer,
+    'docking_stations': DockingStationListSerializer,
+}
+
+
+class PeripheralSerializer(serializers.Serializer):
+    """Tags and status of a peripheral in a computer topology"""
+    id = serializers.CharField()
+    asset_tag = serializers.CharField(default=None)  # printers have none
+    service_tag = serializers.CharField()
+    status = serializers.CharField()
+
+
+class ComputerTopologySerializer(serializers.ModelSerializer):
+    """A computer with its peripherals, prefetched by topology.with_peripherals"""
+    printers = PeripheralSerializer(source='peripheral_printers', many=True, read_only=True)
+    monitors = PeripheralSerializer(source='peripheral_monitors', many=True, read_only=True)
+    docking_stations = PeripheralSerializer(
+        source='peripheral_docking_stations', many=True, read_only=True
+    )
+
+    class Meta:
+        model = Computers
+        fields = [
+            'id', 'asset_tag', 'service_tag', 'computer_name', 'department', 'user',
+            'status', 'printers', 'monitors', 'docking_stations'
+        ]
+        # Columns read for the computer rows themselves
+        columns = fields[:7]
+
 class AssetHistorySerializer(serializers.ModelSerializer):
     """Serializer for Asset History"""
     changed_by_username = serializers.CharField(
@@ -115,14 +179,23 @@ class AssetAssignmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = AssetAssignment
         fields = '__all__'
-        read_only_fields = ['id', 'assigned_date', 'returned_date']
+        read_only_fields = ['id', 'assigned_date', 'returned_date', 'escalated_at', 'version']
 
 
 class AssetAssignmentCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating Asset Assignments"""
     class Meta:
         model = AssetAssignment
-        fields = ['asset_type', 'asset_id', 'assigned_to', 'due_date', 'notes']
+        fields = ['id', 'asset_type', 'asset_id', 'assigned_to', 'due_date', 'notes']
+        read_only_fields = ['id']
+
+    def validate(self, attrs):
+        """Reject missing, retired or already assigned assets"""
+        try:
+            attrs['asset_type'] = check_assignable(attrs['asset_type'], attrs['asset_id'])
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'asset_id': e.messages})
+        return attrs
 
 
 class DashboardStatsSerializer(serializers.Serializer):
@@ -1,10 +1,12 @@
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
+from django.db import transaction
 from django.forms.models import model_to_dict
 from .models import (
     printers, Computers, docking_stations, monitors,
-    AssetHistory
+    AssetHistory, AssetAssignment
 )
+from . import asset_index, generations, overdue, tag_filter
 
 # Thread-local storage for request context
 import threading
@@ -280,3 +282,81 @@ def audit_docking_station_delete(sender, instance, **kwargs):
         action='deleted',
         old_values=get_model_fields(instance)
     )
+
+
+# ==================== Known-Tag Filter Signals ====================
+
+@receiver(post_save, sender=Computers)
+@receiver(post_save, sender=printers)
+@receiver(post_save, sender=monitors)
+@receiver(post_save, sender=docking_stations)
+def update_tag_filter_on_save(sender, instance, created, **kwargs):
+    tags = tag_filter.instance_tags(instance)
+    original = getattr(instance, '_original', None)
+    old_tags = tag_filter.instance_tags(original) if original is not None else []
+    stale = [tag for tag in old_tags if tag not in tags]
+    new = [tag for tag in tags if tag not in old_tags]
+    # After commit, so a rebuild from the database never misses a journaled tag
+    if stale:
+        transaction.on_commit(lambda: tag_filter.note_deleted(sender, stale))
+    if new:
+        transaction.on_commit(lambda: tag_filter.add_tags(sender, new))
+
+
+@receiver(post_delete, sender=Computers)
+@receiver(post_delete, sender=printers)
+@receiver(post_delete, sender=monitors)
+@receiver(post_delete, sender=docking_stations)
+def update_tag_filter_on_delete(sender, instance, **kwargs):
+    tags = tag_filter.instance_tags(instance)
+    if tags:
+        transaction.on_commit(lambda: tag_filter.note_deleted(sender, tags))
+
+
+# ==================== Asset Index Signals ====================
+
+@receiver(post_save, sender=Computers)
+@receiver(post_save, sender=printers)
+@receiver(post_save, sender=monitors)
+@receiver(post_save, sender=docking_stations)
+def update_asset_index_on_save(sender, instance, **kwargs):
+    asset_index.sync_assets([instance])
+
+
+@receiver(post_delete, sender=Computers)
+@receiver(post_delete, sender=printers)
+@receiver(post_delete, sender=monitors)
+@receiver(post_delete, sender=docking_stations)
+def update_asset_index_on_delete(sender, instance, **kwargs):
+    asset_index.remove_asset(sender, instance.pk)
+
+
+# ==================== Change Generation Signals ====================
+
+@receiver(post_save, sender=Computers)
+@receiver(post_save, sender=printers)
+@receiver(post_save, sender=monitors)
+@receiver(post_save, sender=docking_stations)
+@receiver(post_save, sender=AssetAssignment)
+@receiver(post_save, sender=AssetHistory)
+@receiver(post_delete, sender=Computers)
+@receiver(post_delete, sender=printers)
+@receiver(post_delete, sender=monitors)
+@receiver(post_delete, sender=docking_stations)
+@receiver(post_delete, sender=AssetAssignment)
+@receiver(post_delete, sender=AssetHistory)
+def bump_generation(sender, **kwargs):
+    generations.bump(sender)
+
+
+@receiver(m2m_changed, sender=Computers.printers.through)
+def bump_generation_on_printers_change(sender, **kwargs):
+    generations.bump(Computers, printers)
+
+
+# ==================== Overdue Count Signals ====================
+
+@receiver(post_save, sender=AssetAssignment)
+@receiver(post_delete, sender=AssetAssignment)
+def invalidate_overdue_count(sender, instance, **kwargs):
+    overdue.invalidate_overdue_count()
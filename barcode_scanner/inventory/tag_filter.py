@@ -0,0 +1,347 @@
+"""
+Known-tag membership filter for scan lookups.
+
+Each asset type keeps a Bloom filter of its asset_tag/service_tag values,
+stored in the Django cache so every worker shares it. A lookup answers
+"definitely new" or "probably existing" without touching the database, and
+scanner clients can download the filter for offline "already inventoried"
+feedback.
+
+The filter is built from the database on first use (or when it has fallen
+out of the cache) and rebuilt once deletions have left too many stale
+entries. Saves never rewrite it: once their transaction commits, the
+post_save signals append the new tags to a journal of small cache entries
+numbered by an atomic counter. Readers replay the journal onto their
+decoded copy and every COMPACT_EVERY entries publish the result as the new
+blob, so concurrent writers cannot overwrite each other's tags. A journal
+entry that has gone missing makes the reader rebuild from the database.
+
+Scans use the filter only to score its predictions: the scan upsert is a
+single statement either way, so there is no lookup to skip. They consult
+the worker's local copy and buffer the counts, adding no cache round trips.
+"""
+import base64
+import hashlib
+import math
+import threading
+import uuid
+
+from django.core.cache import cache
+
+from . import counters
+from .models import Computers, printers, monitors, docking_stations
+
+# URL/cache name for each asset type, matching the API route names
+FILTER_ASSET_TYPES = {
+    'computers': Computers,
+    'printers': printers,
+    'monitors': monitors,
+    'docking_stations': docking_stations,
+}
+
+FALSE_POSITIVE_RATE = 0.01
+MIN_CAPACITY = 1024
+# Headroom so new tags can be added before the filter needs a rebuild
+CAPACITY_HEADROOM = 2
+# Rebuild once deleted tags exceed this share of the filter's entries
+STALE_REBUILD_RATIO = 0.1
+CACHE_TIMEOUT = 60 * 60 * 24  # seconds
+# Journal entries replayed before a reader publishes a compacted blob
+COMPACT_EVERY = 100
+# Scan predictions a worker buffers before adding them to the shared counts
+METRICS_FLUSH_EVERY = 50
+
+METRIC_NAMES = ('checks', 'probably_existing', 'new_scans', 'false_positives', 'false_negatives')
+
+# Per-process decoded filters:
+# asset type -> (version, journal seq applied, journal seq last published, TagBloomFilter)
+_local_filters = {}
+# Per-process prediction counts not yet added to the shared metrics
+_pending_metrics = {}
+_pending_lock = threading.Lock()
+
+
+class TagBloomFilter:
+    """
+    Bloom filter over tag strings.
+
+    Bit positions use double hashing of a 128-bit BLAKE2b digest of the
+    UTF-8 tag, so clients can reproduce lookups from the downloaded bits.
+    """
+
+    def __init__(self, num_bits, num_hashes, bits=None, count=0, deleted=0):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray((num_bits + 7) // 8)
+        self.count = count
+        self.deleted = deleted
+
+    @classmethod
+    def for_capacity(cls, capacity, false_positive_rate=FALSE_POSITIVE_RATE):
+        """Size a filter for the expected number of tags"""
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @property
+    def capacity(self):
+        """Number of tags the filter holds at its target false-positive rate"""
+        return int(self.num_bits * (math.log(2) ** 2) / -math.log(FALSE_POSITIVE_RATE))
+
+    def _positions(self, tag):
+        digest = hashlib.blake2b(tag.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, tag):
+        for position in self._positions(tag):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, tag):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(tag)
+        )
+
+    def expected_false_positive_rate(self):
+        """Theoretical false-positive rate from the current bit fill ratio"""
+        set_bits = sum(bin(byte).count('1') for byte in self.bits)
+        return (set_bits / self.num_bits) ** self.num_hashes
+
+    def needs_rebuild(self):
+        return self.count > self.capacity or self.deleted > self.count * STALE_REBUILD_RATIO
+
+    def to_dict(self):
+        return {
+            'num_bits': self.num_bits,
+            'num_hashes': self.num_hashes,
+            'bits': base64.b64encode(bytes(self.bits)).decode('ascii'),
+            'count': self.count,
+            'deleted': self.deleted,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['num_bits'], data['num_hashes'],
+            bits=base64.b64decode(data['bits']),
+            count=data['count'], deleted=data['deleted'],
+        )
+
+
+# ==================== Cache Storage ====================
+
+def _type_name(model):
+    for name, candidate in FILTER_ASSET_TYPES.items():
+        if candidate is model:
+            return name
+    raise KeyError(model)
+
+
+def _cache_key(name, part):
+    return f'inventory:tag_filter:{name}:{part}'
+
+
+def _model_tags(model):
+    """All asset_tag/service_tag values of a model"""
+    tag_fields = [f for f in ('asset_tag', 'service_tag') if hasattr(model, f)]
+    for row in model.objects.values_list(*tag_fields).iterator(chunk_size=2000):
+        for tag in row:
+            if tag:
+                yield tag
+
+
+def instance_tags(instance):
+    """Non-empty asset_tag/service_tag values of an asset instance"""
+    return [
+        tag for tag in (getattr(instance, 'asset_tag', None), getattr(instance, 'service_tag', None))
+        if tag
+    ]
+
+
+def _journal_seq(name):
+    """Current journal position, starting the journal if it is missing"""
+    key = _cache_key(name, 'seq')
+    cache.add(key, 0, CACHE_TIMEOUT)
+    return cache.get(key, 0)
+
+
+def build_filter(model):
+    """Build the filter for a model from the database and publish it"""
+    name = _type_name(model)
+    # Journal entries up to here were committed before the read below
+    seq = _journal_seq(name)
+    tags = list(_model_tags(model))
+    tag_filter = TagBloomFilter.for_capacity(
+        max(len(tags) * CAPACITY_HEADROOM, MIN_CAPACITY)
+    )
+    for tag in tags:
+        tag_filter.add(tag)
+
+    version = uuid.uuid4().hex
+    cache.set_many({
+        _cache_key(name, 'data'): {**tag_filter.to_dict(), 'seq': seq},
+        _cache_key(name, 'version'): version,
+        _cache_key(name, 'deleted'): 0,
+    }, CACHE_TIMEOUT)
+    _local_filters[name] = (version, seq, seq, tag_filter)
+    return tag_filter
+
+
+def _replay(name, tag_filter, applied, seq):
+    """
+    Add journal entries applied+1..seq to the filter. Returns False if any
+    entry is missing, after one re-read for entries still being written.
+    """
+    keys = [_cache_key(name, f'journal:{n}') for n in range(applied + 1, seq + 1)]
+    entries = cache.get_many(keys)
+    if len(entries) < len(keys):
+        entries.update(cache.get_many([key for key in keys if key not in entries]))
+        if len(entries) < len(keys):
+            return False
+    for key in keys:
+        for tag in entries[key]:
+            tag_filter.add(tag)
+    return True
+
+
+def _current(name):
+    version, seq, _, tag_filter = _local_filters[name]
+    return f'{version}.{seq}', tag_filter
+
+
+def get_filter(model):
+    """
+    Return (version, filter) for a model, building it if not cached. The
+    version changes whenever the filter's contents do.
+    """
+    name = _type_name(model)
+    keys = {part: _cache_key(name, part) for part in ('version', 'seq', 'deleted')}
+    state = cache.get_many(keys.values())
+    version, seq = state.get(keys['version']), state.get(keys['seq'])
+    if version is None or seq is None:
+        build_filter(model)
+        return _current(name)
+
+    local = _local_filters.get(name)
+    if local is not None and local[0] == version and local[1] <= seq:
+        _, applied, compacted, tag_filter = local
+    else:
+        data = cache.get(_cache_key(name, 'data'))
+        if data is None or data['seq'] > seq:
+            build_filter(model)
+            return _current(name)
+        tag_filter = TagBloomFilter.from_dict(data)
+        applied = compacted = data['seq']
+
+    if seq > applied and not _replay(name, tag_filter, applied, seq):
+        build_filter(model)
+        return _current(name)
+    tag_filter.deleted = state.get(keys['deleted'], 0)
+    if tag_filter.needs_rebuild():
+        build_filter(model)
+        return _current(name)
+
+    if seq - compacted >= COMPACT_EVERY:
+        cache.set(_cache_key(name, 'data'), {**tag_filter.to_dict(), 'seq': seq}, CACHE_TIMEOUT)
+        compacted = seq
+    _local_filters[name] = (version, seq, compacted, tag_filter)
+    return _current(name)
+
+
+def add_tags(model, tags):
+    """Append tags of a saved asset to the shared filter's journal"""
+    if not tags:
+        return
+    name = _type_name(model)
+    try:
+        seq = cache.incr(_cache_key(name, 'seq'))
+    except ValueError:
+        # The journal is gone, so drop the filter; it is rebuilt on next use
+        cache.delete(_cache_key(name, 'version'))
+        return
+    cache.set(_cache_key(name, f'journal:{seq}'), list(tags), CACHE_TIMEOUT)
+
+
+def note_deleted(model, tags):
+    """Count deleted tags; Bloom filters cannot remove, so rebuild when stale"""
+    if tags:
+        counters.incr(_cache_key(_type_name(model), 'deleted'), len(tags))
+
+
+def might_contain(model, tag):
+    """True if the tag probably exists, False if it is definitely new"""
+    _, tag_filter = get_filter(model)
+    return tag in tag_filter
+
+
+def peek(model, tag):
+    """
+    might_contain() answered from this worker's copy alone, without any
+    cache or database access; None if the worker has no copy yet.
+    """
+    local = _local_filters.get(_type_name(model))
+    return None if local is None else tag in local[3]
+
+
+# ==================== Metrics ====================
+
+def flush_metrics():
+    """Add this worker's buffered prediction counts to the shared metrics"""
+    with _pending_lock:
+        pending = dict(_pending_metrics)
+        _pending_metrics.clear()
+    for (name, metric), count in pending.items():
+        counters.incr(_cache_key(name, f'metrics:{metric}'), count)
+
+
+def record_prediction(model, probably_existing, created):
+    """
+    Score a filter prediction against the scan's real outcome.
+
+    A created row that the filter called "probably existing" is a false
+    positive. An existing row it called "definitely new" is a false
+    negative; the worker's copy can lag the shared filter by the saves since
+    its last refresh, so these are expected at a low rate. Counts are
+    buffered and flushed every METRICS_FLUSH_EVERY checks.
+    """
+    name = _type_name(model)
+    metrics = ['checks']
+    if probably_existing:
+        metrics.append('probably_existing')
+    if created:
+        metrics.append('new_scans')
+        if probably_existing:
+            metrics.append('false_positives')
+    elif not probably_existing:
+        metrics.append('false_negatives')
+
+    with _pending_lock:
+        for metric in metrics:
+            _pending_metrics[name, metric] = _pending_metrics.get((name, metric), 0) + 1
+        flush = _pending_metrics.get((name, 'checks'), 0) >= METRICS_FLUSH_EVERY
+    if flush:
+        flush_metrics()
+
+
+def filter_metrics(model):
+    """Observed and expected false-positive rates for a model's filter"""
+    flush_metrics()
+    name = _type_name(model)
+    keys = {metric: _cache_key(name, f'metrics:{metric}') for metric in METRIC_NAMES}
+    values = cache.get_many(keys.values())
+    metrics = {metric: values.get(key, 0) for metric, key in keys.items()}
+    _, tag_filter = get_filter(model)
+    metrics.update({
+        'observed_false_positive_rate': (
+            metrics['false_positives'] / metrics['new_scans'] if metrics['new_scans'] else 0.0
+        ),
+        'expected_false_positive_rate': tag_filter.expected_false_positive_rate(),
+        'entries': tag_filter.count,
+        'deleted': tag_filter.deleted,
+        'size_bytes': len(tag_filter.bits),
+    })
+    return metrics
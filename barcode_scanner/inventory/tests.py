@@ -1,20 +1,57 @@
 """
 Comprehensive tests for the Asset Management System
 """
-from datetime import date, timedelta
+import gzip
+import json
+import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from decimal import Decimal
-
-from django.test import TestCase, Client
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import connection, transaction
+from django.db.models import Model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from django.contrib.admin import helpers
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
 
 from .models import (
     Computers, printers, monitors, docking_stations,
-    AssetHistory, AssetAssignment, AssetStatus, NotificationSetting
+    AssetHistory, AssetAssignment, AssetStatus, NotificationSetting,
+    AssetIndex, AssetType, ConcurrentUpdateError, NotificationOutbox, WarrantyAlert
 )
 from .forms import computersForm, printersForm, monitorsForm, docking_stationsForm
+from .assignments import bulk_transition, check_assignable, save_transition
+from .bulk_updates import bulk_update_assets
+from .fast_lists import RowPlan, row_plan
+from .renderers import FastJSONParser, FastJSONRenderer
+from .outbox import MAX_ATTEMPTS, process_outbox
+from .scanning import save_scan, upsert_scanned_asset
+from .topology import with_peripherals
+from .serializers import (
+    AssetHistorySerializer, ComputerListSerializer, ComputerSerializer,
+    DockingStationListSerializer, MonitorListSerializer, PrinterListSerializer,
+    PrinterSerializer
+)
+from . import (
+    api_views, asset_index, counters, middleware, notifications, overdue, renderers,
+    response_cache, scanning, tag_filter
+)
 
 
 class BaseTestCase(TestCase):
@@ -217,6 +254,2078 @@ class AssetAssignmentTests(BaseTestCase):
         self.assertEqual(assignment.status, 'returned')
 
 
+class ScanUpsertTests(BaseTestCase):
+    """Tests for the single-statement scan save path"""
+
+    def test_scan_creates_new_asset(self):
+        """Test that scanning a new tag creates the asset with a generated ID"""
+        computer, created = upsert_scanned_asset(Computers, 'COMP-001')
+        self.assertTrue(created)
+        self.assertEqual(computer.id, 'computer-1')
+        self.assertTrue(Computers.objects.filter(asset_tag='COMP-001').exists())
+
+    def test_scan_existing_asset_is_single_query(self):
+        """Test that scanning an existing tag is one statement and creates nothing"""
+        Computers.objects.create(asset_tag='COMP-001')
+        with self.assertNumQueries(1):
+            computer, created = upsert_scanned_asset(Computers, 'COMP-001')
+        self.assertFalse(created)
+        self.assertIsNone(computer)
+        self.assertEqual(Computers.objects.count(), 1)
+
+    def test_scan_id_follows_existing_sequence(self):
+        """Test that generated IDs continue numerically past 'prefix-9'"""
+        for i in range(10):
+            monitors.objects.create(asset_tag=f'MON-{i:03d}')
+        monitor, created = upsert_scanned_asset(monitors, 'MON-NEW')
+        self.assertTrue(created)
+        self.assertEqual(monitor.id, 'monitor-11')
+
+    def test_scan_writes_audit_entry(self):
+        """Test that a scan-created asset is recorded in the audit trail"""
+        dock, created = upsert_scanned_asset(docking_stations, 'DOCK-001')
+        self.assertTrue(AssetHistory.objects.filter(
+            asset_type='Docking Station', asset_id=dock.id, action='created'
+        ).exists())
+
+    def test_save_barcode_view(self):
+        """Test the scan endpoint reports new and existing tags"""
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.post(reverse('save_barcode'), {'barcode_data': 'COMP-001'})
+        self.assertTrue(response.json()['new_item'])
+        response = self.client.post(reverse('save_barcode'), {'barcode_data': 'COMP-001'})
+        self.assertTrue(response.json()['existing_item'])
+
+
+class ScanToEditTests(BaseTestCase):
+    """Tests for the scan-to-edit fast path"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='admin', password='adminpass123')
+
+    def scan(self, barcode):
+        return self.client.post(reverse('save_barcode'), {
+            'barcode_data': barcode,
+            'include_form': '1',
+        }).json()
+
+    def test_scan_returns_form_payload_for_existing_asset(self):
+        """Test that scanning an existing tag returns its current field values"""
+        Computers.objects.create(asset_tag='COMP-001', department='IT', make='Dell')
+        result = self.scan('COMP-001')
+        self.assertTrue(result['existing_item'])
+        self.assertEqual(result['asset']['fields']['department'], 'IT')
+        self.assertNotIn('printers', result['asset']['fields'])
+        self.assertTrue(result['asset']['form_token'])
+
+    def test_scan_returns_form_payload_for_new_asset(self):
+        """Test that a newly created asset is returned without a re-read"""
+        result = self.scan('COMP-NEW')
+        self.assertTrue(result['new_item'])
+        self.assertEqual(result['asset']['fields']['asset_tag'], 'COMP-NEW')
+        self.assertEqual(result['asset']['fields']['status'], 'active')
+
+    def test_scan_without_include_form_has_no_payload(self):
+        """Test that the payload is opt-in"""
+        response = self.client.post(reverse('save_barcode'), {'barcode_data': 'COMP-001'})
+        self.assertNotIn('asset', response.json())
+
+    def test_patch_updates_only_changed_fields(self):
+        """Test that the follow-up save writes only the submitted fields"""
+        computer = Computers.objects.create(asset_tag='COMP-001', department='IT', make='Dell')
+        token = self.scan('COMP-001')['asset']['form_token']
+
+        response = self.client.patch(
+            reverse('scan_edit', args=[token]),
+            data=json.dumps({'department': 'HR'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated_fields'], ['department'])
+        computer.refresh_from_db()
+        self.assertEqual(computer.department, 'HR')
+        self.assertEqual(computer.make, 'Dell')
+
+    def test_patch_rejects_invalid_values(self):
+        """Test that field validation errors are returned"""
+        Computers.objects.create(asset_tag='COMP-001')
+        token = self.scan('COMP-001')['asset']['form_token']
+
+        response = self.client.patch(
+            reverse('scan_edit', args=[token]),
+            data=json.dumps({'status': 'not-a-status'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json()['errors'])
+
+    def test_patch_rejects_tampered_token(self):
+        """Test that an invalid form token is rejected"""
+        response = self.client.patch(
+            reverse('scan_edit', args=['not-a-token']),
+            data=json.dumps({'department': 'HR'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_scanner_page_renders_inline_editor(self):
+        """Test that the scanner page renders the inline editor fields"""
+        response = self.client.get(reverse('index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'data-scan-field="department"')
+        self.assertNotContains(response, 'data-scan-field="printers"')
+
+
+class TagFilterTests(BaseTestCase):
+    """Tests for the known-tag membership filter"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        tag_filter._local_filters.clear()
+        tag_filter._pending_metrics.clear()
+        self.client.login(username='admin', password='adminpass123')
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Test that every added tag is reported as probably existing"""
+        bloom = tag_filter.TagBloomFilter.for_capacity(1000)
+        tags = [f'TAG-{i}' for i in range(1000)]
+        for tag in tags:
+            bloom.add(tag)
+        self.assertTrue(all(tag in bloom for tag in tags))
+        restored = tag_filter.TagBloomFilter.from_dict(bloom.to_dict())
+        self.assertTrue(all(tag in restored for tag in tags))
+        false_positives = sum(f'OTHER-{i}' in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_filter_built_from_existing_assets(self):
+        """Test that a cold filter is built from asset and service tags"""
+        Computers.objects.create(asset_tag='COMP-001', service_tag='SVC-001')
+        cache.clear()
+        self.assertTrue(tag_filter.might_contain(Computers, 'COMP-001'))
+        self.assertTrue(tag_filter.might_contain(Computers, 'SVC-001'))
+        self.assertFalse(tag_filter.might_contain(Computers, 'COMP-404'))
+
+    def test_signals_keep_filter_current(self):
+        """Test that saves add tags and lookups then need no query"""
+        tag_filter.get_filter(monitors)
+        with self.captureOnCommitCallbacks(execute=True):
+            monitors.objects.create(asset_tag='MON-001')
+        with self.assertNumQueries(0):
+            self.assertTrue(tag_filter.might_contain(monitors, 'MON-001'))
+
+    def test_deletes_trigger_rebuild_when_stale(self):
+        """Test that deleted tags drop out once the filter is rebuilt"""
+        with self.captureOnCommitCallbacks(execute=True):
+            computer = Computers.objects.create(asset_tag='COMP-DEL')
+            computer.delete()
+        self.assertFalse(tag_filter.might_contain(Computers, 'COMP-DEL'))
+
+    def test_scan_records_false_positive_metrics(self):
+        """Test that scans score the filter's predictions"""
+        tag_filter.get_filter(Computers)
+        tag_filter.add_tags(Computers, ['COMP-GHOST'])
+        tag_filter.get_filter(Computers)  # refresh the worker's copy scans are scored against
+        self.client.post(reverse('save_barcode'), {'barcode_data': 'COMP-GHOST'})
+        self.client.post(reverse('save_barcode'), {'barcode_data': 'COMP-NEW'})
+
+        metrics = self.client.get(reverse('tag_filter_metrics')).json()['computers']
+        self.assertEqual(metrics['checks'], 2)
+        self.assertEqual(metrics['new_scans'], 2)
+        self.assertEqual(metrics['false_positives'], 1)
+        self.assertEqual(metrics['observed_false_positive_rate'], 0.5)
+
+    def test_saves_append_to_journal_without_rewriting_filter(self):
+        """Test that writers from different workers never drop each other's tags"""
+        tag_filter.get_filter(Computers)
+        blob = cache.get('inventory:tag_filter:computers:data')
+        tag_filter.add_tags(Computers, ['COMP-A'])
+        tag_filter._local_filters.clear()  # a second worker
+        tag_filter.add_tags(Computers, ['COMP-B'])
+        self.assertEqual(cache.get('inventory:tag_filter:computers:data'), blob)
+
+        version, known_tags = tag_filter.get_filter(Computers)
+        self.assertIn('COMP-A', known_tags)
+        self.assertIn('COMP-B', known_tags)
+        tag_filter.add_tags(Computers, ['COMP-C'])
+        self.assertNotEqual(tag_filter.get_filter(Computers)[0], version)
+
+    def test_journal_is_compacted_into_filter(self):
+        """Test that readers publish the replayed journal as the new blob"""
+        tag_filter.get_filter(Computers)
+        with mock.patch.object(tag_filter, 'COMPACT_EVERY', 2):
+            tag_filter.add_tags(Computers, ['COMP-A'])
+            tag_filter.add_tags(Computers, ['COMP-B'])
+            tag_filter.get_filter(Computers)
+        blob = tag_filter.TagBloomFilter.from_dict(cache.get('inventory:tag_filter:computers:data'))
+        self.assertIn('COMP-A', blob)
+        self.assertIn('COMP-B', blob)
+
+    def test_missing_journal_entry_rebuilds_from_database(self):
+        """Test that an evicted journal entry cannot leave a tag out"""
+        tag_filter.get_filter(Computers)
+        with self.captureOnCommitCallbacks(execute=True):
+            Computers.objects.create(asset_tag='COMP-001')
+        cache.delete('inventory:tag_filter:computers:journal:1')
+        self.assertTrue(tag_filter.might_contain(Computers, 'COMP-001'))
+
+    def test_scan_uses_local_filter_only(self):
+        """Test that scans make no filter cache reads and buffer their metrics"""
+        tag_filter.get_filter(Computers)
+        with mock.patch.object(tag_filter, 'get_filter') as get_filter, \
+                mock.patch.object(counters, 'incr') as incr:
+            save_scan(Computers, 'COMP-001')
+        get_filter.assert_not_called()
+        incr.assert_not_called()
+
+    def test_download_filter_endpoint(self):
+        """Test downloading the filter and conditional re-download"""
+        Computers.objects.create(asset_tag='COMP-001')
+        response = self.client.get(reverse('download_tag_filter', args=['computers']))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn('bits', data)
+        self.assertTrue('COMP-001' in tag_filter.TagBloomFilter.from_dict(data))
+
+        response = self.client.get(
+            reverse('download_tag_filter', args=['computers']),
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_check_single_tag_without_query(self):
+        """Test the single-tag check answers from the filter alone"""
+        Computers.objects.create(asset_tag='COMP-001')
+        url = reverse('download_tag_filter', args=['computers'])
+        self.client.get(url)
+        with self.assertNumQueries(2):  # session and user lookups only
+            response = self.client.get(url, {'tag': 'COMP-001'})
+        self.assertTrue(response.json()['probably_existing'])
+
+
+class ConcurrentScanTests(TransactionTestCase):
+    """Tests for parallel scans of the same asset tag"""
+
+    def test_parallel_scans_create_single_row(self):
+        """Test that 50 parallel scans of one tag create one row without errors"""
+        def scan(_):
+            try:
+                return upsert_scanned_asset(Computers, 'COMP-RACE')[1]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(scan, range(50)))
+
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(Computers.objects.filter(asset_tag='COMP-RACE').count(), 1)
+
+    def test_key_taken_by_concurrent_scan_is_retried(self):
+        """Test that a computed key taken by another new tag is recomputed"""
+        Computers.objects.create(asset_tag='COMP-001')
+        Computers.objects.create(asset_tag='COMP-002')
+        build = scanning.build_upsert_sql
+        calls = []
+
+        def build_once_stale(*args):
+            # The first attempt computes its key as if computer-2 were not committed yet
+            calls.append(args)
+            sql, params = build(*args)
+            if len(calls) == 1:
+                sql = sql.replace('COALESCE(MAX(', 'COALESCE(MIN(')
+            return sql, params
+
+        with mock.patch.object(scanning, 'build_upsert_sql', side_effect=build_once_stale):
+            computer, created = upsert_scanned_asset(Computers, 'COMP-003')
+        self.assertTrue(created)
+        self.assertEqual(computer.id, 'computer-3')
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(Computers.objects.count(), 3)
+
+
+class AssetIndexTests(BaseTestCase):
+    """Tests for the cross-type asset index"""
+
+    def test_index_follows_saves_and_deletes(self):
+        """Test that signals keep the index in step with the asset tables"""
+        computer = Computers.objects.create(asset_tag='COMP-001', location='HQ')
+        entry = AssetIndex.objects.get(asset_type=AssetType.COMPUTER, asset_id=computer.id)
+        self.assertEqual(entry.location, 'HQ')
+
+        computer.status = AssetStatus.RETIRED
+        computer.save()
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, AssetStatus.RETIRED)
+
+        computer.delete()
+        self.assertFalse(AssetIndex.objects.filter(asset_id=computer.id).exists())
+
+    def test_any_tag_lookup_is_one_query(self):
+        """Test that a tag is found across types with a single query"""
+        printers.objects.create(service_tag='TAG-1')
+        monitors.objects.create(asset_tag='TAG-1')
+        with self.assertNumQueries(1):
+            matches = list(asset_index.lookup_tag('TAG-1'))
+        self.assertEqual(
+            {m.asset_type for m in matches},
+            {AssetType.PRINTER, AssetType.MONITOR}
+        )
+
+    def test_attach_targets_resolves_page_in_one_query(self):
+        """Test bulk resolution of polymorphic references"""
+        computer = Computers.objects.create(asset_tag='COMP-001')
+        dock = docking_stations.objects.create(asset_tag='DOCK-001')
+        rows = [
+            AssetAssignment(asset_type='Computer', asset_id=computer.id, assigned_to='A'),
+            AssetAssignment(asset_type='Docking Station', asset_id=dock.id, assigned_to='B'),
+            AssetAssignment(asset_type='Monitor', asset_id='monitor-404', assigned_to='C'),
+        ]
+        with self.assertNumQueries(1):
+            asset_index.attach_targets(rows)
+        self.assertEqual(rows[0].target.asset_tag, 'COMP-001')
+        self.assertEqual(rows[1].target.asset_tag, 'DOCK-001')
+        self.assertIsNone(rows[2].target)
+
+    def test_create_assignment_rejects_missing_asset(self):
+        """Test that assignments must point at an indexed asset"""
+        self.client.login(username='admin', password='adminpass123')
+        self.client.post(reverse('create_assignment'), {
+            'asset_type': 'Computer', 'asset_id': 'computer-404', 'assigned_to': 'John Doe'
+        })
+        self.assertFalse(AssetAssignment.objects.exists())
+
+        computer = Computers.objects.create(asset_tag='COMP-001')
+        self.client.post(reverse('create_assignment'), {
+            'asset_type': 'Computer', 'asset_id': computer.id, 'assigned_to': 'John Doe'
+        })
+        self.assertEqual(AssetAssignment.objects.count(), 1)
+
+    def test_scan_lookup_endpoint(self):
+        """Test the any-tag scan lookup endpoint"""
+        self.client.login(username='admin', password='adminpass123')
+        Computers.objects.create(asset_tag='COMP-001')
+        response = self.client.get(reverse('lookup_any_tag'), {'tag': 'COMP-001'})
+        self.assertEqual(response.json()['matches'][0]['asset_type'], 'computer')
+
+
+class AutocompleteTests(BaseTestCase):
+    """Tests for the on-demand asset choice widgets"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='admin', password='adminpass123')
+        self.computers = [
+            Computers.objects.create(asset_tag=f'COMP-{n:03d}') for n in range(30)
+        ]
+
+    def test_prefix_search_with_limit(self):
+        """Test prefix matching, the limit and the more flag"""
+        url = reverse('asset_autocomplete', args=['computer'])
+        data = self.client.get(url, {'q': 'COMP-01', 'limit': 5}).json()
+        self.assertEqual(len(data['results']), 5)
+        self.assertTrue(data['more'])
+        self.assertTrue(all(r['text'].startswith('COMP-01') for r in data['results']))
+
+        data = self.client.get(url, {'q': 'COMP-029'}).json()
+        self.assertEqual([r['id'] for r in data['results']], [self.computers[29].id])
+        self.assertFalse(data['more'])
+
+    def test_unknown_asset_type(self):
+        """Test that unknown asset types return 404"""
+        response = self.client.get(reverse('asset_autocomplete', args=['toaster']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_foreign_key_widget_renders_selected_choice_only(self):
+        """Test that the computer select does not list every computer"""
+        monitor = monitors.objects.create(asset_tag='MON-001', computer=self.computers[0])
+        form = monitorsForm(instance=monitor)
+        with self.assertNumQueries(1):
+            html = str(form['computer'])
+        self.assertIn(f'value="{self.computers[0].id}" selected', html)
+        self.assertNotIn(self.computers[1].id, html)
+        self.assertIn('data-autocomplete-url', html)
+
+    def test_unbound_forms_render_without_queries(self):
+        """Test that empty forms render no related rows"""
+        with self.assertNumQueries(0):
+            str(computersForm()['printers'])
+            str(docking_stationsForm()['computer'])
+
+    def test_create_assignment_page_does_not_embed_assets(self):
+        """Test that the assignment page no longer ships every asset"""
+        response = self.client.get(reverse('create_assignment'))
+        self.assertNotContains(response, self.computers[0].id)
+        self.assertContains(response, reverse('asset_autocomplete', args=['computer']))
+
+
+class AssignmentValidationTests(BaseTestCase):
+    """Tests for assignment validation against live asset state"""
+
+    def setUp(self):
+        super().setUp()
+        self.computer = Computers.objects.create(asset_tag='COMP-001')
+
+    def test_check_assignable_is_one_query(self):
+        """Test that validation takes a single query and canonicalizes the type"""
+        with self.assertNumQueries(1):
+            self.assertEqual(check_assignable('computer', self.computer.id), 'Computer')
+
+    def test_rejects_missing_retired_and_held_assets(self):
+        """Test each rejection reason"""
+        with self.assertRaisesMessage(ValidationError, 'No Computer with ID computer-404'):
+            check_assignable('Computer', 'computer-404')
+
+        AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id,
+            assigned_to='Jane', status='checked_out'
+        )
+        with self.assertRaisesMessage(ValidationError, 'already assigned'):
+            check_assignable('Computer', self.computer.id)
+
+        retired = Computers.objects.create(asset_tag='COMP-002', status=AssetStatus.RETIRED)
+        with self.assertRaisesMessage(ValidationError, 'retired'):
+            check_assignable('Computer', retired.id)
+
+    def test_asset_type_variants_are_normalized(self):
+        """Test that code and case variants are checked and stored as the label"""
+        self.assertEqual(check_assignable(' COMPUTER ', self.computer.id), 'Computer')
+        AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id,
+            assigned_to='Jane', status='approved'
+        )
+        with self.assertRaisesMessage(ValidationError, 'already assigned'):
+            check_assignable('computer', self.computer.id)
+
+    def test_second_holding_assignment_is_rejected_by_database(self):
+        """Test that the partial unique index blocks a second approval"""
+        first, second = [
+            AssetAssignment.objects.create(
+                asset_type='Computer', asset_id=self.computer.id, assigned_to=name
+            )
+            for name in ('Jane', 'John')
+        ]
+        first.status = 'approved'
+        save_transition(first)
+        second.status = 'approved'
+        with self.assertRaises(ValidationError):
+            save_transition(second)
+
+        # Returned and rejected assignments do not hold the asset
+        first.status = 'returned'
+        save_transition(first)
+        save_transition(second)
+
+    def test_api_create_validates_asset(self):
+        """Test that the API rejects assignments to checked-out assets"""
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id,
+            assigned_to='Jane', status='checked_out'
+        )
+        response = client.post('/api/assignments/', {
+            'asset_type': 'Computer', 'asset_id': self.computer.id, 'assigned_to': 'John'
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('asset_id', response.data)
+
+    def test_api_approve_conflict(self):
+        """Test that approving a second assignment of an asset returns 409"""
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id,
+            assigned_to='Jane', status='approved'
+        )
+        pending = AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id, assigned_to='John'
+        )
+        response = client.post(f'/api/assignments/{pending.id}/approve/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+
+class BulkAssignmentTests(BaseTestCase):
+    """Tests for set-based bulk assignment workflow actions"""
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user.email = 'admin@test.com'
+        self.admin_user.save()
+        self.computers = [
+            Computers.objects.create(asset_tag=f'COMP-{n:03d}') for n in range(3)
+        ]
+
+    def make_assignment(self, computer, status='pending', assigned_to='Jane'):
+        return AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=computer.id, assigned_to=assigned_to,
+            assigned_by=self.admin_user, status=status
+        )
+
+    def test_bulk_approve_reports_transitioned_and_skipped(self):
+        """Test one conditional update with audit entries and notifications"""
+        first = self.make_assignment(self.computers[0])
+        duplicate = self.make_assignment(self.computers[0], assigned_to='John')
+        second = self.make_assignment(self.computers[1])
+        held = self.make_assignment(self.computers[2], status='pending')
+        self.make_assignment(self.computers[2], status='checked_out')
+        rejected = self.make_assignment(self.computers[1], status='rejected')
+
+        ids = [first.id, duplicate.id, second.id, held.id, rejected.id, 9999]
+        transitioned, skipped = bulk_transition('approve', ids, user=self.admin_user)
+
+        self.assertEqual(transitioned, [first.id, second.id])
+        self.assertEqual(skipped, sorted([duplicate.id, held.id, rejected.id, 9999]))
+        self.assertEqual(
+            AssetAssignment.objects.get(id=first.id).approved_by, self.admin_user
+        )
+        self.assertEqual(AssetHistory.objects.filter(action='updated').count(), 2)
+        self.assertEqual(NotificationOutbox.objects.filter(action='approved').count(), 2)
+        process_outbox()
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_bulk_transition_query_count_is_constant(self):
+        """Test that the number of queries does not grow with the batch"""
+        ids = [self.make_assignment(c, status='checked_out').id for c in self.computers]
+        with CaptureQueriesContext(connection) as queries:
+            transitioned, skipped = bulk_transition('return', ids, user=self.admin_user)
+        # UPDATE ... RETURNING, select for audit/notifications, audit INSERT, outbox INSERT
+        statements = [
+            q['sql'] for q in queries.captured_queries
+            if not q['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+        ]
+        self.assertEqual(len(statements), 4)
+        self.assertEqual(len(transitioned), 3)
+        self.assertFalse(AssetAssignment.objects.filter(returned_date__isnull=True).exists())
+
+    def test_bulk_view(self):
+        """Test the multi-select action on the assignment list"""
+        self.client.login(username='admin', password='adminpass123')
+        assignment = self.make_assignment(self.computers[0])
+        response = self.client.post(reverse('bulk_assignment_action'), {
+            'action': 'reject', 'assignment_ids': [assignment.id]
+        })
+        self.assertRedirects(response, reverse('assignment_list'))
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.status, 'rejected')
+
+    def test_bulk_api(self):
+        """Test the bulk API endpoint"""
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        assignment = self.make_assignment(self.computers[0], status='approved')
+        response = client.post('/api/assignments/bulk/', {
+            'action': 'checkout', 'ids': [assignment.id, 12345]
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['transitioned'], [assignment.id])
+        self.assertEqual(response.data['skipped'], [12345])
+
+        response = client.post('/api/assignments/bulk/', {'action': 'explode', 'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OptimisticConcurrencyTests(BaseTestCase):
+    """Tests for version-checked updates"""
+
+    def setUp(self):
+        super().setUp()
+        self.computer = Computers.objects.create(asset_tag='COMP-001', department='IT')
+
+    def test_stale_save_is_rejected(self):
+        """Test that a save based on an old read raises instead of overwriting"""
+        first = Computers.objects.get(pk=self.computer.pk)
+        second = Computers.objects.get(pk=self.computer.pk)
+        first.department = 'HR'
+        first.save()
+        self.assertEqual(first.version, 2)
+
+        second.department = 'Finance'
+        with self.assertRaises(ConcurrentUpdateError), transaction.atomic():
+            second.save()
+        self.computer.refresh_from_db()
+        self.assertEqual(self.computer.department, 'HR')
+
+    def test_concurrent_approve_and_reject(self):
+        """Test that the second of two racing transitions loses"""
+        assignment = AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id, assigned_to='Jane'
+        )
+        approver = AssetAssignment.objects.get(pk=assignment.pk)
+        rejecter = AssetAssignment.objects.get(pk=assignment.pk)
+        approver.status = 'approved'
+        save_transition(approver)
+        rejecter.status = 'rejected'
+        with self.assertRaisesMessage(ValidationError, 'changed by someone else'):
+            save_transition(rejecter)
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.status, 'approved')
+
+    def test_html_form_with_stale_version_returns_409(self):
+        """Test the hidden version field on the edit form"""
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('computers_form', args=[self.computer.pk]))
+        self.assertContains(response, 'name="version" value="1"')
+
+        Computers.objects.filter(pk=self.computer.pk).update(version=2, department='HR')
+        response = self.client.post(reverse('computers_form', args=[self.computer.pk]), {
+            'asset_tag': 'COMP-001', 'department': 'Finance', 'status': 'active', 'version': 1
+        })
+        self.assertEqual(response.status_code, 409)
+        self.computer.refresh_from_db()
+        self.assertEqual(self.computer.department, 'HR')
+
+    def test_api_etag_and_if_match(self):
+        """Test ETag on detail responses and If-Match on updates"""
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        url = f'/api/computers/{self.computer.pk}/'
+        etag = client.get(url)['ETag']
+
+        response = client.patch(url, {'department': 'HR'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = client.patch(url, {'department': 'Finance'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.computer.refresh_from_db()
+        self.assertEqual(self.computer.department, 'HR')
+
+    def test_scan_edit_with_stale_etag_returns_412(self):
+        """Test that the inline scan editor sends and honours the ETag"""
+        self.client.login(username='admin', password='adminpass123')
+        asset = self.client.post(
+            reverse('save_barcode'), {'barcode_data': 'COMP-001', 'include_form': '1'}
+        ).json()['asset']
+        Computers.objects.filter(pk=self.computer.pk).update(version=5)
+
+        response = self.client.patch(
+            reverse('scan_edit', args=[asset['form_token']]),
+            data=json.dumps({'department': 'HR'}),
+            content_type='application/json',
+            HTTP_IF_MATCH=asset['etag']
+        )
+        self.assertEqual(response.status_code, 412)
+
+
+class OverdueAssignmentTests(BaseTestCase):
+    """Tests for overdue assignment paging, counts and escalation"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        today = date.today()
+        self.assignments = []
+        for n in range(5):
+            computer = Computers.objects.create(asset_tag=f'COMP-OD{n}')
+            self.assignments.append(AssetAssignment.objects.create(
+                asset_type='Computer', asset_id=computer.id, assigned_to='Jane',
+                assigned_by=self.admin_user, status='checked_out',
+                due_date=today - timedelta(days=n % 2 + 1)
+            ))
+        # Not overdue: due in the future, and returned late
+        computer = Computers.objects.create(asset_tag='COMP-ODX')
+        AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=computer.id, assigned_to='Jane',
+            assigned_by=self.admin_user, status='checked_out',
+            due_date=today + timedelta(days=3)
+        )
+        AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=computer.id, assigned_to='John',
+            assigned_by=self.admin_user, status='returned',
+            due_date=today - timedelta(days=10)
+        )
+
+    def test_keyset_pages_cover_every_row_once(self):
+        """Test paging in (due_date, id) order without gaps or repeats"""
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor = overdue.overdue_page(cursor, limit=2)
+            seen.extend(rows)
+            if cursor is None:
+                break
+        expected = sorted(self.assignments, key=lambda a: (a.due_date, a.id))
+        self.assertEqual([a.id for a in seen], [a.id for a in expected])
+
+        with self.assertRaises(ValueError):
+            overdue.overdue_page('not-a-cursor')
+
+    def test_count_is_cached_and_invalidated(self):
+        """Test that the dashboard count is cached until an assignment changes"""
+        self.assertEqual(overdue.overdue_count(), 5)
+        with self.assertNumQueries(0):
+            self.assertEqual(overdue.overdue_count(), 5)
+
+        assignment = self.assignments[0]
+        assignment.status = 'returned'
+        assignment.save()
+        self.assertEqual(overdue.overdue_count(), 4)
+
+        bulk_transition('return', [self.assignments[1].id])
+        self.assertEqual(overdue.overdue_count(), 3)
+
+    def test_escalation_batches_and_interval(self):
+        """Test that escalation notifies in batches and not again within the interval"""
+        self.assertEqual(overdue.escalate_overdue(batch_size=2), 5)
+        self.assertEqual(len(mail.outbox), 0)  # queued in the outbox
+        process_outbox()
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertIn('Overdue', mail.outbox[0].subject)
+        self.assertFalse(
+            AssetAssignment.objects.filter(status='checked_out', due_date__lt=date.today(),
+                                           escalated_at__isnull=True).exists()
+        )
+
+        self.assertEqual(overdue.escalate_overdue(batch_size=2), 0)
+        process_outbox()
+        self.assertEqual(len(mail.outbox), 5)
+
+        self.assertEqual(overdue.escalate_overdue(interval=timedelta(0)), 5)
+
+    def test_failed_escalation_is_retried(self):
+        """Test that a notice whose send fails stays queued for the next run"""
+        overdue.escalate_overdue()
+        with mock.patch('inventory.outbox.get_connection', side_effect=OSError('SMTP down')):
+            self.assertEqual(process_outbox()['retried'], 5)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            NotificationOutbox.objects.filter(action='overdue', status='pending', attempts=1).count(), 5
+        )
+
+    def test_count_invalidated_on_commit(self):
+        """Test that a count cached before a bulk return commits is dropped"""
+        self.assertEqual(overdue.overdue_count(), 5)
+        with self.captureOnCommitCallbacks() as callbacks:
+            bulk_transition('return', [self.assignments[0].id])
+            cache.set(overdue._count_key(timezone.localdate()), 5)  # a concurrent reader
+        for callback in callbacks:
+            callback()
+        self.assertEqual(overdue.overdue_count(), 4)
+
+    def test_escalate_command(self):
+        """Test the escalate_overdue management command"""
+        out = StringIO()
+        call_command('escalate_overdue', '--batch-size', '3', stdout=out)
+        self.assertIn('Escalated 5', out.getvalue())
+
+    def test_overdue_api(self):
+        """Test the keyset-paged overdue API endpoint"""
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        response = client.get('/api/assignments/overdue/', {'limit': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(len(response.data['results']), 3)
+
+        response = client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+
+        response = client.get('/api/assignments/overdue/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_dashboard_shows_overdue_count(self):
+        """Test the overdue widget on the dashboard"""
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['overdue_assignments'], 5)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class NotificationDeliveryTests(BaseTestCase):
+    """Tests for batched notification delivery"""
+
+    def make_user(self, n, **preferences):
+        user = User.objects.create_user(
+            username=f'notify{n}', email=f'notify{n}@test.com', password='x'
+        )
+        NotificationSetting.objects.create(user=user, **preferences)
+        return user
+
+    def test_one_connection_per_batch(self):
+        """Test that each batch reuses a single mail connection"""
+        messages = [
+            notifications.build_email(f'user{n}@test.com', 'Subject', 'Body', '<p>Body</p>')
+            for n in range(5)
+        ]
+        with mock.patch.object(
+            notifications, 'get_connection', wraps=notifications.get_connection
+        ) as get_connection:
+            sent = notifications.deliver(messages, batch_size=2)
+        self.assertEqual(sent, 5)
+        self.assertEqual(get_connection.call_count, 3)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(len(mail.outbox[0].alternatives), 1)
+
+    def test_rate_limit_sleeps_between_batches(self):
+        """Test that a rate cap spaces batches out"""
+        messages = [
+            notifications.build_email(f'user{n}@test.com', 'Subject', 'Body', '<p>Body</p>')
+            for n in range(4)
+        ]
+        with mock.patch.object(notifications.time, 'sleep') as sleep:
+            notifications.deliver(messages, batch_size=2, rate=1)
+        # No pause after the last batch
+        self.assertEqual(sleep.call_count, 1)
+        self.assertGreater(sleep.call_args[0][0], 1.5)
+
+    @override_settings(EMAIL_BATCH_SIZE=2)
+    def test_summary_rendered_once_and_batched(self):
+        """Test that the shared summary is rendered once for all recipients"""
+        for n in range(3):
+            self.make_user(n, daily_summary=True)
+        with mock.patch.object(
+            notifications, 'render_to_string', wraps=notifications.render_to_string
+        ) as render, mock.patch.object(
+            notifications, 'get_connection', wraps=notifications.get_connection
+        ) as get_connection:
+            self.assertEqual(notifications.send_daily_summary(), 3)
+        # One text and one HTML render, two batches
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(get_connection.call_count, 2)
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            ['notify0@test.com', 'notify1@test.com', 'notify2@test.com']
+        )
+
+    def test_warranty_rendered_once_per_window(self):
+        """Test warranty emails are rendered per distinct reminder window"""
+        today = date.today()
+        Computers.objects.create(asset_tag='COMP-W1', warranty_expiry=today + timedelta(days=5))
+        Computers.objects.create(asset_tag='COMP-W2', warranty_expiry=today + timedelta(days=20))
+        wide = [self.make_user(n, warranty_reminder_days=30) for n in range(2)]
+        narrow = self.make_user(9, warranty_reminder_days=7)
+        NotificationSetting.objects.create(user=self.admin_user, email_on_warranty_expiry=False)
+        NotificationSetting.objects.create(user=self.regular_user, email_on_warranty_expiry=False)
+
+        with mock.patch.object(
+            notifications, 'render_to_string', wraps=notifications.render_to_string
+        ) as render:
+            self.assertEqual(notifications.send_warranty_expiry_notifications(), 3)
+        self.assertEqual(render.call_count, 4)
+
+        subjects = {m.to[0]: m.subject for m in mail.outbox}
+        self.assertIn('2 assets', subjects[wide[0].email])
+        self.assertIn('1 assets', subjects[narrow.email])
+        self.assertIn('COMP-W2', next(m.body for m in mail.outbox if m.to == [wide[1].email]))
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    WARRANTY_REMINDER_DAYS=30
+)
+class WarrantyMatchingTests(BaseTestCase):
+    """Tests for warranty matching with per-user windows and alert state"""
+
+    def setUp(self):
+        super().setUp()
+        today = date.today()
+        Computers.objects.create(asset_tag='COMP-5', warranty_expiry=today + timedelta(days=5))
+        printers.objects.create(service_tag='PRN-20', warranty_expiry=today + timedelta(days=20))
+        monitors.objects.create(asset_tag='MON-60', warranty_expiry=today + timedelta(days=60))
+        docking_stations.objects.create(asset_tag='DOCK-90', warranty_expiry=today + timedelta(days=90))
+        Computers.objects.create(asset_tag='COMP-OLD', warranty_expiry=today - timedelta(days=1))
+        Computers.objects.create(asset_tag='COMP-NONE')
+        NotificationSetting.objects.create(user=self.admin_user, email_on_warranty_expiry=False)
+        NotificationSetting.objects.create(user=self.regular_user, email_on_warranty_expiry=False)
+
+    def subscribe(self, name, days):
+        user = User.objects.create_user(username=name, email=f'{name}@test.com', password='x')
+        NotificationSetting.objects.create(user=user, warranty_reminder_days=days)
+        return user
+
+    def test_expiring_warranties_single_sorted_query(self):
+        """Test that all asset types come back from one query, sorted by expiry"""
+        today = date.today()
+        with self.assertNumQueries(1):
+            expiring = notifications.expiring_warranties(today, today + timedelta(days=90))
+        self.assertEqual(
+            [a['tag'] for a in expiring], ['COMP-5', 'PRN-20', 'MON-60', 'DOCK-90']
+        )
+        self.assertEqual(
+            [a['kind'] for a in expiring],
+            ['computers', 'printers', 'monitors', 'docking_stations']
+        )
+
+    def test_mixed_windows(self):
+        """Test each user gets exactly the assets inside their own window"""
+        windows = {'week': 7, 'month': 30, 'quarter': 90, 'none': 1}
+        for name, days in windows.items():
+            self.subscribe(name, days)
+
+        # Users, state pruning, one UNION ALL query of expiring assets, sent
+        # alerts, alert INSERT
+        with self.assertNumQueries(5):
+            self.assertEqual(notifications.send_warranty_expiry_notifications(), 3)
+
+        bodies = {m.to[0]: m.body for m in mail.outbox}
+        self.assertNotIn('none@test.com', bodies)
+        self.assertIn('COMP-5', bodies['week@test.com'])
+        self.assertNotIn('PRN-20', bodies['week@test.com'])
+        self.assertIn('PRN-20', bodies['month@test.com'])
+        self.assertNotIn('MON-60', bodies['month@test.com'])
+        # Wider than WARRANTY_REMINDER_DAYS: no longer truncated by the global setting
+        for tag in ('COMP-5', 'PRN-20', 'MON-60', 'DOCK-90'):
+            self.assertIn(tag, bodies['quarter@test.com'])
+        self.assertNotIn('COMP-OLD', bodies['quarter@test.com'])
+
+    def run_on(self, day):
+        now = timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=12))
+        mail.outbox = []
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            return notifications.send_warranty_expiry_notifications()
+
+    @override_settings(WARRANTY_ALERT_MILESTONES=[30, 7, 1])
+    def test_alerts_sent_once_per_milestone(self):
+        """Test that repeat runs only mail assets that crossed a new threshold"""
+        user = self.subscribe('alerts', 30)
+        today = date.today()
+        self.assertEqual(self.run_on(today), 1)
+        self.assertEqual(WarrantyAlert.objects.filter(user=user).count(), 2)
+
+        # Same day and next day: nothing new
+        self.assertEqual(self.run_on(today), 0)
+        self.assertEqual(self.run_on(today + timedelta(days=1)), 0)
+
+        # COMP-5 reaches the 1-day milestone; PRN-20 reaches 7 days later
+        self.assertEqual(self.run_on(today + timedelta(days=4)), 1)
+        self.assertIn('COMP-5', mail.outbox[0].body)
+        self.assertNotIn('PRN-20', mail.outbox[0].body)
+        self.assertEqual(self.run_on(today + timedelta(days=13)), 1)
+        self.assertIn('PRN-20', mail.outbox[0].body)
+
+        # Passed warranties drop out of the state table
+        self.run_on(today + timedelta(days=21))
+        self.assertFalse(WarrantyAlert.objects.filter(asset_id__startswith='computer').exists())
+
+    @override_settings(WARRANTY_ALERT_MILESTONES=[30, 7, 1])
+    def test_query_count_independent_of_users(self):
+        """Test that sent alerts are looked up once for all users"""
+        for n in range(5):
+            self.subscribe(f'user{n}', 30)
+        today = date.today()
+        self.assertEqual(self.run_on(today), 5)
+
+        # Users, state pruning, expiring assets, sent alerts; nothing new
+        with self.assertNumQueries(4):
+            self.assertEqual(self.run_on(today), 0)
+        with self.assertNumQueries(5):
+            self.assertEqual(self.run_on(today + timedelta(days=4)), 5)
+        self.assertTrue(all('COMP-5' in m.body and 'PRN-20' not in m.body for m in mail.outbox))
+
+    def test_failed_delivery_records_no_alerts(self):
+        """Test that alerts in a batch that failed to send are retried next run"""
+        self.subscribe('retry', 30)
+        today = date.today()
+        with mock.patch('inventory.notifications.get_connection', side_effect=OSError('SMTP down')):
+            self.assertEqual(self.run_on(today), 0)
+        self.assertFalse(WarrantyAlert.objects.exists())
+
+        self.assertEqual(self.run_on(today), 1)
+        self.assertEqual(WarrantyAlert.objects.count(), 2)
+
+    @override_settings(WARRANTY_ALERT_MILESTONES=[])
+    def test_renewed_warranty_alerts_again(self):
+        """Test that a changed expiry date is not covered by an old alert"""
+        self.subscribe('renewal', 30)
+        today = date.today()
+        self.assertEqual(self.run_on(today), 1)
+        self.assertEqual(self.run_on(today), 0)
+
+        computer = Computers.objects.get(asset_tag='COMP-5')
+        computer.warranty_expiry = today + timedelta(days=25)
+        computer.save()
+        self.assertEqual(self.run_on(today), 1)
+        self.assertIn('COMP-5', mail.outbox[0].body)
+        self.assertNotIn('PRN-20', mail.outbox[0].body)
+
+
+class NotificationOutboxTests(BaseTestCase):
+    """Tests for the transactional notification outbox"""
+
+    def setUp(self):
+        super().setUp()
+        self.computer = Computers.objects.create(asset_tag='COMP-OUT')
+        self.assignment = AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id, assigned_to='Jane',
+            assigned_by=self.admin_user, status='pending'
+        )
+
+    def test_transition_queues_instead_of_sending(self):
+        """Test that approval writes an outbox row and sends nothing inline"""
+        self.client.login(username='admin', password='adminpass123')
+        self.client.get(reverse('approve_assignment', args=[self.assignment.id]))
+        self.assertEqual(len(mail.outbox), 0)
+        entry = NotificationOutbox.objects.get()
+        self.assertEqual((entry.action, entry.status), ('approved', 'pending'))
+
+        self.assertEqual(process_outbox()['sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('Approved', mail.outbox[0].subject)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, 'sent')
+        self.assertIsNotNone(entry.sent_at)
+
+    def test_rolled_back_change_queues_nothing(self):
+        """Test that the outbox row shares the change's transaction"""
+        AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id, assigned_to='John',
+            assigned_by=self.admin_user, status='checked_out'
+        )
+        self.assignment.status = 'approved'
+        with self.assertRaises(ValidationError):
+            save_transition(self.assignment)
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+    def test_create_view_queues_notification(self):
+        """Test that creating an assignment queues a 'created' notification"""
+        self.client.login(username='admin', password='adminpass123')
+        other = Computers.objects.create(asset_tag='COMP-OUT2')
+        self.client.post(reverse('create_assignment'), {
+            'asset_type': 'computer', 'asset_id': other.id, 'assigned_to': 'Jane'
+        })
+        self.assertTrue(NotificationOutbox.objects.filter(action='created').exists())
+
+    def test_opted_out_entries_are_skipped(self):
+        """Test that users who opted out are skipped rather than mailed"""
+        NotificationSetting.objects.create(user=self.admin_user, email_on_assignment=False)
+        self.assignment.status = 'rejected'
+        save_transition(self.assignment)
+        self.assertEqual(process_outbox()['skipped'], 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_failures_back_off_then_dead_letter(self):
+        """Test retries with backoff and dead-lettering after MAX_ATTEMPTS"""
+        self.assignment.status = 'approved'
+        save_transition(self.assignment)
+        entry = NotificationOutbox.objects.get()
+
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=OSError('relay down')
+        ):
+            self.assertEqual(process_outbox()['retried'], 1)
+            entry.refresh_from_db()
+            self.assertEqual(entry.attempts, 1)
+            self.assertGreater(entry.next_attempt_at, timezone.now())
+            self.assertIn('relay down', entry.last_error)
+
+            # Not due yet: nothing to do
+            self.assertEqual(process_outbox()['retried'], 0)
+
+            for _ in range(MAX_ATTEMPTS - 1):
+                NotificationOutbox.objects.update(next_attempt_at=timezone.now())
+                counts = process_outbox()
+            self.assertEqual(counts['dead'], 1)
+
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), ('dead', MAX_ATTEMPTS))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_process_outbox_command(self):
+        """Test the worker command drains the queue"""
+        self.assignment.status = 'approved'
+        save_transition(self.assignment)
+        out = StringIO()
+        call_command('process_outbox', stdout=out)
+        self.assertIn('1 sent', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class AdminChangelistQueryTests(BaseTestCase):
+    """Tests that admin changelists do not issue per-row queries"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='admin', password='adminpass123')
+        self.batch = 0
+
+    def add_assets(self):
+        """Add a few rows of every changelist's model, with relations"""
+        self.batch += 1
+        for n in range(3):
+            tag = f'{self.batch}-{n}'
+            computer = Computers.objects.create(asset_tag=f'COMP-ADM{tag}')
+            printer = printers.objects.create(service_tag=f'PRN-ADM{tag}')
+            computer.printers.add(printer)
+            monitors.objects.create(asset_tag=f'MON-ADM{tag}', computer=computer)
+            docking_stations.objects.create(asset_tag=f'DOCK-ADM{tag}', computer=computer)
+            AssetAssignment.objects.create(
+                asset_type='Computer', asset_id=computer.id, assigned_to='Jane',
+                assigned_by=self.admin_user
+            )
+            user = User.objects.create_user(username=f'adm{tag}', password='x')
+            NotificationSetting.objects.create(user=user)
+
+    def assertConstantQueries(self, model_name):
+        url = reverse(f'admin:inventory_{model_name}_changelist')
+        self.add_assets()
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as baseline:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        self.add_assets()
+        with self.assertNumQueries(len(baseline.captured_queries)):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_computers_changelist(self):
+        """Test annotated monitor and docking station counts"""
+        response = self.assertConstantQueries('computers')
+        computer = response.context['cl'].result_list[0]
+        self.assertEqual((computer.monitors_count, computer.docking_stations_count), (1, 1))
+
+    def test_counts_not_multiplied_by_joins(self):
+        """Test that monitor and dock counts are independent of each other"""
+        computer = Computers.objects.create(asset_tag='COMP-MANY')
+        for n in range(3):
+            monitors.objects.create(asset_tag=f'MON-MANY{n}', computer=computer)
+        for n in range(2):
+            docking_stations.objects.create(asset_tag=f'DOCK-MANY{n}', computer=computer)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:inventory_computers_changelist'))
+        row = next(c for c in response.context['cl'].result_list if c.pk == computer.pk)
+        self.assertEqual((row.monitors_count, row.docking_stations_count), (3, 2))
+        self.assertFalse(any('JOIN "inventory_monitors"' in q['sql'] for q in queries.captured_queries))
+
+    def test_counts_only_on_changelist(self):
+        """Test that the change view queryset is not annotated"""
+        computer = Computers.objects.create(asset_tag='COMP-EDIT')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:inventory_computers_change', args=[computer.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('monitors_count' in q['sql'] for q in queries.captured_queries))
+
+    def test_printers_changelist(self):
+        """Test the annotated computer count"""
+        response = self.assertConstantQueries('printers')
+        self.assertEqual(response.context['cl'].result_list[0].computers_count, 1)
+
+    def test_monitors_changelist(self):
+        self.assertConstantQueries('monitors')
+
+    def test_docking_stations_changelist(self):
+        self.assertConstantQueries('docking_stations')
+
+    def test_asset_history_changelist(self):
+        self.assertConstantQueries('assethistory')
+
+    def test_assignment_changelist(self):
+        self.assertConstantQueries('assetassignment')
+
+    def test_notification_setting_changelist(self):
+        self.assertConstantQueries('notificationsetting')
+
+
+class AdminBulkActionTests(BaseTestCase):
+    """Tests for set-based admin bulk actions"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='admin', password='adminpass123')
+        self.computers = [
+            Computers.objects.create(asset_tag=f'COMP-BULK{n}', location='HQ')
+            for n in range(3)
+        ]
+
+    def changelist(self, model_name):
+        return reverse(f'admin:inventory_{model_name}_changelist')
+
+    def test_bulk_update_query_count_is_constant(self):
+        """Test one select, one UPDATE, one audit INSERT and one index UPDATE"""
+        for count in (3, 6):
+            while Computers.objects.count() < count:
+                Computers.objects.create(asset_tag=f'COMP-BULKX{Computers.objects.count()}')
+            with CaptureQueriesContext(connection) as queries:
+                updated = bulk_update_assets(
+                    Computers.objects.all(), {'location': f'Site {count}'}, user=self.admin_user
+                )
+            statements = [
+                q['sql'] for q in queries.captured_queries
+                if not q['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+            ]
+            self.assertEqual(updated, count)
+            self.assertEqual(len(statements), 4)
+
+    def test_large_selection_is_updated_in_batches(self):
+        """Test that the id lists are split to stay under parameter limits"""
+        with mock.patch('inventory.bulk_updates.BULK_BATCH_SIZE', 2), \
+                CaptureQueriesContext(connection) as queries:
+            updated = bulk_update_assets(Computers.objects.all(), {'location': 'Annex'})
+        self.assertEqual(updated, 3)
+        self.assertEqual(Computers.objects.filter(location='Annex', version=2).count(), 3)
+        self.assertEqual(AssetIndex.objects.filter(location='Annex').count(), 3)
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 4)
+
+    def test_mark_retired(self):
+        """Test the no-input action updates rows, versions, audit and index"""
+        history_before = AssetHistory.objects.count()
+        ids = [c.id for c in self.computers[:2]]
+        response = self.client.post(self.changelist('computers'), {
+            'action': 'mark_retired', helpers.ACTION_CHECKBOX_NAME: ids
+        })
+        self.assertEqual(response.status_code, 302)
+
+        for computer in Computers.objects.filter(id__in=ids):
+            self.assertEqual(computer.status, AssetStatus.RETIRED)
+            self.assertEqual(computer.version, 2)
+        self.assertEqual(Computers.objects.get(id=self.computers[2].id).status, AssetStatus.ACTIVE)
+        self.assertEqual(
+            set(AssetIndex.objects.filter(asset_id__in=ids).values_list('status', flat=True)),
+            {AssetStatus.RETIRED}
+        )
+        entries = AssetHistory.objects.order_by('-id')[:2]
+        self.assertEqual(AssetHistory.objects.count(), history_before + 2)
+        self.assertEqual(entries[0].changed_by, self.admin_user)
+        self.assertEqual(entries[0].old_values, {'status': 'active'})
+        self.assertEqual(entries[0].new_values, {'status': 'retired'})
+
+        # Rows already in the target state are skipped
+        self.assertEqual(bulk_update_assets(
+            Computers.objects.filter(id__in=ids), {'status': AssetStatus.RETIRED}
+        ), 0)
+
+    def test_move_to_location_prompts_then_applies(self):
+        """Test the intermediate form of an action that needs input"""
+        ids = [c.id for c in self.computers]
+        response = self.client.post(self.changelist('computers'), {
+            'action': 'move_to_location', helpers.ACTION_CHECKBOX_NAME: ids
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'name="location"')
+
+        response = self.client.post(self.changelist('computers'), {
+            'action': 'move_to_location', helpers.ACTION_CHECKBOX_NAME: ids,
+            'apply': '1', 'location': 'Warehouse'
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Computers.objects.filter(location='Warehouse').count(), 3)
+        self.assertEqual(AssetIndex.objects.filter(location='Warehouse').count(), 3)
+
+    def test_set_department(self):
+        """Test the computer-only department action"""
+        response = self.client.post(self.changelist('computers'), {
+            'action': 'set_department', helpers.ACTION_CHECKBOX_NAME: [self.computers[0].id],
+            'apply': '1', 'department': 'Finance'
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Computers.objects.get(id=self.computers[0].id).department, 'Finance')
+
+    def test_reassign_to_computer(self):
+        """Test reassigning and unassigning monitors"""
+        monitor = monitors.objects.create(asset_tag='MON-BULK', computer=self.computers[0])
+        target = self.computers[1]
+        self.client.post(self.changelist('monitors'), {
+            'action': 'reassign_to_computer', helpers.ACTION_CHECKBOX_NAME: [monitor.id],
+            'apply': '1', 'computer': target.id
+        })
+        monitor.refresh_from_db()
+        self.assertEqual(monitor.computer, target)
+        entry = AssetHistory.objects.latest('id')
+        self.assertEqual(entry.new_values, {'computer': target.id})
+
+        self.client.post(self.changelist('monitors'), {
+            'action': 'reassign_to_computer', helpers.ACTION_CHECKBOX_NAME: [monitor.id],
+            'apply': '1', 'computer': ''
+        })
+        monitor.refresh_from_db()
+        self.assertIsNone(monitor.computer)
+
+
+class ConditionalGetTests(BaseTestCase):
+    """Tests for ETag / Last-Modified conditional GET on the REST API"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.admin_user)
+        self.computer = Computers.objects.create(asset_tag='COMP-CG')
+        self.printer = printers.objects.create(service_tag='PRN-CG')
+        self.monitor = monitors.objects.create(asset_tag='MON-CG', computer=self.computer)
+        self.dock = docking_stations.objects.create(asset_tag='DOCK-CG', computer=self.computer)
+        self.assignment = AssetAssignment.objects.create(
+            asset_type='Computer', asset_id=self.computer.id, assigned_to='Jane'
+        )
+
+    def assertListConditional(self, url, viewset, change):
+        """304 while unchanged, without queries or serialization; 200 after change"""
+        response = self.api.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+
+        with mock.patch.object(viewset, 'get_serializer', side_effect=AssertionError), \
+                self.assertNumQueries(0):
+            response = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        # Different query parameters are a different representation
+        response = self.api.get(url, {'ordering': 'id'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        change()
+        response = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def assertDetailConditional(self, url, viewset, change):
+        response = self.api.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with mock.patch.object(viewset, 'get_serializer', side_effect=AssertionError):
+            response = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        change()
+        response = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def save(self, instance, **values):
+        instance.refresh_from_db()
+        for name, value in values.items():
+            setattr(instance, name, value)
+        instance.save()
+
+    def test_computers(self):
+        self.assertListConditional(
+            '/api/computers/', api_views.ComputerViewSet,
+            lambda: Computers.objects.create(asset_tag='COMP-CG2')
+        )
+        self.assertDetailConditional(
+            f'/api/computers/{self.computer.id}/', api_views.ComputerViewSet,
+            lambda: self.save(self.computer, department='HR')
+        )
+
+    def test_computer_printer_links_invalidate_list(self):
+        """Test that M2M changes bump the computer generation"""
+        self.assertListConditional(
+            '/api/computers/', api_views.ComputerViewSet,
+            lambda: self.computer.printers.add(self.printer)
+        )
+
+    def test_printers(self):
+        self.assertListConditional(
+            '/api/printers/', api_views.PrinterViewSet,
+            lambda: self.save(self.printer, make='HP')
+        )
+        self.assertDetailConditional(
+            f'/api/printers/{self.printer.id}/', api_views.PrinterViewSet,
+            lambda: self.save(self.printer, make='Canon')
+        )
+
+    def test_monitors(self):
+        self.assertListConditional(
+            '/api/monitors/', api_views.MonitorViewSet,
+            lambda: bulk_update_assets(monitors.objects.all(), {'location': 'Lab'})
+        )
+        # The expanded computer summary is part of the detail validator
+        response = self.assertDetailConditional(
+            f'/api/monitors/{self.monitor.id}/?expand=computer', api_views.MonitorViewSet,
+            lambda: self.save(self.computer, computer_name='renamed')
+        )
+        self.assertEqual(response.data['computer_detail']['computer_name'], 'renamed')
+
+        # The extended ETag still works as an If-Match precondition
+        response = self.api.patch(
+            f'/api/monitors/{self.monitor.id}/', {'make': 'Dell'}, format='json',
+            HTTP_IF_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_docking_stations(self):
+        self.assertListConditional(
+            '/api/docking-stations/', api_views.DockingStationViewSet,
+            lambda: self.dock.delete()
+        )
+
+    def test_detail_last_modified(self):
+        """Test If-Modified-Since against updated_at"""
+        url = f'/api/printers/{self.printer.id}/'
+        last_modified = self.api.get(url)['Last-Modified']
+        response = self.api.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.api.get(url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_history(self):
+        self.assertListConditional(
+            '/api/history/', api_views.AssetHistoryViewSet,
+            lambda: self.save(self.computer, department='Ops')
+        )
+        entry = AssetHistory.objects.latest('id')
+        response = self.api.get(f'/api/history/{entry.id}/')
+        response = self.api.get(f'/api/history/{entry.id}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_assignments(self):
+        self.assertListConditional(
+            '/api/assignments/', api_views.AssetAssignmentViewSet,
+            lambda: bulk_transition('reject', [self.assignment.id])
+        )
+
+    def test_dashboard(self):
+        response = self.api.get('/api/dashboard/')
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.api.get('/api/dashboard/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        AssetAssignment.objects.create(
+            asset_type='Printer', asset_id=self.printer.id, assigned_to='John'
+        )
+        response = self.api.get('/api/dashboard/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['pending_assignments'], 2)
+
+
+class SparseFieldsetTests(BaseTestCase):
+    """Tests for ?fields= and ?expand= on the REST API"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.admin_user)
+        self.printer = printers.objects.create(service_tag='PRN-SF')
+        self.computers = []
+        for i in range(3):
+            computer = Computers.objects.create(
+                asset_tag=f'COMP-SF{i}', computer_name=f'pc-{i}', department='IT'
+            )
+            computer.printers.add(self.printer)
+            monitors.objects.create(asset_tag=f'MON-SF{i}', computer=computer)
+            self.computers.append(computer)
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(url, params)
+        sql = [
+            q['sql'] for q in queries.captured_queries
+            if not q['sql'].startswith(('SAVEPOINT', 'RELEASE'))
+        ]
+        return response, sql
+
+    def test_fields_restrict_output_and_columns(self):
+        response, sql = self.get('/api/computers/', {'fields': 'id,asset_tag,ram'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for row in response.data['results']:
+            self.assertEqual(set(row), {'id', 'asset_tag', 'ram'})
+        select = sql[-1]
+        self.assertIn('"ram"', select)
+        self.assertNotIn('"computer_name"', select)
+
+        response, _ = self.get(f'/api/computers/{self.computers[0].id}/', {'fields': 'asset_tag'})
+        self.assertEqual(response.data, {'asset_tag': 'COMP-SF0'})
+        self.assertTrue(response['ETag'])
+
+    def test_default_representation_unchanged(self):
+        response, _ = self.get('/api/computers/')
+        self.assertEqual(set(response.data['results'][0]), set(
+            ComputerListSerializer.Meta.fields
+        ))
+        response, sql = self.get(f'/api/computers/{self.computers[0].id}/')
+        self.assertEqual(response.data['printers'], [self.printer.id])
+        self.assertNotIn('monitors_detail', response.data)
+        self.assertEqual(len(sql), 2)  # row + prefetched printer ids
+
+    def test_expand_to_one(self):
+        response, sql = self.get('/api/monitors/')
+        self.assertNotIn('computer_detail', response.data['results'][0])
+        self.assertNotIn('JOIN', sql[-1])
+
+        response, sql = self.get('/api/monitors/', {'expand': 'computer', 'fields': 'asset_tag'})
+        self.assertEqual(len(sql), 2)  # count + one joined select
+        row = response.data['results'][0]
+        self.assertEqual(set(row), {'asset_tag', 'computer_detail'})
+        self.assertTrue(row['computer_detail']['asset_tag'].startswith('COMP-SF'))
+
+    def test_expand_to_many(self):
+        response, sql = self.get('/api/computers/', {'expand': 'printers,monitors'})
+        self.assertEqual(len(sql), 4)  # count, page, printers, monitors
+        row = response.data['results'][0]
+        self.assertEqual(row['printers_detail'][0]['service_tag'], 'PRN-SF')
+        self.assertEqual(len(row['monitors_detail']), 1)
+
+    def test_expanded_rows_are_part_of_validators(self):
+        url = '/api/monitors/?expand=computer'
+        etag = self.api.get(url)['ETag']
+        self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        computer = self.computers[0]
+        computer.computer_name = 'renamed'
+        computer.save()
+        response = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = {row['computer_detail']['computer_name'] for row in response.data['results']}
+        self.assertIn('renamed', names)
+
+    def test_unknown_fields_rejected(self):
+        response = self.api.get('/api/computers/', {'fields': 'asset_tag,secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.api.get('/api/printers/', {'expand': 'computer'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FastListSerializationTests(BaseTestCase):
+    """Golden tests for the values_list() list fast path"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.admin_user)
+        computer = Computers.objects.create(
+            asset_tag='COMP-FL', computer_name='pc', status='retired',
+            purchase_date=date(2023, 1, 2), purchase_cost=Decimal('999.50')
+        )
+        Computers.objects.create(service_tag='SVC-FL', department='')
+        printers.objects.create(service_tag='PRN-FL', description='Laser ünïcode')
+        monitors.objects.create(asset_tag='MON-FL', computer=computer)
+        monitors.objects.create(asset_tag='MON-FL2')
+        docking_stations.objects.create(asset_tag='DOCK-FL', computer=computer)
+        AssetHistory.objects.create(
+            asset_type='Computer', asset_id=computer.id, action='updated',
+            changed_by=self.admin_user, ip_address='10.0.0.1',
+            old_values={'status': 'active', 'nested': [1, None]}, new_values=None
+        )
+
+    def assertSameJSON(self, serializer_class, queryset):
+        plan = row_plan(serializer_class)
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        actual = JSONRenderer().render(plan.to_representation(plan.values(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_golden_list_serializers(self):
+        cases = [
+            (ComputerListSerializer, api_views.ComputerViewSet.queryset),
+            (PrinterListSerializer, api_views.PrinterViewSet.queryset),
+            (MonitorListSerializer, api_views.MonitorViewSet.queryset),
+            (DockingStationListSerializer, api_views.DockingStationViewSet.queryset),
+            (AssetHistorySerializer, api_views.AssetHistoryViewSet.queryset),
+            # Dates, datetimes and decimals go through the fields' converters
+            (PrinterSerializer, api_views.PrinterViewSet.queryset),
+        ]
+        AssetHistory.objects.create(asset_type='Printer', asset_id='1', action='created')
+        for serializer_class, queryset in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertSameJSON(serializer_class, queryset.order_by('pk'))
+
+    def test_api_list_uses_fast_path(self):
+        with mock.patch.object(AssetHistorySerializer, 'to_representation', side_effect=AssertionError):
+            response = self.api.get('/api/history/', {'page_size': 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = AssetHistorySerializer(AssetHistory.objects.order_by('-changed_at'), many=True).data
+        self.assertEqual(response.json()['results'], json.loads(json.dumps(expected)))
+
+        # Sparse and expanded lists still go through the serializer
+        response = self.api.get('/api/monitors/', {'expand': 'computer'})
+        self.assertIn('computer_detail', response.data['results'][0])
+
+    def test_unsupported_fields_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            RowPlan(ComputerSerializer)  # printers is a many-to-many field
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_list_serialization', '--repeat', '1', stdout=out)
+        self.assertRegex(out.getvalue(), r'history: \d+ rows, serializer [\d.]+ ms, fast path')
+
+
+class FastJSONTests(BaseTestCase):
+    """Tests for the orjson-backed API renderer and parser"""
+
+    def sample(self):
+        return {
+            'utc': datetime(2024, 5, 1, 12, 30, 5, 123456, tzinfo=dt_timezone.utc),
+            'offset': datetime(2024, 5, 1, 12, 30, tzinfo=timezone.get_fixed_timezone(120)),
+            'naive': datetime(2024, 5, 1, 12, 30),
+            'day': date(2024, 5, 1),
+            'cost': Decimal('999.50'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Computer'),
+            'text': 'Laser ünïcode \u2028 line',
+            'blob': {'old': [1, None, True, 2.5], 3: 'int key'},
+        }
+
+    def test_matches_drf_renderer(self):
+        data = self.sample()
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_indent_and_fallback_use_stdlib(self):
+        data = {'cost': Decimal('1.5')}
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2')
+        )
+        big = {'n': 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(big), JSONRenderer().render(big))
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.sample()), JSONRenderer().render(self.sample()))
+        with override_settings(API_JSON_BACKEND='json'), \
+                mock.patch.object(renderers.orjson, 'dumps', side_effect=AssertionError):
+            FastJSONRenderer().render(self.sample())
+
+    def test_parser(self):
+        body = JSONRenderer().render({'asset_tag': 'ünï', 'cost': 1.5, 'tags': [1, None]})
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body)),
+            {'asset_tag': 'ünï', 'cost': 1.5, 'tags': [1, None]}
+        )
+        latin = '{"make": "caf\xe9"}'.encode('latin-1')
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(latin), parser_context={'encoding': 'latin-1'}),
+            {'make': 'caf\xe9'}
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"make": NaN}'))
+
+    def test_api_round_trip(self):
+        api = APIClient()
+        api.force_authenticate(user=self.admin_user)
+        response = api.post(
+            '/api/printers/', {'service_tag': 'PRN-JSON', 'purchase_cost': '120.25'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['purchase_cost'], '120.25')
+
+        response = api.post('/api/printers/', b'{bad', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        AssetHistory.objects.create(
+            asset_type='Printer', asset_id='1', action='updated', old_values={'a': [1, 2]}
+        )
+        response = api.get('/api/history/', {'page_size': 100})
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_benchmark_command(self):
+        AssetHistory.objects.create(asset_type='Printer', asset_id='1', action='created')
+        out = StringIO()
+        call_command('benchmark_json_renderer', '--repeat', '1', stdout=out)
+        self.assertRegex(out.getvalue(), r'history render: \d+ rows, \d+ bytes, json [\d.]+ ms, orjson')
+        self.assertIn('history parse:', out.getvalue())
+
+
+class StreamEndpointTests(BaseTestCase):
+    """Tests for the NDJSON /api/<type>/stream/ endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.admin_user)
+        for i in range(7):
+            Computers.objects.create(
+                asset_tag=f'COMP-ST{i}', department='IT' if i % 2 else 'HR', computer_name=f'pc-{i}'
+            )
+
+    def stream(self, url, params=None, **extra):
+        response = self.api.get(url, params, **extra)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        body = b''.join(response.streaming_content)
+        self.assertTrue(body.endswith(b'\n'))
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_matches_list_representation(self):
+        rows = self.stream('/api/computers/stream/')
+        listed = self.api.get('/api/computers/', {'page_size': 100}).json()['results']
+        self.assertEqual(rows, listed)
+
+        rows = self.stream('/api/history/stream/')
+        self.assertEqual(rows, self.api.get('/api/history/', {'page_size': 100}).json()['results'])
+
+    def test_filters_search_and_ordering(self):
+        params = {'department': 'IT', 'ordering': 'asset_tag'}
+        rows = self.stream('/api/computers/stream/', params)
+        self.assertEqual([row['asset_tag'] for row in rows], ['COMP-ST1', 'COMP-ST3', 'COMP-ST5'])
+        rows = self.stream('/api/computers/stream/', {'search': 'pc-6'})
+        self.assertEqual([row['asset_tag'] for row in rows], ['COMP-ST6'])
+
+    def test_chunked_without_count(self):
+        with mock.patch.object(api_views.ComputerViewSet, 'stream_chunk_size', 3):
+            response = self.api.get('/api/computers/stream/', {'ordering': 'asset_tag'})
+            with CaptureQueriesContext(connection) as queries:
+                chunks = list(response.streaming_content)
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [3, 3, 1])
+        self.assertFalse(any('COUNT(' in q['sql'] for q in queries.captured_queries))
+
+    def test_conditional_and_auth(self):
+        etag = self.api.get('/api/computers/stream/')['ETag']
+        response = self.api.get('/api/computers/stream/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = APIClient().get('/api/computers/stream/', HTTP_ACCEPT='application/x-ndjson')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+        self.assertEqual(len(response.content.splitlines()), 1)
+        self.assertIn('detail', json.loads(response.content))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_stream', '--endpoint', 'computers', stdout=out)
+        self.assertRegex(out.getvalue(), r'computers: 7 rows, [\d.]+ KiB in [\d.]+ ms \([\d,]+ rows/s\)')
+
+
+class AssetLookupTests(BaseTestCase):
+    """Tests for the /api/assets/lookup/ multi-get endpoint"""
+
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.admin_user)
+        self.computer = Computers.objects.create(asset_tag='TAG-1', service_tag='SVC-C')
+        self.printer = printers.objects.create(service_tag='SVC-P')
+        self.monitor = monitors.objects.create(asset_tag='TAG-2', service_tag='SHARED')
+        self.dock = docking_stations.objects.create(asset_tag='TAG-3', service_tag='SHARED')
+
+    def test_get_by_id_and_tags(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get('/api/assets/lookup/', {
+                'ids': f'TAG-1,SVC-P,{self.monitor.id},SHARED,NOPE'
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        selects = [q for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 4)  # one IN query per asset table
+
+        results = response.data['results']
+        self.assertEqual(list(results), ['TAG-1', 'SVC-P', self.monitor.id, 'SHARED', 'NOPE'])
+        self.assertEqual(results['TAG-1'][0]['asset_type'], 'computer')
+        self.assertEqual(results['TAG-1'][0]['matched_on'], 'asset_tag')
+        self.assertEqual(results['TAG-1'][0]['asset']['id'], self.computer.id)
+        self.assertEqual(results['SVC-P'][0]['asset']['id'], self.printer.id)
+        self.assertEqual(results[self.monitor.id][0]['matched_on'], 'id')
+        self.assertEqual(
+            {match['asset_type'] for match in results['SHARED']}, {'monitor', 'docking_station'}
+        )
+        self.assertEqual(response.data['missing'], ['NOPE'])
+
+    def test_post_body(self):
+        response = self.api.post(
+            '/api/assets/lookup/', {'ids': ['TAG-3', ' TAG-3 ', 'SVC-C']}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results']), ['TAG-3', 'SVC-C'])
+        self.assertEqual(response.data['results']['TAG-3'][0]['asset']['asset_tag'], 'TAG-3')
+        self.assertEqual(response.data['missing'], [])
+
+    def test_invalid_requests(self):
+        response = self.api.get('/api/assets/lookup/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.api.post('/api/assets/lookup/', {'ids': 'TAG-1'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        ids = [f'T{i}' for i in range(api_views.AssetLookupViewSet.max_identifiers + 1)]
+        response = self.api.post('/api/assets/lookup/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = APIClient().get('/api/assets/lookup/', {'ids': 'TAG-1'})
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+
+class TopologyTests(BaseTestCase):
+    """Tests for computers with peripherals (topology.with_peripherals)"""
+
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.admin_user)
+        self.client.login(username='admin', password='adminpass123')
+        self.add_computers(3)
+
+    def add_computers(self, count):
+        for _ in range(count):
+            computer = Computers.objects.create(notes='n' * 2000)
+            computer.printers.add(printers.objects.create(service_tag=uuid.uuid4().hex, notes='p' * 2000))
+            monitors.objects.create(computer=computer, make='Dell', notes='m' * 2000)
+            docking_stations.objects.create(computer=computer, notes='d' * 2000)
+
+    def count_queries(self, fetch):
+        with CaptureQueriesContext(connection) as queries:
+            fetch()
+        return len(queries)
+
+    def bytes_fetched(self, queryset):
+        """Size of the values every SELECT run while evaluating queryset returns"""
+        statements = []
+
+        def capture(execute, sql, params, many, context):
+            if sql.startswith('SELECT'):
+                statements.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capture):
+            list(queryset)
+        total = 0
+        with connection.cursor() as cursor:
+            for sql, params in statements:
+                cursor.execute(sql, params)
+                total += sum(len(str(value)) for row in cursor.fetchall() for value in row)
+        return total
+
+    def test_api_shape(self):
+        computer = Computers.objects.order_by('pk').first()
+        response = self.api.get('/api/computers/topology/', {'ordering': 'created_at'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        item = response.data['results'][0]
+        self.assertEqual(item['id'], computer.id)
+        self.assertEqual(item['printers'], [{
+            'id': computer.printers.get().id, 'asset_tag': None,
+            'service_tag': computer.printers.get().service_tag, 'status': 'active',
+        }])
+        self.assertEqual(item['monitors'][0]['id'], computer.monitors.get().id)
+        self.assertEqual(item['docking_stations'][0]['id'], computer.docking_stations.get().id)
+        self.assertNotIn('notes', item)
+
+        response = self.api.get(
+            '/api/computers/topology/', {'ordering': 'created_at'}, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_api_query_count_is_constant(self):
+        fetch = lambda: self.api.get('/api/computers/topology/')
+        before = self.count_queries(fetch)
+        self.add_computers(5)
+        self.assertEqual(self.count_queries(fetch), before)
+
+    def test_list_pages_query_count_is_constant(self):
+        for url in (reverse('home'), reverse('computer_list')):
+            fetch = lambda: self.assertEqual(self.client.get(url).status_code, 200)
+            before = self.count_queries(fetch)
+            self.add_computers(2)
+            self.assertEqual(self.count_queries(fetch), before, url)
+
+    def test_peripherals_skip_unused_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(with_peripherals(Computers.objects.only('id')))
+        self.assertEqual(len(queries), 4)
+        for query in queries.captured_queries[1:]:
+            self.assertNotIn('"notes"', query['sql'])
+
+        full = Computers.objects.only('id').prefetch_related('printers', 'monitors', 'docking_stations')
+        narrow = with_peripherals(Computers.objects.only('id'))
+        self.assertLess(self.bytes_fetched(narrow) * 10, self.bytes_fetched(full))
+
+
+class ListPageColumnTests(BaseTestCase):
+    """The HTML list pages fetch only the columns their templates display"""
+
+    PAGES = ('home', 'computer_list', 'printers_list', 'monitors_list', 'dockingstation_list')
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='admin', password='adminpass123')
+        self.add_assets(2)
+
+    def add_assets(self, count):
+        for _ in range(count):
+            computer = Computers.objects.create(make='Dell', cpu='i7', notes='n' * 2000)
+            computer.printers.add(printers.objects.create(
+                service_tag=uuid.uuid4().hex, description='Laser', notes='p' * 2000
+            ))
+            monitors.objects.create(computer=computer, make='Dell', notes='m' * 2000)
+            docking_stations.objects.create(computer=computer, make='HP', notes='d' * 2000)
+
+    def get_page(self, name):
+        """Render a page, failing if the template touches a deferred field"""
+        refresh_from_db = Model.refresh_from_db
+        with mock.patch.object(Model, 'refresh_from_db', autospec=True, side_effect=refresh_from_db) as refresh, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        loaded = [(type(call.args[0]).__name__, call.kwargs.get('fields')) for call in refresh.call_args_list]
+        self.assertEqual(loaded, [], f'{name} loaded deferred fields')
+        return queries
+
+    def test_templates_use_fetched_columns_only(self):
+        for name in self.PAGES:
+            queries = self.get_page(name)
+            for query in queries.captured_queries:
+                self.assertNotIn('"notes"', query['sql'], name)
+
+    def test_query_count_is_constant(self):
+        before = {name: len(self.get_page(name)) for name in self.PAGES}
+        self.add_assets(3)
+        self.assertEqual({name: len(self.get_page(name)) for name in self.PAGES}, before)
+
+    def test_rows_are_rendered(self):
+        monitor = monitors.objects.select_related('computer').first()
+        response = self.client.get(reverse('monitors_list'))
+        self.assertContains(response, monitor.asset_tag)
+        self.assertContains(response, str(monitor.computer))
+
+
+class CompressionMiddlewareTests(BaseTestCase):
+    """Tests for gzip/Brotli compression of dynamic responses"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.force_login(self.admin_user)
+        for i in range(10):
+            Computers.objects.create(asset_tag=f'COMP-GZ{i}', computer_name=f'branch-pc-{i}')
+
+    def compress(self, response, accept='gzip, deflate'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        return middleware.CompressionMiddleware(lambda request: response)(request)
+
+    def test_api_json_gzip(self):
+        plain = self.client.get('/api/computers/')
+        response = self.client.get('/api/computers/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], plain['ETag'])  # list ETags are already weak
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content))
+
+    def test_tag_filter_revalidates_with_weakened_etag(self):
+        url = reverse('download_tag_filter', args=['computers'])
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+        response = self.client.get(
+            url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_html_page(self):
+        response = self.client.get(reverse('computer_list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'branch-pc-1', gzip.decompress(response.content))
+
+    def test_passthrough(self):
+        body = b'x' * 1000
+        # Not accepted
+        self.assertFalse(self.compress(HttpResponse(body), accept='gzip;q=0, identity').has_header('Content-Encoding'))
+        self.assertFalse(self.compress(HttpResponse(body), accept='').has_header('Content-Encoding'))
+        # Below the threshold
+        with override_settings(COMPRESSION_MIN_SIZE=2000):
+            self.assertFalse(self.compress(HttpResponse(body)).has_header('Content-Encoding'))
+        # Already-compressed images and encoded bodies
+        png = self.compress(HttpResponse(body, content_type='image/png'))
+        self.assertFalse(png.has_header('Content-Encoding'))
+        self.assertNotIn('Vary', png)
+        encoded = HttpResponse(body)
+        encoded['Content-Encoding'] = 'gzip'
+        self.assertEqual(self.compress(encoded).content, body)
+
+    def test_streaming(self):
+        rows = [f'COMP-{i},branch-pc-{i},IT\n'.encode() for i in range(500)]
+        response = StreamingHttpResponse(iter(rows), content_type='text/csv')
+        response = self.compress(response, accept='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(rows))
+
+    @unittest.skipUnless(middleware.brotli, 'Brotli is not installed')
+    def test_brotli_preferred(self):
+        body = b'{"asset_tag": "COMP-BR"}' * 100
+        response = self.compress(HttpResponse(body, content_type='application/json'), accept='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(middleware.brotli.decompress(response.content), body)
+
+        rows = [b'row,%d\n' % i for i in range(500)]
+        response = self.compress(StreamingHttpResponse(iter(rows), content_type='text/csv'), accept='br')
+        self.assertEqual(middleware.brotli.decompress(b''.join(response.streaming_content)), b''.join(rows))
+
+    def test_weak_etag_still_matches_if_match(self):
+        computer = Computers.objects.get(asset_tag='COMP-GZ0')
+        api = APIClient()
+        api.force_authenticate(user=self.admin_user)
+        response = api.get(f'/api/computers/{computer.id}/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].startswith('W/"computers-'))
+
+        response = api.patch(
+            f'/api/computers/{computer.id}/', {'ram': '32GB'}, format='json',
+            HTTP_IF_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ResponseCacheTests(BaseTestCase):
+    """Tests for the read-through API response cache"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.admin_user)
+        Computers.objects.create(asset_tag='COMP-RC1', department='IT')
+        Computers.objects.create(asset_tag='COMP-RC2', department='IT')
+
+    def test_dashboard_served_from_cache(self):
+        first = self.api.get('/api/dashboard/')
+        with self.assertNumQueries(0):
+            second = self.api.get('/api/dashboard/')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        metrics = response_cache.cache_metrics('dashboard-list')
+        self.assertEqual((metrics['hits'], metrics['misses']), (1, 1))
+        self.assertEqual(metrics['hit_rate'], 0.5)
+
+    def test_invalidated_by_signals(self):
+        response = self.api.get('/api/computers/by_department/')
+        self.assertEqual(response.data, [{'department': 'IT', 'count': 2}])
+
+        Computers.objects.create(asset_tag='COMP-RC3', department='IT')
+        response = self.api.get('/api/computers/by_department/')
+        self.assertEqual(response.data, [{'department': 'IT', 'count': 3}])
+
+        Computers.objects.filter(asset_tag='COMP-RC3').delete()
+        response = self.api.get('/api/computers/by_department/')
+        self.assertEqual(response.data, [{'department': 'IT', 'count': 2}])
+        self.assertEqual(response_cache.cache_metrics('computer-by-department')['hits'], 0)
+
+    def test_first_list_page_only(self):
+        self.api.get('/api/computers/')
+        self.api.get('/api/computers/', {'page': 1})
+        with self.assertNumQueries(0):
+            response = self.api.get('/api/computers/')
+        self.assertEqual(response.data['count'], 2)
+
+        self.api.get('/api/computers/', {'page': 2})
+        metrics = response_cache.cache_metrics('computer-list')
+        self.assertEqual((metrics['hits'], metrics['misses']), (1, 2))
+
+    def test_keyed_on_permission_scope_and_params(self):
+        self.api.get('/api/computers/')
+        self.api.get('/api/computers/', {'ordering': 'asset_tag'})
+        self.api.force_authenticate(user=self.regular_user)
+        self.api.get('/api/computers/')
+        self.assertEqual(response_cache.cache_metrics('computer-list')['misses'], 3)
+
+    @override_settings(API_RESPONSE_CACHE_DISABLED=['dashboard-list'])
+    def test_disabled_endpoint(self):
+        self.api.get('/api/dashboard/')
+        with CaptureQueriesContext(connection) as queries:
+            self.api.get('/api/dashboard/')
+        self.assertTrue(queries.captured_queries)
+        metrics = response_cache.cache_metrics('dashboard-list')
+        self.assertFalse(metrics['enabled'])
+        self.assertEqual((metrics['hits'], metrics['misses']), (0, 0))
+
+    def test_metrics_view(self):
+        self.api.get('/api/dashboard/')
+        self.client.force_login(self.admin_user)
+        response = self.client.get(reverse('response_cache_metrics'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(set(data), set(response_cache.CACHED_ENDPOINTS))
+        self.assertEqual(data['dashboard-list']['misses'], 1)
+
+
 class FormTests(BaseTestCase):
     """Tests for Django forms"""
 
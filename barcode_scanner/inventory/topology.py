@@ -0,0 +1,45 @@
+"""
+Computers with their peripherals.
+
+The computer lists and the topology API only show a few columns of each
+attached printer, monitor and docking station. with_peripherals prefetches
+them with Prefetch(queryset=...only(...), to_attr=...) so the peripheral
+queries read just those columns instead of whole rows (notes included).
+"""
+from django.db.models import Prefetch
+
+from .models import Computers, printers, monitors, docking_stations
+
+# Relation -> (model, columns read, attribute holding the list)
+PERIPHERALS = {
+    'printers': (
+        printers, ('id', 'service_tag', 'description', 'status'), 'peripheral_printers'
+    ),
+    'monitors': (
+        # computer is the key the prefetch groups rows by; make is in __str__
+        monitors, ('id', 'asset_tag', 'service_tag', 'make', 'status', 'computer'),
+        'peripheral_monitors'
+    ),
+    'docking_stations': (
+        docking_stations, ('id', 'asset_tag', 'service_tag', 'make', 'status', 'computer'),
+        'peripheral_docking_stations'
+    ),
+}
+
+# Tables a topology is built from, for validators and cache keys
+TOPOLOGY_MODELS = (Computers, printers, monitors, docking_stations)
+
+
+def with_peripherals(queryset):
+    """
+    Prefetch each computer's peripherals into lists on peripheral_printers,
+    peripheral_monitors and peripheral_docking_stations, one query each.
+    """
+    return queryset.prefetch_related(*(
+        Prefetch(
+            relation,
+            queryset=model.objects.only(*columns).order_by('pk'),
+            to_attr=to_attr,
+        )
+        for relation, (model, columns, to_attr) in PERIPHERALS.items()
+    ))
@@ -16,6 +16,16 @@ urlpatterns = [
     path('computer/<str:pk>/', views.computers_form, name='computers_form'),
     path('delete_computer/<str:id>/', views.delete_computer, name='delete_pc'),
     path('add-computer/', views.add_computer, name='add_computer'),
+    path('scan-edit/<str:token>/', views.scan_edit, name='scan_edit'),
+    path('scan-lookup/', views.lookup_any_tag, name='lookup_any_tag'),
+    path('autocomplete/<str:asset_type>/', views.asset_autocomplete, name='asset_autocomplete'),
+
+    # ==================== Known-Tag Filters ====================
+    path('tag-filter/metrics/', views.tag_filter_metrics, name='tag_filter_metrics'),
+    path('tag-filter/<str:asset_type>/', views.download_tag_filter, name='download_tag_filter'),
+
+    # ==================== API Response Cache ====================
+    path('api-cache/metrics/', views.response_cache_metrics, name='response_cache_metrics'),
 
     # ==================== Docking Stations ====================
     path('dockingstation-form/<str:barcode>/', views.dockingstation_form, name='dockingstation_form'),
@@ -64,4 +74,5 @@ urlpatterns = [
     path('assignments/<int:assignment_id>/reject/', views.reject_assignment, name='reject_assignment'),
     path('assignments/<int:assignment_id>/checkout/', views.checkout_assignment, name='checkout_assignment'),
     path('assignments/<int:assignment_id>/return/', views.return_assignment, name='return_assignment'),
+    path('assignments/bulk/', views.bulk_assignment_action, name='bulk_assignment_action'),
 ]
@@ -10,10 +10,12 @@ from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.admin.views.decorators import user_passes_test
+from django.core import signing
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db import transaction
 from django.db.models import Q, Count
 from django.db.models.functions import TruncMonth
-from django.db import IntegrityError, transaction
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,9 +23,17 @@ from django.utils import timezone
 
 from .models import (
     Computers, printers, docking_stations, monitors,
-    AssetHistory, AssetAssignment, AssetStatus
+    AssetHistory, AssetAssignment, AssetStatus, ConcurrentUpdateError
 )
 from .forms import computersForm, printersForm, docking_stationsForm, monitorsForm
+from .scanning import (
+    save_scan, scan_form_payload, scan_edit_form,
+    load_form_token, apply_scan_edit
+)
+from .assignments import TRANSITIONS, bulk_transition, check_assignable, save_transition
+from .concurrency import etag_for, not_modified, precondition_failed
+from .topology import with_peripherals
+from . import asset_index, outbox, overdue, response_cache, tag_filter
 
 
 # ==================== Permission Helpers ====================
@@ -119,6 +129,175 @@ def apply_search_filters(queryset, request, search_fields):
     return queryset
 
 
+# ==================== List Page Columns ====================
+
+# Columns the list pages display, including those the rows' __str__ reads.
+# The pages fetch only these, so notes and other unused columns are not read.
+COMPUTER_LIST_COLUMNS = (
+    'id', 'asset_tag', 'service_tag', 'computer_name', 'department', 'user',
+    'make', 'model', 'cpu', 'ram', 'storage'
+)
+PRINTER_LIST_COLUMNS = ('id', 'service_tag', 'make', 'description')
+# computer__* label the linked computer
+MONITOR_LIST_COLUMNS = (
+    'id', 'asset_tag', 'service_tag', 'make', 'computer', 'computer__asset_tag', 'computer__make'
+)
+DOCKING_STATION_LIST_COLUMNS = MONITOR_LIST_COLUMNS
+
+
+# ==================== Edit Conflict Helpers ====================
+
+CONFLICT_MESSAGE = (
+    'This record was changed by someone else while you were editing. '
+    'Review the current values and save again.'
+)
+
+
+def save_edit_form(request, form):
+    """
+    Save a versioned edit form. Returns False, after flashing an error,
+    when someone else saved the row since the form was rendered.
+    """
+    try:
+        with transaction.atomic():
+            form.save()
+    except ConcurrentUpdateError:
+        messages.error(request, CONFLICT_MESSAGE)
+        return False
+    return True
+
+
+# ==================== Scan Helpers ====================
+
+def scan_result(request, model, barcode_data, instance, created):
+    """Build the JSON payload for a saved scan"""
+    if created:
+        result = {
+            'status': 'success',
+            'message': 'Barcode saved successfully',
+            'new_item': True
+        }
+    else:
+        result = {
+            'status': 'success',
+            'message': 'Barcode already exists',
+            'existing_item': True
+        }
+
+    # Scan-to-edit: return the current field values so the scanner page
+    # can open an inline editor without a redirect and second lookup
+    if request.POST.get('include_form'):
+        result['asset'] = scan_form_payload(model, barcode_data, instance)
+    return result
+
+
+@user_passes_test(is_admin, login_url='/admin/login/')
+def lookup_any_tag(request):
+    """Find assets of any type by asset tag or service tag (one indexed query)"""
+    tag = request.GET.get('tag', '').strip()
+    if not tag:
+        return JsonResponse({'status': 'error', 'message': 'No tag received'}, status=400)
+
+    matches = [
+        {
+            'asset_type': entry.asset_type,
+            'asset_type_display': entry.get_asset_type_display(),
+            'asset_id': entry.asset_id,
+            'asset_tag': entry.asset_tag,
+            'service_tag': entry.service_tag,
+            'status': entry.status,
+            'location': entry.location,
+        }
+        for entry in asset_index.lookup_tag(tag)
+    ]
+    return JsonResponse({'status': 'success', 'tag': tag, 'matches': matches})
+
+
+AUTOCOMPLETE_LIMIT = 20
+AUTOCOMPLETE_MAX_LIMIT = 100
+
+
+@user_passes_test(is_admin, login_url='/admin/login/')
+def asset_autocomplete(request, asset_type):
+    """Prefix search over one asset type for the on-demand choice widgets"""
+    code = asset_index.asset_type_code(asset_type)
+    if code is None:
+        return JsonResponse({'status': 'error', 'message': 'Unknown asset type'}, status=404)
+
+    try:
+        limit = int(request.GET.get('limit', AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+    limit = min(max(limit, 1), AUTOCOMPLETE_MAX_LIMIT)
+
+    # Fetch one extra row to tell the client whether more matches exist
+    entries = list(asset_index.search(
+        code, request.GET.get('q', '').strip(),
+        status=request.GET.get('status') or None, limit=limit + 1
+    ))
+    return JsonResponse({
+        'results': [
+            {'id': entry.asset_id, 'text': asset_index.entry_label(entry)}
+            for entry in entries[:limit]
+        ],
+        'more': len(entries) > limit,
+    })
+
+
+# ==================== Known-Tag Filter Views ====================
+
+@user_passes_test(is_admin, login_url='/admin/login/')
+def download_tag_filter(request, asset_type):
+    """
+    Download the known-tag Bloom filter for offline scan feedback.
+    With ?tag=..., answer for a single tag instead (no database query).
+    """
+    model = tag_filter.FILTER_ASSET_TYPES.get(asset_type)
+    if model is None:
+        return JsonResponse({'error': 'Invalid asset type'}, status=400)
+
+    version, known_tags = tag_filter.get_filter(model)
+
+    tag = request.GET.get('tag', '').strip()
+    if tag:
+        return JsonResponse({
+            'asset_type': asset_type,
+            'tag': tag,
+            'probably_existing': tag in known_tags,
+        })
+
+    # Weak comparison: CompressionMiddleware weakens the ETag of encoded responses
+    etag = f'"{version}"'
+    response = not_modified(request, etag)
+    if response is None:
+        response = JsonResponse({
+            'asset_type': asset_type,
+            'version': version,
+            'hash': 'blake2b-128 double hashing, positions (h1 + i * (h2 | 1)) % num_bits',
+            **known_tags.to_dict(),
+        })
+    response['ETag'] = etag
+    return response
+
+
+@user_passes_test(is_admin, login_url='/admin/login/')
+def tag_filter_metrics(request):
+    """Prediction counts and false-positive rates for each known-tag filter"""
+    return JsonResponse({
+        asset_type: tag_filter.filter_metrics(model)
+        for asset_type, model in tag_filter.FILTER_ASSET_TYPES.items()
+    })
+
+
+@user_passes_test(is_admin, login_url='/admin/login/')
+def response_cache_metrics(request):
+    """Hit/miss counts of the API response cache for each cached endpoint"""
+    return JsonResponse({
+        endpoint: response_cache.cache_metrics(endpoint)
+        for endpoint in response_cache.CACHED_ENDPOINTS
+    })
+
+
 # ==================== Dashboard View ====================
 
 @user_passes_test(is_admin, login_url='/admin/login/')
@@ -179,6 +358,7 @@ def dashboard(request):
 
     # Pending assignments
     pending_assignments = AssetAssignment.objects.filter(status='pending').count()
+    overdue_assignments = overdue.overdue_count()
 
     context = {
         'computer_count': computer_count,
@@ -193,6 +373,7 @@ def dashboard(request):
         'recent_computers': recent_computers,
         'recent_monitors': recent_monitors,
         'pending_assignments': pending_assignments,
+        'overdue_assignments': overdue_assignments,
     }
 
     return render(request, 'dashboard.html', context)
@@ -203,10 +384,8 @@ def dashboard(request):
 @user_passes_test(is_admin, login_url='/admin/login/')
 def home(request):
     """Home page with optimized computer list"""
-    # Optimized query with select_related and prefetch_related
-    computer_items = Computers.objects.select_related().prefetch_related(
-        'printers', 'monitors', 'docking_stations'
-    ).all()
+    # Computers and their peripherals are fetched with only the columns the cards show
+    computer_items = with_peripherals(Computers.objects.only(*COMPUTER_LIST_COLUMNS))
 
     # Apply search filters
     search_fields = ['asset_tag', 'service_tag', 'computer_name', 'user', 'make', 'model', 'department']
@@ -240,7 +419,8 @@ def home(request):
 @user_passes_test(is_admin, login_url='/admin/login/')
 def index(request):
     """Barcode scanning page for computers"""
-    return render(request, 'index.html')
+    edit_form = scan_edit_form(Computers)()
+    return render(request, 'index.html', {'edit_form': edit_form})
 
 
 @user_passes_test(is_admin, login_url='/admin/login/')
@@ -250,32 +430,8 @@ def save_barcode(request):
         barcode_data = request.POST.get('barcode_data', None)
         if barcode_data:
             try:
-                with transaction.atomic():
-                    computer, created = Computers.objects.get_or_create(asset_tag=barcode_data)
-                if created:
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode saved successfully',
-                        'new_item': True
-                    })
-                else:
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode already exists',
-                        'existing_item': True
-                    })
-            except IntegrityError as e:
-                logger.error(f"IntegrityError saving barcode {barcode_data}: {e}")
-                # Try to fetch existing record if it was created by a race condition
-                try:
-                    computer = Computers.objects.get(asset_tag=barcode_data)
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode already exists',
-                        'existing_item': True
-                    })
-                except Computers.DoesNotExist:
-                    return JsonResponse({'status': 'error', 'message': 'Database error saving barcode'}, status=500)
+                computer, created = save_scan(Computers, barcode_data)
+                return JsonResponse(scan_result(request, Computers, barcode_data, computer, created))
             except Exception as e:
                 logger.error(f"Error saving barcode {barcode_data}: {e}")
                 return JsonResponse({'status': 'error', 'message': 'Error processing barcode'}, status=500)
@@ -284,6 +440,45 @@ def save_barcode(request):
     return JsonResponse({'status': 'error', 'message': 'Invalid request'})
 
 
+@user_passes_test(is_admin, login_url='/admin/login/')
+def scan_edit(request, token):
+    """Save the changed fields from the inline scan editor (partial PATCH)"""
+    if request.method != 'PATCH':
+        return JsonResponse({'status': 'error', 'message': 'Invalid request'}, status=405)
+
+    try:
+        model, pk = load_form_token(token)
+    except signing.BadSignature:
+        return JsonResponse({'status': 'error', 'message': 'Invalid or expired form token'}, status=400)
+
+    try:
+        changes = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid JSON body'}, status=400)
+    if not isinstance(changes, dict):
+        return JsonResponse({'status': 'error', 'message': 'Invalid JSON body'}, status=400)
+
+    instance = get_object_or_404(model, pk=pk)
+    if precondition_failed(request, instance):
+        return JsonResponse({'status': 'error', 'message': CONFLICT_MESSAGE}, status=412)
+
+    try:
+        with transaction.atomic():
+            updated_fields, errors = apply_scan_edit(instance, changes)
+    except ConcurrentUpdateError:
+        return JsonResponse({'status': 'error', 'message': CONFLICT_MESSAGE}, status=409)
+    if errors:
+        return JsonResponse({'status': 'error', 'errors': errors}, status=400)
+
+    response = JsonResponse({
+        'status': 'success',
+        'message': f'{model._meta.verbose_name} data has been saved.',
+        'updated_fields': updated_fields,
+    })
+    response['ETag'] = etag_for(instance)
+    return response
+
+
 @user_passes_test(is_admin, login_url='/admin/login/')
 def computer_form(request, barcode):
     """Computer form from barcode scan"""
@@ -293,9 +488,12 @@ def computer_form(request, barcode):
     if request.method == 'POST':
         form = computersForm(request.POST, instance=computer)
         if form.is_valid():
-            form.save()
-            messages.success(request, "Computer data has been saved.")
-            return redirect('computer_list')
+            if save_edit_form(request, form):
+                messages.success(request, "Computer data has been saved.")
+                return redirect('computer_list')
+            computer.refresh_from_db()
+            form = computersForm(instance=computer)
+            return render(request, 'computer_form.html', {'form': form, 'url': url, 'pc': computer}, status=409)
         else:
             messages.error(request, "Error saving computer data.")
     else:
@@ -313,9 +511,12 @@ def computers_form(request, pk):
     if request.method == 'POST':
         form = computersForm(request.POST, instance=computer)
         if form.is_valid():
-            form.save()
-            messages.success(request, "Computer data has been updated.")
-            return redirect('computer_list')
+            if save_edit_form(request, form):
+                messages.success(request, "Computer data has been updated.")
+                return redirect('computer_list')
+            computer.refresh_from_db()
+            form = computersForm(instance=computer)
+            return render(request, 'computer_form.html', {'form': form, 'pc': computer}, status=409)
 
     return render(request, 'computer_form.html', {'form': form, 'pc': computer})
 
@@ -350,9 +551,7 @@ def add_computer(request):
 @user_passes_test(is_admin, login_url='/admin/login/')
 def computer_list(request):
     """List all computers with pagination and search"""
-    computer_items = Computers.objects.select_related().prefetch_related(
-        'printers', 'monitors', 'docking_stations'
-    ).all()
+    computer_items = with_peripherals(Computers.objects.only(*COMPUTER_LIST_COLUMNS))
 
     # Apply search filters
     search_fields = ['asset_tag', 'service_tag', 'computer_name', 'user', 'make', 'model', 'department']
@@ -382,9 +581,12 @@ def update_printer_view(request, pk):
     if request.method == 'POST':
         printerform = printersForm(request.POST, instance=printer)
         if printerform.is_valid():
-            printerform.save()
-            messages.success(request, 'Printer data has been updated.')
-            return redirect('printers_list')
+            if save_edit_form(request, printerform):
+                messages.success(request, 'Printer data has been updated.')
+                return redirect('printers_list')
+            printer.refresh_from_db()
+            mydict['form'] = printersForm(instance=printer)
+            return render(request, 'printersform.html', context=mydict, status=409)
         else:
             messages.error(request, 'Error while updating printer data.')
             return redirect('printers_list')
@@ -422,7 +624,7 @@ def add_printer(request):
 @user_passes_test(is_admin, login_url='/admin/login/')
 def printer_list(request):
     """List all printers with pagination and search"""
-    printer_items = printers.objects.all()
+    printer_items = printers.objects.only(*PRINTER_LIST_COLUMNS)
 
     # Apply search filters
     search_fields = ['service_tag', 'make', 'description']
@@ -452,10 +654,16 @@ def update_monitor_view(request, pk):
     if request.method == 'POST':
         monitorform = monitorsForm(request.POST, instance=monitor)
         if monitorform.is_valid():
-            monitorform.save()
-            messages.success(request, 'Monitor data has been updated.')
+            if save_edit_form(request, monitorform):
+                messages.success(request, 'Monitor data has been updated.')
+            else:
+                monitor.refresh_from_db()
+                mydict['form'] = monitorsForm(instance=monitor)
+                return render(request, 'monitors_form.html', context=mydict, status=409)
         else:
             messages.error(request, 'Error updating monitor.')
+        # Re-render with the saved version so the next submit is not stale
+        mydict['form'] = monitorsForm(instance=monitor)
 
     return render(request, 'monitors_form.html', context=mydict)
 
@@ -473,32 +681,8 @@ def save_barcode_monitor(request):
         barcode_data = request.POST.get('barcode_data', None)
         if barcode_data:
             try:
-                with transaction.atomic():
-                    monitor, created = monitors.objects.get_or_create(asset_tag=barcode_data)
-                if created:
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode saved successfully',
-                        'new_item': True
-                    })
-                else:
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode already exists',
-                        'existing_item': True
-                    })
-            except IntegrityError as e:
-                logger.error(f"IntegrityError saving monitor barcode {barcode_data}: {e}")
-                # Try to fetch existing record if it was created by a race condition
-                try:
-                    monitor = monitors.objects.get(asset_tag=barcode_data)
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode already exists',
-                        'existing_item': True
-                    })
-                except monitors.DoesNotExist:
-                    return JsonResponse({'status': 'error', 'message': 'Database error saving barcode'}, status=500)
+                monitor, created = save_scan(monitors, barcode_data)
+                return JsonResponse(scan_result(request, monitors, barcode_data, monitor, created))
             except Exception as e:
                 logger.error(f"Error saving monitor barcode {barcode_data}: {e}")
                 return JsonResponse({'status': 'error', 'message': 'Error processing barcode'}, status=500)
@@ -516,9 +700,12 @@ def monitor_form(request, barcode):
     if request.method == 'POST':
         form = monitorsForm(request.POST, instance=monitor)
         if form.is_valid():
-            form.save()
-            messages.success(request, "Monitor data has been saved.")
-            return redirect('monitors_list')
+            if save_edit_form(request, form):
+                messages.success(request, "Monitor data has been saved.")
+                return redirect('monitors_list')
+            monitor.refresh_from_db()
+            form = monitorsForm(instance=monitor)
+            return render(request, 'monitors_form.html', {'form': form, 'url': url, 'monitor': monitor}, status=409)
         else:
             messages.error(request, "Error saving monitor data.")
     else:
@@ -557,7 +744,7 @@ def delete_monitor(request, id):
 @user_passes_test(is_admin, login_url='/admin/login/')
 def monitor_list(request):
     """List all monitors with pagination and search"""
-    monitor_items = monitors.objects.select_related('computer').all()
+    monitor_items = monitors.objects.select_related('computer').only(*MONITOR_LIST_COLUMNS)
 
     # Apply search filters
     search_fields = ['asset_tag', 'service_tag', 'make']
@@ -587,9 +774,12 @@ def update_dockingstation_view(request, pk):
     if request.method == 'POST':
         dockingstationform = docking_stationsForm(request.POST, instance=dockingstation)
         if dockingstationform.is_valid():
-            dockingstationform.save()
-            messages.success(request, 'Docking station data has been updated.')
-            return redirect('dockingstation_list')
+            if save_edit_form(request, dockingstationform):
+                messages.success(request, 'Docking station data has been updated.')
+                return redirect('dockingstation_list')
+            dockingstation.refresh_from_db()
+            mydict['form'] = docking_stationsForm(instance=dockingstation)
+            return render(request, 'docking_stations_form.html', context=mydict, status=409)
         else:
             messages.error(request, 'Error updating docking station.')
             return redirect('home')
@@ -619,32 +809,8 @@ def save_barcode_dockingstation(request):
         barcode_data = request.POST.get('barcode_data', None)
         if barcode_data:
             try:
-                with transaction.atomic():
-                    dockingstation, created = docking_stations.objects.get_or_create(asset_tag=barcode_data)
-                if created:
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode saved successfully',
-                        'new_item': True
-                    })
-                else:
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode already exists',
-                        'existing_item': True
-                    })
-            except IntegrityError as e:
-                logger.error(f"IntegrityError saving docking station barcode {barcode_data}: {e}")
-                # Try to fetch existing record if it was created by a race condition
-                try:
-                    dockingstation = docking_stations.objects.get(asset_tag=barcode_data)
-                    return JsonResponse({
-                        'status': 'success',
-                        'message': 'Barcode already exists',
-                        'existing_item': True
-                    })
-                except docking_stations.DoesNotExist:
-                    return JsonResponse({'status': 'error', 'message': 'Database error saving barcode'}, status=500)
+                dockingstation, created = save_scan(docking_stations, barcode_data)
+                return JsonResponse(scan_result(request, docking_stations, barcode_data, dockingstation, created))
             except Exception as e:
                 logger.error(f"Error saving docking station barcode {barcode_data}: {e}")
                 return JsonResponse({'status': 'error', 'message': 'Error processing barcode'}, status=500)
@@ -662,9 +828,12 @@ def dockingstation_form(request, barcode):
     if request.method == 'POST':
         form = docking_stationsForm(request.POST, instance=dockingstation)
         if form.is_valid():
-            form.save()
-            messages.success(request, "Docking station data has been saved.")
-            return redirect('dockingstation_list')
+            if save_edit_form(request, form):
+                messages.success(request, "Docking station data has been saved.")
+                return redirect('dockingstation_list')
+            dockingstation.refresh_from_db()
+            form = docking_stationsForm(instance=dockingstation)
+            return render(request, 'docking_stations_form.html', {'form': form, 'url': url, 'dockingstation': dockingstation}, status=409)
         else:
             messages.error(request, "Error saving docking station data.")
     else:
@@ -694,7 +863,9 @@ def add_dockingstation(request):
 @user_passes_test(is_admin, login_url='/admin/login/')
 def dockingstation_list(request):
     """List all docking stations with pagination and search"""
-    dockingstation_items = docking_stations.objects.select_related('computer').all()
+    dockingstation_items = docking_stations.objects.select_related('computer').only(
+        *DOCKING_STATION_LIST_COLUMNS
+    )
 
     # Apply search filters
     search_fields = ['asset_tag', 'service_tag', 'make']
@@ -1054,6 +1225,7 @@ def asset_history(request, asset_type=None, asset_id=None):
 
     # Paginate
     history = paginate_queryset(request, history, per_page=50)
+    history.object_list = asset_index.attach_targets(history.object_list)
 
     context = {
         'history': history,
@@ -1081,6 +1253,7 @@ def assignment_list(request):
         assignments = assignments.filter(status=status_filter)
 
     assignments = paginate_queryset(request, assignments, per_page=25)
+    assignments.object_list = asset_index.attach_targets(assignments.object_list)
 
     context = {
         'assignments': assignments,
@@ -1100,32 +1273,28 @@ def create_assignment(request):
         assigned_to = request.POST.get('assigned_to')
         notes = request.POST.get('notes', '')
 
-        assignment = AssetAssignment.objects.create(
-            asset_type=asset_type,
-            asset_id=asset_id,
-            assigned_to=assigned_to,
-            assigned_by=request.user,
-            notes=notes,
-            status='pending'
-        )
+        try:
+            asset_type = check_assignable(asset_type, asset_id)
+        except ValidationError as e:
+            messages.error(request, e.messages[0])
+            return redirect('create_assignment')
+
+        with transaction.atomic():
+            assignment = AssetAssignment.objects.create(
+                asset_type=asset_type,
+                asset_id=asset_id,
+                assigned_to=assigned_to,
+                assigned_by=request.user,
+                notes=notes,
+                status='pending'
+            )
+            outbox.enqueue(assignment, 'created')
 
         messages.success(request, f'Assignment created for {asset_type} {asset_id}.')
         return redirect('assignment_list')
 
-    # Get available assets for dropdowns
-    computers = Computers.objects.filter(status='active').values('id', 'asset_tag')
-    printer_list = printers.objects.filter(status='active').values('id', 'service_tag')
-    monitor_list = monitors.objects.filter(status='active').values('id', 'asset_tag')
-    docking_list = docking_stations.objects.filter(status='active').values('id', 'asset_tag')
-
-    context = {
-        'computers': list(computers),
-        'printers': list(printer_list),
-        'monitors': list(monitor_list),
-        'docking_stations': list(docking_list),
-    }
-
-    return render(request, 'create_assignment.html', context)
+    # Asset choices are loaded on demand from asset_autocomplete
+    return render(request, 'create_assignment.html')
 
 
 @user_passes_test(is_admin, login_url='/admin/login/')
@@ -1139,7 +1308,11 @@ def approve_assignment(request, assignment_id):
 
     assignment.status = 'approved'
     assignment.approved_by = request.user
-    assignment.save()
+    try:
+        save_transition(assignment)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
+        return redirect('assignment_list')
 
     messages.success(request, 'Assignment approved.')
     return redirect('assignment_list')
@@ -1156,7 +1329,11 @@ def reject_assignment(request, assignment_id):
 
     assignment.status = 'rejected'
     assignment.approved_by = request.user
-    assignment.save()
+    try:
+        save_transition(assignment)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
+        return redirect('assignment_list')
 
     messages.success(request, 'Assignment rejected.')
     return redirect('assignment_list')
@@ -1172,7 +1349,11 @@ def checkout_assignment(request, assignment_id):
         return redirect('assignment_list')
 
     assignment.status = 'checked_out'
-    assignment.save()
+    try:
+        save_transition(assignment)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
+        return redirect('assignment_list')
 
     messages.success(request, 'Asset checked out.')
     return redirect('assignment_list')
@@ -1189,7 +1370,44 @@ def return_assignment(request, assignment_id):
 
     assignment.status = 'returned'
     assignment.returned_date = timezone.now()
-    assignment.save()
+    try:
+        save_transition(assignment)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
+        return redirect('assignment_list')
 
     messages.success(request, 'Asset returned.')
     return redirect('assignment_list')
+
+
+@user_passes_test(is_admin, login_url='/admin/login/')
+def bulk_assignment_action(request):
+    """Approve, reject, check out or return the selected assignments at once"""
+    if request.method != 'POST':
+        return redirect('assignment_list')
+
+    action = request.POST.get('action')
+    try:
+        ids = [int(pk) for pk in request.POST.getlist('assignment_ids')]
+    except ValueError:
+        ids = None
+    if action not in TRANSITIONS or not ids:
+        messages.error(request, 'Select an action and at least one assignment.')
+        return redirect('assignment_list')
+
+    try:
+        transitioned, skipped = bulk_transition(action, ids, user=request.user)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
+        return redirect('assignment_list')
+
+    if transitioned:
+        messages.success(
+            request, f'{len(transitioned)} assignment(s) updated ({TRANSITIONS[action][1]}).'
+        )
+    if skipped:
+        messages.warning(
+            request,
+            f'{len(skipped)} assignment(s) skipped: {", ".join(map(str, skipped))}.'
+        )
+    return redirect('assignment_list')
@@ -0,0 +1,50 @@
+"""
+Search-backed choice widgets.
+
+A plain Select over a foreign key renders an <option> for every row of the
+related table. These widgets render only the currently selected choices and
+point the <select> at the asset autocomplete endpoint; asset_autocomplete.js
+loads further choices on demand as the user types.
+"""
+from django import forms
+from django.urls import reverse
+
+
+class AssetAutocompleteMixin:
+    """Render selected choices only and expose the autocomplete URL"""
+
+    def __init__(self, asset_type, attrs=None):
+        super().__init__(attrs)
+        self.asset_type = asset_type
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse('asset_autocomplete', args=[self.asset_type])
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        selected = {str(v) for v in value if v not in (None, '')}
+        choices = []
+        if not self.allow_multiple_selected and not self.is_required:
+            choices.append(('', '---------'))
+        if selected:
+            to_field_name = getattr(self.choices.field, 'to_field_name', None) or 'pk'
+            queryset = self.choices.queryset.filter(**{f'{to_field_name}__in': selected})
+            choices.extend(
+                (str(getattr(obj, to_field_name)), str(obj)) for obj in queryset
+            )
+
+        return [
+            (None, [self.create_option(
+                name, option_value, label, option_value in selected, index, attrs=attrs
+            )], index)
+            for index, (option_value, label) in enumerate(choices)
+        ]
+
+
+class AssetAutocompleteSelect(AssetAutocompleteMixin, forms.Select):
+    pass
+
+
+class AssetAutocompleteSelectMultiple(AssetAutocompleteMixin, forms.SelectMultiple):
+    pass
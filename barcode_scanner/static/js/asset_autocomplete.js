@@ -0,0 +1,70 @@
+// On-demand choices for <select data-autocomplete-url="..."> elements.
+// The server renders only the selected options; matching assets are fetched
+// from the autocomplete endpoint as the user types into a search box.
+(function () {
+    const DEBOUNCE_MS = 250;
+
+    function loadChoices(select, query) {
+        const url = select.dataset.autocompleteUrl;
+        if (!url) {
+            return;
+        }
+        const params = new URLSearchParams({ q: query || '' });
+        if (select.dataset.autocompleteStatus) {
+            params.set('status', select.dataset.autocompleteStatus);
+        }
+
+        fetch(url + '?' + params.toString(), { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(data => {
+                // Keep the empty option and current selection, replace the rest
+                Array.from(select.options).forEach(option => {
+                    if (option.value && !option.selected) {
+                        option.remove();
+                    }
+                });
+                const present = new Set(Array.from(select.options).map(option => option.value));
+                data.results.forEach(result => {
+                    if (!present.has(result.id)) {
+                        select.appendChild(new Option(result.text, result.id));
+                    }
+                });
+                if (data.more) {
+                    const hint = new Option('Keep typing to narrow results...', '');
+                    hint.disabled = true;
+                    select.appendChild(hint);
+                }
+            });
+    }
+
+    function bind(select) {
+        if (select.dataset.autocompleteBound) {
+            return;
+        }
+        select.dataset.autocompleteBound = '1';
+
+        const search = document.createElement('input');
+        search.type = 'search';
+        search.className = select.className;
+        search.placeholder = 'Search by asset tag, service tag or ID...';
+        search.style.marginBottom = '4px';
+        select.parentNode.insertBefore(search, select);
+
+        let timer = null;
+        search.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(() => loadChoices(select, search.value.trim()), DEBOUNCE_MS);
+        });
+        search.addEventListener('focus', () => {
+            if (!search.value && select.options.length <= 1) {
+                loadChoices(select, '');
+            }
+        }, { once: true });
+    }
+
+    window.AssetAutocomplete = { bind: bind, load: loadChoices };
+
+    document.addEventListener('DOMContentLoaded', () => {
+        document.querySelectorAll('select[data-autocomplete-url]').forEach(bind);
+    });
+})();